@@ -0,0 +1,74 @@
+"""Benchmark per-cluster cost lookups against invoices of increasing size.
+
+Compares the previous approach (re-parsing the invoice CSV for every cluster)
+with the pre-built InvoiceCostIndex. Run with:
+
+    python -m benchmarks.invoice_cost_index
+"""
+
+import csv
+import time
+from io import StringIO
+
+from mongone.data.invoices import build_invoice_cost_index, get_cluster_cost
+
+HEADER = "Date,Usage Date,Project,SKU,Cluster,Amount"
+
+
+def make_invoice_csv(projects, clusters_per_project, rows_per_cluster):
+    lines = [HEADER]
+    for p in range(projects):
+        for c in range(clusters_per_project):
+            for r in range(rows_per_cluster):
+                lines.append(
+                    f"2024-01-31,2024-01-{r % 28 + 1:02d},project-{p},"
+                    f"ATLAS_AWS_INSTANCE_M10,cluster-{c},{(r % 7) + 0.5}"
+                )
+    return "\n".join(lines)
+
+
+def rescan_cost(csv_data, project_name, cluster_name):
+    total = 0.0
+    for row in csv.DictReader(StringIO(csv_data)):
+        if row.get("Cluster") == cluster_name and row.get("Project") == project_name:
+            total += float(row.get("Amount", 0))
+    return total
+
+
+def run(projects, clusters_per_project, rows_per_cluster, rescan=True):
+    csv_data = make_invoice_csv(projects, clusters_per_project, rows_per_cluster)
+    keys = [
+        (f"project-{p}", f"cluster-{c}")
+        for p in range(projects)
+        for c in range(clusters_per_project)
+    ]
+
+    start = time.perf_counter()
+    cost_index = build_invoice_cost_index(csv_data)
+    for project_name, cluster_name in keys:
+        get_cluster_cost(cost_index, project_name, cluster_name)
+    indexed = time.perf_counter() - start
+
+    rescanned = None
+    if rescan:
+        start = time.perf_counter()
+        for project_name, cluster_name in keys:
+            rescan_cost(csv_data, project_name, cluster_name)
+        rescanned = time.perf_counter() - start
+
+    return len(keys), len(keys) * rows_per_cluster, indexed, rescanned
+
+
+if __name__ == "__main__":
+    print(f"{'clusters':>9} {'rows':>9} {'indexed (s)':>12} {'rescan (s)':>11}")
+    for projects, clusters, rows, rescan in [
+        (5, 10, 30, True),
+        (10, 20, 30, True),
+        (20, 25, 30, True),
+        (100, 50, 30, False),
+    ]:
+        n_clusters, n_rows, indexed, rescanned = run(projects, clusters, rows, rescan)
+        rescanned = (
+            f"{rescanned:11.3f}" if rescanned is not None else f"{'skipped':>11}"
+        )
+        print(f"{n_clusters:>9} {n_rows:>9} {indexed:12.3f} {rescanned}")
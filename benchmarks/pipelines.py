@@ -0,0 +1,114 @@
+"""Benchmarked MonGone pipelines over synthetic organizations.
+
+Each benchmark receives a ``BenchmarkContext`` holding a synthetic org served
+by the mock Atlas API and returns a callable that runs the pipeline once.
+"""
+
+import os
+import glob
+import builtins
+import contextlib
+
+import yaml
+
+from mongone.core.report_generator import (
+    generate_report_logic,
+    transform_force_data_to_expected_structure,
+)
+from mongone.mock.generator import generate_org, to_force_data
+from mongone.mock.server import run_mock_server
+from mongone.optimization.execute import execute_plan
+from mongone.optimization.plans import generate_plans
+from mongone.utils.cache import configure_cache
+from mongone.utils.rendering import render_html_report
+
+SIZES = {
+    "small": (10, 10),
+    "medium": (50, 20),
+    "large": (100, 50),
+    "xlarge": (100, 100),
+}
+
+
+class BenchmarkContext:
+    """Synthetic organization, mock Atlas server and config for one size."""
+
+    def __init__(self, projects, clusters_per_project, workdir):
+        self.workdir = workdir
+        self.org = generate_org(
+            projects=projects, clusters_per_project=clusters_per_project
+        )
+        self.server = run_mock_server(self.org, transition_seconds=0)
+        self.config = {
+            "atlas_org_id": self.org["org_id"],
+            "environment_patterns": {
+                "staging": r".*staging.*",
+                "production": r".*production.*",
+            },
+        }
+        self.force_data = to_force_data(self.org)
+        self.report = transform_force_data_to_expected_structure(self.force_data)
+
+        os.environ["MONGONE_ATLAS_API_URL"] = self.server.url
+        os.environ.setdefault("ATLAS_PUBLIC_KEY", "mock")
+        os.environ.setdefault("ATLAS_PRIVATE_KEY", "mock")
+        configure_cache(enabled=False)
+        with open(os.path.join(workdir, "mongone.yaml"), "w") as file:
+            yaml.dump(self.config, file)
+
+    def close(self):
+        self.server.stop()
+
+
+def bench_generate_report(context):
+    return lambda: generate_report_logic(context.config, 30)
+
+
+def bench_generate_report_async(context):
+    return lambda: generate_report_logic(context.config, 30, concurrency=32)
+
+
+def bench_transform_force_data(context):
+    return lambda: transform_force_data_to_expected_structure(context.force_data)
+
+
+def bench_render_html_report(context):
+    return lambda: render_html_report(context.report)
+
+
+def bench_generate_plans(context):
+    return lambda: generate_plans(context.config, context.report)
+
+
+def bench_execute_plan(context):
+    generate_plans(context.config, context.report)
+    plan_files = sorted(glob.glob("plans/staging/autoscaling_computation_plan_*.yaml"))
+    plan_file = plan_files[-1]
+
+    def run():
+        original_input = builtins.input
+        builtins.input = lambda prompt="": "yes"
+        try:
+            execute_plan("autoscaling_computation", "staging", plan_file)
+        finally:
+            builtins.input = original_input
+
+    return run
+
+
+BENCHMARKS = {
+    "generate_report_logic": bench_generate_report,
+    "generate_report_logic[async]": bench_generate_report_async,
+    "transform_force_data_to_expected_structure": bench_transform_force_data,
+    "render_html_report": bench_render_html_report,
+    "generate_plans": bench_generate_plans,
+    "execute_plan": bench_execute_plan,
+}
+
+
+@contextlib.contextmanager
+def quiet():
+    """Silence MonGone's console output while a benchmark runs."""
+    with open(os.devnull, "w") as devnull:
+        with contextlib.redirect_stdout(devnull):
+            yield
@@ -0,0 +1,166 @@
+"""Run the MonGone benchmark suite and compare it against a stored baseline.
+
+Times and memory-profiles the report, plan and execute pipelines over
+synthetic organizations of increasing size served by the mock Atlas API:
+
+    python -m benchmarks.run
+    python -m benchmarks.run --sizes small,medium,large --output results.json
+    python -m benchmarks.run --update-baseline
+
+The command exits with status 1 when a pipeline is slower, or uses more memory,
+than the baseline allows.
+"""
+
+import os
+import gc
+import sys
+import json
+import time
+import platform
+import tempfile
+import tracemalloc
+from datetime import datetime
+
+import click
+
+from benchmarks.pipelines import BENCHMARKS, SIZES, BenchmarkContext, quiet
+
+BASELINE_FILE = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+
+def measure(func, repeat):
+    """Return the best wall time and the peak traced memory of ``func``."""
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return min(timings), peak / (1024 * 1024)
+
+
+def run_suite(sizes, names, repeat):
+    results = {}
+    original_cwd = os.getcwd()
+    for size in sizes:
+        projects, clusters = SIZES[size]
+        with tempfile.TemporaryDirectory() as workdir:
+            os.chdir(workdir)
+            try:
+                with quiet():
+                    context = BenchmarkContext(projects, clusters, workdir)
+                try:
+                    for name in names:
+                        with quiet():
+                            func = BENCHMARKS[name](context)
+                            seconds, peak_mb = measure(func, repeat)
+                        results[f"{size}/{name}"] = {
+                            "clusters": projects * clusters,
+                            "seconds": round(seconds, 4),
+                            "peak_mb": round(peak_mb, 2),
+                        }
+                        click.echo(
+                            f"{size:>7} {projects * clusters:>6} clusters  {name:<45} "
+                            f"{seconds:9.3f}s {peak_mb:9.2f} MB"
+                        )
+                finally:
+                    context.close()
+            finally:
+                os.chdir(original_cwd)
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """Return the list of regressions against the baseline results."""
+    regressions = []
+    for key, result in results.items():
+        expected = baseline.get(key)
+        if not expected:
+            continue
+        for metric in ["seconds", "peak_mb"]:
+            limit = expected[metric] * (1 + tolerance)
+            # Ignore noise on measurements that are too small to be meaningful
+            floor = 0.05 if metric == "seconds" else 1.0
+            if result[metric] > max(limit, floor):
+                regressions.append(
+                    f"{key}: {metric} {result[metric]} > baseline {expected[metric]}"
+                )
+    return regressions
+
+
+@click.command()
+@click.option(
+    "--sizes",
+    default="small,medium",
+    help=f"Comma separated organization sizes: {', '.join(SIZES)}.",
+)
+@click.option(
+    "--benchmarks",
+    "selected",
+    default=",".join(BENCHMARKS),
+    help="Comma separated benchmarks to run.",
+)
+@click.option("--repeat", default=3, help="Timed runs per benchmark, best is kept.")
+@click.option("--output", default=None, help="Write the results to this JSON file.")
+@click.option("--baseline", default=BASELINE_FILE, help="Baseline JSON file.")
+@click.option(
+    "--tolerance", default=0.25, help="Allowed slowdown or memory growth ratio."
+)
+@click.option(
+    "--update-baseline", is_flag=True, help="Store the results as the new baseline."
+)
+def main(sizes, selected, repeat, output, baseline, tolerance, update_baseline):
+    """Benchmark MonGone pipelines over synthetic organizations."""
+    sizes = [size.strip() for size in sizes.split(",") if size.strip()]
+    names = [name.strip() for name in selected.split(",") if name.strip()]
+    for size in sizes:
+        if size not in SIZES:
+            raise click.BadParameter(f"Unknown size '{size}'", param_hint="--sizes")
+    for name in names:
+        if name not in BENCHMARKS:
+            raise click.BadParameter(
+                f"Unknown benchmark '{name}'", param_hint="--benchmarks"
+            )
+
+    results = run_suite(sizes, names, repeat)
+    document = {
+        "timestamp": datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+    if output:
+        with open(output, "w") as file:
+            json.dump(document, file, indent=2)
+        click.echo(f"Results written to {output}")
+
+    if update_baseline:
+        with open(baseline, "w") as file:
+            json.dump(document, file, indent=2)
+        click.echo(f"Baseline updated: {baseline}")
+        return
+
+    if not os.path.exists(baseline):
+        click.echo(f"No baseline found at {baseline}, skipping comparison.")
+        return
+
+    with open(baseline, "r") as file:
+        baseline_results = json.load(file).get("results", {})
+    regressions = compare(results, baseline_results, tolerance)
+    if regressions:
+        click.echo("Regressions against baseline:")
+        for regression in regressions:
+            click.echo(f"  {regression}")
+        sys.exit(1)
+    click.echo("No regressions against baseline.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Benchmark plan and force-data serialization on a 10k-cluster document.
+
+Compares the pure-Python PyYAML loader/dumper, the libyaml C bindings and the
+JSON Lines format (one project per line). Run with:
+
+    python -m benchmarks.serialization
+"""
+
+import os
+import time
+import tempfile
+
+import yaml
+
+from mongone.utils.serialization import (
+    SafeDumper,
+    SafeLoader,
+    load_document,
+    write_document,
+)
+
+
+def make_force_data(projects, clusters_per_project):
+    return {
+        "projects": [
+            {
+                "id": f"{p:024d}",
+                "name": f"project-{p}",
+                "environment": ["staging", "production", "development"][p % 3],
+                "clusters": [
+                    {
+                        "name": f"cluster-{c}",
+                        "last_access_time": f"2024-01-{c % 28 + 1:02d}T12:00:00",
+                        "autoscaling_compute": c % 2 == 0,
+                        "autoscaling_disk": c % 3 == 0,
+                        "cost": round(c * 1.37, 2),
+                        "databases": [f"db-{d}" for d in range(3)],
+                    }
+                    for c in range(clusters_per_project)
+                ],
+            }
+            for p in range(projects)
+        ]
+    }
+
+
+def timed(func):
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def run(projects, clusters_per_project, workdir):
+    data = make_force_data(projects, clusters_per_project)
+    yaml_path = os.path.join(workdir, "force-data.yaml")
+    jsonl_path = os.path.join(workdir, "force-data.jsonl")
+
+    def dump_with(dumper):
+        with open(yaml_path, "w") as file:
+            yaml.dump(data, file, Dumper=dumper)
+
+    def load_with(loader):
+        with open(yaml_path, "r") as file:
+            yaml.load(file, Loader=loader)
+
+    results = {
+        "yaml (pure Python)": (
+            timed(lambda: dump_with(yaml.SafeDumper)),
+            timed(lambda: load_with(yaml.SafeLoader)),
+        ),
+        "yaml (libyaml)": (
+            timed(lambda: dump_with(SafeDumper)),
+            timed(lambda: load_with(SafeLoader)),
+        ),
+        "jsonl": (
+            timed(lambda: write_document(jsonl_path, data, "projects")),
+            timed(lambda: load_document(jsonl_path, "projects")),
+        ),
+    }
+    return results, os.path.getsize(yaml_path), os.path.getsize(jsonl_path)
+
+
+if __name__ == "__main__":
+    if SafeLoader is yaml.SafeLoader:
+        print("PyYAML was built without libyaml; the C rows use the Python loader.")
+    with tempfile.TemporaryDirectory() as workdir:
+        results, yaml_size, jsonl_size = run(100, 100, workdir)
+    print(
+        f"10000 clusters, YAML {yaml_size / 1e6:.1f} MB, JSONL {jsonl_size / 1e6:.1f} MB"
+    )
+    print(f"{'format':<20} {'write (s)':>10} {'read (s)':>10}")
+    for name, (write_seconds, read_seconds) in results.items():
+        print(f"{name:<20} {write_seconds:10.3f} {read_seconds:10.3f}")
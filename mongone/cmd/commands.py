@@ -1,24 +1,55 @@
 import os
+import sys
 import click
-import yaml
 from datetime import datetime
 from rich import box
 from rich.table import Table
 from rich.panel import Panel
 from rich.text import Text
-import glob
 from inquirer import prompt, List, Confirm
 
 
-from mongone.core.config import load_config, save_config
-from mongone.core.report_generator import (
-    generate_report_logic,
-    transform_force_data_to_expected_structure,
+from mongone.core.config import load_config, save_config, config_organizations
+from mongone.core.report_generator import transform_force_data_to_expected_structure
+from mongone.core.organizations import (
+    generate_organization_report,
+    generate_organizations_report,
+    consolidate_reports,
+    organization_dir,
+    register_organization_credentials,
+    register_organizations,
+)
+from mongone.utils.rendering import (
+    render_html_report,
+    render_sharded_report,
+    display_summary,
+    display_organizations_summary,
+    display_cluster_history,
+)
+from mongone.utils.helpers import Console
+from mongone.utils.export import export_report, EXPORT_FORMATS
+from mongone.optimization.plans import generate_plans, PLANS_DIR
+from mongone.core.snapshot_store import SnapshotStore, STORE_FILE
+from mongone.optimization.execute import (
+    execute_plan,
+    execute_plans,
+    find_latest_plans,
+    list_plan_environments,
+    list_plan_files,
+    load_plan,
+    PLAN_TYPES,
+)
+from mongone.utils.http import AtlasAPIError
+from mongone.utils.cache import configure_cache, CACHE_DIR
+from mongone.utils.serialization import dump_yaml, load_document
+from mongone.core.data_loader import (
+    find_data_file,
+    load_projects_file,
+    FORCE_DATA_FILE,
+    FORCE_DATA_JSONL_FILE,
+    TEST_DATA_FILE,
+    TEST_DATA_JSONL_FILE,
 )
-from mongone.utils.rendering import render_html_report, display_summary
-from mongone.utils.helpers import validate_file_exists, Console
-from mongone.optimization.plans import generate_plans
-from mongone.optimization.execute import execute_plan
 
 console = Console()
 
@@ -78,11 +109,45 @@ def init(atlas_org_id, report_period_days):
     }
 
     with open("force-data.yaml", "w") as file:
-        yaml.dump(force_data_example, file)
+        dump_yaml(force_data_example, file)
 
     console.print("[green]Example 'force-data.yaml' file created successfully.[/]")
 
 
+def configure_response_cache(config, enabled=True, refresh=False):
+    """Open the response cache configured in mongone.yaml."""
+    configure_cache(
+        enabled=enabled,
+        refresh=refresh,
+        directory=config.get("cache_dir", CACHE_DIR),
+        max_bytes=config.get("cache_max_mb", 0) * 1024 * 1024 or None,
+    )
+
+
+def prepare_execution():
+    """Set up credentials and the response cache before plans modify clusters.
+
+    The cache is opened in refresh mode: cluster state is always read from
+    Atlas while executing, and every applied change drops the cached cluster
+    documents of its project so the next report does not serve them.
+    """
+    config = load_config()
+    register_organizations(config)
+    configure_response_cache(config, refresh=True)
+
+
+def write_report_outputs(
+    config, data, split_by, export_formats, reports_dir="reports", plans_dir=PLANS_DIR
+):
+    """Render, export and plan a report into the given directories."""
+    if split_by:
+        render_sharded_report(data, split_by, output_dir=reports_dir)
+    else:
+        render_html_report(data, reports_dir)
+    export_report(data, export_formats, reports_dir)
+    generate_plans(config, data, plans_dir)
+
+
 @cli.command()
 @click.option(
     "--force",
@@ -97,40 +162,142 @@ def init(atlas_org_id, report_period_days):
 @click.option(
     "--period", default=30, help="Period (in days) to consider databases as unused."
 )
-def generate_report(force, test, period):
+@click.option(
+    "--concurrency",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Collect report data with the asyncio engine, running up to this many Atlas requests at once.",
+)
+@click.option(
+    "--no-cache",
+    is_flag=True,
+    help="Do not read or write the local Atlas response cache.",
+)
+@click.option(
+    "--refresh",
+    is_flag=True,
+    help="Ignore cached Atlas responses and refetch everything, updating the cache.",
+)
+@click.option(
+    "--split-by",
+    type=click.Choice(["project", "environment"]),
+    default=None,
+    help="Write an index page plus one HTML page per project or environment, rendered in parallel.",
+)
+@click.option(
+    "--export",
+    "export_formats",
+    multiple=True,
+    type=click.Choice(list(EXPORT_FORMATS)),
+    help="Also export the report as JSON Lines, CSV or columnar JSON. Can be repeated.",
+)
+@click.option(
+    "--incremental",
+    is_flag=True,
+    help="Keep the inventory in a local SQLite store and only refetch clusters that changed since the last run.",
+)
+@click.option(
+    "--delta",
+    is_flag=True,
+    help="Compare with the previous report, only recompute projects whose clusters changed and print the differences.",
+)
+def generate_report(
+    force,
+    test,
+    period,
+    concurrency,
+    no_cache,
+    refresh,
+    split_by,
+    export_formats,
+    incremental,
+    delta,
+):
     """Generate a usage report for all projects in the MongoDB Atlas organization."""
     config = load_config()
 
     if force:
-        if not validate_file_exists("force-data.yaml"):
-            console.print(f"[red]Force data file 'force-data.yaml' not found.[/]")
+        force_file = find_data_file(FORCE_DATA_FILE, FORCE_DATA_JSONL_FILE)
+        if not force_file:
+            console.print(f"[red]Force data file '{FORCE_DATA_FILE}' not found.[/]")
             return
-        # Load data from force-data.yaml
-        with open("force-data.yaml", "r") as file:
-            data = yaml.safe_load(file)
+        # Load data from force-data.yaml or force-data.jsonl
+        data = load_projects_file(force_file)
         # Ensure the data structure matches the expected format
         data = transform_force_data_to_expected_structure(data)
     elif test:
-        if not validate_file_exists("test-data.yaml"):
-            console.print(f"[red]Test data file 'test-data.yaml' not found.[/]")
+        test_file = find_data_file(TEST_DATA_FILE, TEST_DATA_JSONL_FILE)
+        if not test_file:
+            console.print(f"[red]Test data file '{TEST_DATA_FILE}' not found.[/]")
             return
-        # Load data from test-data.yaml
-        with open("test-data.yaml", "r") as file:
-            data = yaml.safe_load(file)
+        # Load data from test-data.yaml or test-data.jsonl
+        data = load_projects_file(test_file)
         # Ensure the data structure matches the expected format
         data = transform_force_data_to_expected_structure(data)
     else:
-        data = generate_report_logic(config, period)
-
-    # Render the HTML report
-    render_html_report(data)
+        configure_response_cache(config, enabled=not no_cache, refresh=refresh)
+        organizations = config_organizations(config)
+        if len(organizations) > 1:
+            reports = generate_organizations_report(
+                config, period, concurrency, incremental, delta
+            )
+            if not reports:
+                console.print(
+                    "[red]Report generation failed for every organization.[/]"
+                )
+                return
+            for label, report in reports.items():
+                write_report_outputs(
+                    config,
+                    report,
+                    split_by,
+                    export_formats,
+                    os.path.join(organization_dir(label), "reports"),
+                    os.path.join(organization_dir(label), "plans"),
+                )
+            display_organizations_summary(reports)
+            data = consolidate_reports(reports)
+        else:
+            try:
+                register_organization_credentials(organizations[0])
+                data = generate_organization_report(
+                    organizations[0], period, concurrency, incremental, delta
+                )
+            except (AtlasAPIError, ValueError) as e:
+                console.print(f"[red]Report generation failed: {e}[/]")
+                return
 
-    generate_plans(config, data)
+    write_report_outputs(config, data, split_by, export_formats)
 
     # Display summary in the console
     display_summary(data)
 
 
+@cli.command("cluster-history")
+@click.argument("project")
+@click.argument("cluster_name")
+def cluster_history(project, cluster_name):
+    """Show a cluster's usage and cost across the runs saved by --incremental."""
+    config = load_config()
+    store_file = config.get("snapshot_store", STORE_FILE)
+    if not os.path.exists(store_file):
+        console.print(
+            f"[red]Snapshot store '{store_file}' not found. Run 'generate-report --incremental' first.[/]"
+        )
+        return
+    store = SnapshotStore(store_file)
+    try:
+        rows = store.cluster_history(project, cluster_name)
+    finally:
+        store.close()
+    if not rows:
+        console.print(
+            f"[yellow]No stored history for cluster {cluster_name} in project {project}.[/]"
+        )
+        return
+    display_cluster_history(project, cluster_name, rows)
+
+
 @cli.command()
 @click.option(
     "--plan-type",
@@ -146,10 +313,31 @@ def generate_report(force, test, period):
 )
 @click.option(
     "--environment",
-    type=click.Choice(["staging", "production", "unknown"]),
     help="Environment to execute the plan in.",
 )
-def execute(plan_type, environment):
+@click.option(
+    "--concurrency",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Number of clusters modified at once. Changes within a project are always applied one at a time.",
+)
+@click.option(
+    "--wait",
+    is_flag=True,
+    help="Wait until Atlas reports every change as applied and print a summary.",
+)
+@click.option(
+    "--wait-timeout",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Maximum number of seconds to wait for changes when using --wait.",
+)
+@click.option(
+    "--resume",
+    is_flag=True,
+    help="Skip the clusters already applied by a previous, interrupted run of the plan.",
+)
+def execute(plan_type, environment, concurrency, wait, wait_timeout, resume):
     """Execute a specific plan for the given environment."""
 
     # Display a prominent warning message
@@ -216,24 +404,22 @@ def execute(plan_type, environment):
 
     # If environment is not provided, prompt the user to select one
     if not environment:
-        env_options = [
-            ("staging", "Staging Environment"),
-            ("production", "Production Environment"),
-            ("unknown", "Unknown Environment"),
-        ]
+        env_options = list_plan_environments()
+        if not env_options:
+            console.print("[red]No plans found. Run generate-report first.[/]")
+            return
         questions = [
             List(
                 "environment",
                 message="Select environment:",
-                choices=[option[0] for option in env_options],
+                choices=env_options,
             )
         ]
         answers = prompt(questions)
         environment = answers.get("environment")
 
     # Find all plan files for the selected type and environment
-    plans_dir = f"./plans/{environment}"
-    plan_files = glob.glob(f"{plans_dir}/{plan_type}_plan_*.yaml")
+    plan_files = list_plan_files(environment, plan_type)
 
     if not plan_files:
         console.print(
@@ -243,7 +429,6 @@ def execute(plan_type, environment):
 
     # Display available plans and ask the user to select one
     console.print(Panel("[bold]Available Plans:[/]", style="blue"))
-    plan_files.sort()
     options = [(str(idx + 1), plan_file) for idx, plan_file in enumerate(plan_files)]
     questions = [
         List(
@@ -257,29 +442,151 @@ def execute(plan_type, environment):
     selected_plan_file = plan_files[selected_index - 1]
 
     # Display the selected plan in a Terraform-like format
-    with open(selected_plan_file, "r") as plan_file:
-        plan_content = yaml.safe_load(plan_file)
-        table = Table(title="Plan Preview", box=box.SIMPLE, highlight=True)
-        table.add_column("Environment", style="magenta")
-        table.add_column("Action", style="cyan")
-        table.add_column("Cluster Details", style="green")
+    plan_content = load_document(selected_plan_file, "clusters")
+    table = Table(title="Plan Preview", box=box.SIMPLE, highlight=True)
+    table.add_column("Environment", style="magenta")
+    table.add_column("Action", style="cyan")
+    table.add_column("Cluster Details", style="green")
 
-        for cluster in plan_content.get("clusters", []):
-            action = plan_content.get("action", "Unknown Action")
-            environment = environment.capitalize()
-            cluster_details = f"Cluster Name: {cluster['cluster_name']}, Project Name: {cluster['project_name']}, Project ID: {cluster['project_id']}, Org ID: {cluster['org_id']}"
-            table.add_row(environment, action, cluster_details)
+    for cluster in plan_content.get("clusters", []):
+        action = plan_content.get("action", "Unknown Action")
+        environment = environment.capitalize()
+        cluster_details = f"Cluster Name: {cluster['cluster_name']}, Project Name: {cluster['project_name']}, Project ID: {cluster['project_id']}, Org ID: {cluster['org_id']}"
+        table.add_row(environment, action, cluster_details)
 
-        console.print(table)
+    console.print(table)
 
     # Confirm execution
     questions = [Confirm("execute", message="Do you want to execute this plan?")]
     answers = prompt(questions)
     if answers.get("execute"):
-        execute_plan(plan_type, environment, selected_plan_file)
+        prepare_execution()
+        try:
+            execute_plan(
+                plan_type,
+                environment,
+                selected_plan_file,
+                concurrency,
+                wait=wait,
+                wait_timeout=wait_timeout,
+                resume=resume,
+            )
+        except AtlasAPIError as e:
+            console.print(f"[red]Plan execution failed: {e}[/]")
     else:
         console.print("[yellow]Execution aborted by user.[/]")
 
 
+@cli.command("execute-batch")
+@click.argument("plan_files", nargs=-1, type=click.Path(exists=True, dir_okay=False))
+@click.option(
+    "--latest",
+    is_flag=True,
+    help="Execute the latest plan of each type in each environment instead of PLAN_FILES.",
+)
+@click.option(
+    "--plan-type",
+    "plan_types",
+    multiple=True,
+    type=click.Choice(PLAN_TYPES),
+    help="With --latest, only execute plans of this type. Can be repeated.",
+)
+@click.option(
+    "--environment",
+    "environments",
+    multiple=True,
+    help="With --latest, only execute plans of this environment. Can be repeated.",
+)
+@click.option(
+    "--plans-dir",
+    default=PLANS_DIR,
+    show_default=True,
+    help="With --latest, the directory to find plans in, such as orgs/<name>/plans.",
+)
+@click.option(
+    "--yes",
+    is_flag=True,
+    help="Confirm the execution of every selected plan without prompting.",
+)
+@click.option(
+    "--concurrency",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Number of clusters modified at once. Changes within a project are always applied one at a time.",
+)
+@click.option(
+    "--wait",
+    is_flag=True,
+    help="Wait until Atlas reports every change as applied and print a summary.",
+)
+@click.option(
+    "--wait-timeout",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Maximum number of seconds to wait for changes when using --wait.",
+)
+@click.option(
+    "--resume",
+    is_flag=True,
+    help="Skip the clusters already applied by a previous, interrupted run of each plan.",
+)
+def execute_batch(
+    plan_files,
+    latest,
+    plan_types,
+    environments,
+    plans_dir,
+    yes,
+    concurrency,
+    wait,
+    wait_timeout,
+    resume,
+):
+    """Execute several plans in one unattended run."""
+    if latest:
+        plan_files = find_latest_plans(plan_types, environments, plans_dir)
+    if not plan_files:
+        console.print("[red]No plan files selected. Pass PLAN_FILES or --latest.[/]")
+        sys.exit(1)
+
+    table = Table(title="Plans to Execute", box=box.SIMPLE, highlight=True)
+    table.add_column("Plan File", style="green")
+    table.add_column("Environment", style="magenta")
+    table.add_column("Action", style="cyan")
+    table.add_column("Clusters", justify="right")
+    for plan_file in plan_files:
+        try:
+            plan_data = load_plan(plan_file)
+        except ValueError as e:
+            console.print(f"[red]{e}[/]")
+            sys.exit(1)
+        table.add_row(
+            plan_file,
+            plan_data["environment"],
+            plan_data["action"],
+            str(len(plan_data.get("clusters", []))),
+        )
+    console.print(table)
+
+    if not yes:
+        console.print(
+            "[red]Batch execution modifies your Atlas clusters without prompting. Rerun with --yes to confirm.[/]"
+        )
+        sys.exit(1)
+
+    prepare_execution()
+    try:
+        execute_plans(
+            list(plan_files),
+            concurrency,
+            wait=wait,
+            wait_timeout=wait_timeout,
+            resume=resume,
+        )
+    except AtlasAPIError as e:
+        console.print(f"[red]Plan execution failed: {e}[/]")
+        sys.exit(1)
+
+
 if __name__ == "__main__":
     cli()
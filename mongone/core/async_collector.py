@@ -0,0 +1,124 @@
+import asyncio
+from datetime import datetime, timedelta
+from mongone.core.data_loader import (
+    fetch_projects_data,
+    fetch_recent_invoices,
+    fetch_invoice_cost_index,
+    merge_invoice_cost_indexes,
+    INVOICE_HISTORY_MONTHS,
+)
+from mongone.core.report_generator import (
+    fetch_project_clusters,
+    collect_cluster_usage,
+    carry_forward_usages,
+    build_project_report,
+    summarize_report,
+)
+from mongone.core.delta import project_fingerprint
+from mongone.utils.helpers import Console
+from mongone.utils.http import AsyncAtlasClient, configure_client
+
+console = Console()
+
+
+async def collect_project(client, project, cutoff_date, snapshot=None, previous=None):
+    """Fetch a project's clusters and schedule one task per cluster fetch."""
+    clusters = await client.run(fetch_project_clusters, project)
+    if not clusters:
+        return None
+    fingerprint = project_fingerprint(clusters)
+    carried = carry_forward_usages(
+        project, clusters, fingerprint, cutoff_date, snapshot, previous
+    )
+    fetched = await asyncio.gather(
+        *(
+            client.run(
+                collect_cluster_usage, project["id"], cluster, cutoff_date, snapshot
+            )
+            for cluster in clusters
+            if cluster["name"] not in carried
+        )
+    )
+    fetched = iter(fetched)
+    cluster_usages = [
+        carried.get(cluster["name"]) or next(fetched) for cluster in clusters
+    ]
+    return project, cluster_usages, fingerprint
+
+
+async def collect_invoice_data(client, atlas_org_id, history_months):
+    """Download each recent invoice as its own task and merge their costs."""
+    invoices = await client.run(fetch_recent_invoices, atlas_org_id, history_months)
+    results = await asyncio.gather(
+        *(
+            client.run(fetch_invoice_cost_index, atlas_org_id, invoice)
+            for invoice in invoices
+        ),
+        return_exceptions=True,
+    )
+    # The forecast is CPU work, kept off the event loop and the Atlas workers
+    return await asyncio.to_thread(merge_invoice_cost_indexes, invoices, results)
+
+
+async def collect_report_async(
+    config, period, concurrency, snapshot=None, previous=None
+):
+    """Collect the organization report with every fetch as a bounded task.
+
+    Returns the report dictionary and the invoice cost index.
+    """
+    atlas_org_id = config.get("atlas_org_id")
+    env_patterns = config.get("environment_patterns")
+    cutoff_date = datetime.now().replace(tzinfo=None) - timedelta(days=period)
+
+    configure_client(concurrency, rate_limit=config.get("requests_per_second"))
+    client = AsyncAtlasClient(concurrency)
+
+    try:
+        console.print(
+            "[INFO] Fetching projects from MongoDB Atlas...", style="bold blue"
+        )
+        projects = await client.run(fetch_projects_data, atlas_org_id)
+
+        console.print(
+            f"[INFO] Found {len(projects)} projects. Fetching invoice and cluster information with concurrency {concurrency}...",
+            style="bold blue",
+        )
+        # The invoice download overlaps with the cluster crawl
+        invoice_task = asyncio.create_task(
+            collect_invoice_data(
+                client,
+                atlas_org_id,
+                config.get("invoice_history_months", INVOICE_HISTORY_MONTHS),
+            )
+        )
+        collected = await asyncio.gather(
+            *(
+                collect_project(client, project, cutoff_date, snapshot, previous)
+                for project in projects
+            )
+        )
+        cost_index = await invoice_task
+    finally:
+        client.close()
+
+    report_data = []
+    all_unused_clusters = []
+    for result in collected:
+        if result:
+            project, cluster_usages, fingerprint = result
+            project_report, unused_clusters = build_project_report(
+                project, env_patterns, cluster_usages, cost_index
+            )
+            project_report["fingerprint"] = fingerprint
+            report_data.append(project_report)
+            all_unused_clusters.extend(unused_clusters)
+
+    return summarize_report(report_data, all_unused_clusters), cost_index
+
+
+def collect_report(config, period, concurrency, snapshot=None, previous=None):
+    """Run the asyncio collection engine; returns the report and cost index."""
+    return asyncio.run(
+        collect_report_async(config, period, concurrency, snapshot, previous)
+    )
@@ -1,5 +1,5 @@
 import os
-import yaml
+from mongone.utils.serialization import load_yaml, dump_yaml
 
 CONFIG_FILE = "mongone.yaml"
 
@@ -11,10 +11,23 @@ def load_config():
             f"Configuration file '{CONFIG_FILE}' not found. Run 'mongone init' first."
         )
     with open(CONFIG_FILE, "r") as file:
-        return yaml.safe_load(file)
+        return load_yaml(file)
 
 
 def save_config(config):
     """Save configuration to the config file."""
     with open(CONFIG_FILE, "w") as file:
-        yaml.dump(config, file)
+        dump_yaml(config, file)
+
+
+def config_organizations(config):
+    """Return one configuration per Atlas organization.
+
+    Each entry of ``organizations`` overrides the top-level settings for that
+    organization; without it, the configuration describes a single organization.
+    """
+    organizations = config.get("organizations")
+    if not organizations:
+        return [config]
+    shared = {key: value for key, value in config.items() if key != "organizations"}
+    return [{**shared, **organization} for organization in organizations]
@@ -1,18 +1,44 @@
 import os
-import yaml
-from mongone.data.invoices import get_latest_invoice_id, fetch_invoice_csv
-from mongone.data.projects import fetch_projects
+from concurrent.futures import ThreadPoolExecutor
+from mongone.data.invoices import (
+    get_recent_invoices,
+    is_invoice_closed,
+    stream_invoice_cost_index,
+)
+from mongone.data.projects import fetch_projects, iter_projects
 from mongone.data.clusters import fetch_clusters
+from mongone.cost.prediction import DailyCostHistory, forecast_month_costs
+from mongone.utils.serialization import load_document
+from mongone.utils.helpers import Console
+from mongone.utils.http import AtlasAPIError
+
+console = Console()
 
 FORCE_DATA_FILE = "force-data.yaml"
+FORCE_DATA_JSONL_FILE = "force-data.jsonl"
+TEST_DATA_FILE = "test-data.yaml"
+TEST_DATA_JSONL_FILE = "test-data.jsonl"
+
+# Invoices, newest first, whose daily costs feed the cost forecasts
+INVOICE_HISTORY_MONTHS = 3
+
+
+def find_data_file(*candidates):
+    """Return the first existing file among the given candidates, or None."""
+    return next((path for path in candidates if os.path.exists(path)), None)
+
+
+def load_projects_file(path):
+    """Load a force or test data file, either YAML or JSON Lines (one project per line)."""
+    return load_document(path, "projects")
 
 
 def load_force_data():
-    """Load force data from the force-data.yaml file."""
-    if not os.path.exists(FORCE_DATA_FILE):
+    """Load force data from the force-data.yaml (or force-data.jsonl) file."""
+    path = find_data_file(FORCE_DATA_FILE, FORCE_DATA_JSONL_FILE)
+    if not path:
         raise FileNotFoundError(f"Force data file '{FORCE_DATA_FILE}' not found.")
-    with open(FORCE_DATA_FILE, "r") as file:
-        return yaml.safe_load(file)
+    return load_projects_file(path)
 
 
 def fetch_projects_data(atlas_org_id):
@@ -23,15 +49,90 @@ def fetch_projects_data(atlas_org_id):
     return projects
 
 
-def fetch_invoice_data(atlas_org_id):
-    """Fetch the latest invoice data from MongoDB Atlas using the given organization ID."""
-    latest_invoice_id = get_latest_invoice_id(atlas_org_id)
-    if not latest_invoice_id:
+def iter_projects_data(atlas_org_id):
+    """Stream projects from MongoDB Atlas as each page arrives."""
+    return iter_projects(atlas_org_id)
+
+
+def fetch_invoice_cost_index(atlas_org_id, invoice):
+    """Stream an invoice CSV and index its costs per cluster, or return None."""
+    cost_index = stream_invoice_cost_index(
+        atlas_org_id, invoice["id"], closed=is_invoice_closed(invoice)
+    )
+    if cost_index:
+        cost_index.invoice_id = invoice["id"]
+    return cost_index
+
+
+def fetch_recent_invoices(atlas_org_id, history_months=INVOICE_HISTORY_MONTHS):
+    """Fetch the latest ``history_months`` invoices, newest first."""
+    invoices = get_recent_invoices(atlas_org_id, max(1, history_months))
+    if not invoices:
         raise ValueError("Unable to retrieve the latest invoice ID.")
-    csv_data = fetch_invoice_csv(atlas_org_id, latest_invoice_id)
-    if not csv_data:
+    console.print(f"[DEBUG] Latest invoice ID: {invoices[0]['id']}", style="bold blue")
+    return invoices
+
+
+def merge_invoice_cost_indexes(invoices, results):
+    """Merge the downloaded invoices into the cost index of the latest one.
+
+    ``results`` holds, for each invoice, its cost index or the exception raised
+    while downloading it. The daily costs of every downloaded invoice are merged
+    into a DailyCostHistory that forecasts every cluster's month cost. Only the
+    latest invoice is required: an older invoice that fails to download is left
+    out of the history.
+    """
+    cost_index = results[0]
+    if isinstance(cost_index, BaseException):
+        raise cost_index
+    if not cost_index:
         raise ValueError("Unable to retrieve invoice CSV data.")
-    return csv_data
+    cost_indexes = [cost_index]
+    for invoice, history_index in zip(invoices[1:], results[1:]):
+        if isinstance(history_index, AtlasAPIError):
+            console.print(
+                f"[ERROR] Skipping invoice {invoice['id']} in the cost history: {history_index}",
+                style="bold red",
+            )
+            continue
+        if isinstance(history_index, BaseException):
+            raise history_index
+        if history_index:
+            cost_indexes.append(history_index)
+
+    history = DailyCostHistory.from_cost_indexes(cost_indexes)
+    cost_index.forecasts = forecast_month_costs(history)
+    console.print(
+        f"[DEBUG] Forecast {len(cost_index.forecasts)} clusters from {history.days} days of costs in {len(cost_indexes)} invoices.",
+        style="bold blue",
+    )
+    return cost_index
+
+
+def future_outcome(future):
+    """Return the result of a finished future, or the exception it raised."""
+    try:
+        return future.result()
+    except Exception as e:
+        return e
+
+
+def fetch_invoice_data(
+    atlas_org_id, history_months=INVOICE_HISTORY_MONTHS, max_workers=None
+):
+    """Fetch the latest invoices from MongoDB Atlas and index their costs per cluster.
+
+    The invoices are downloaded concurrently by at most ``max_workers`` threads
+    (one per invoice by default) and merged by ``merge_invoice_cost_indexes``.
+    """
+    invoices = fetch_recent_invoices(atlas_org_id, history_months)
+    with ThreadPoolExecutor(max_workers=max_workers or len(invoices)) as executor:
+        futures = [
+            executor.submit(fetch_invoice_cost_index, atlas_org_id, invoice)
+            for invoice in invoices
+        ]
+        results = [future_outcome(future) for future in futures]
+    return merge_invoice_cost_indexes(invoices, results)
 
 
 def fetch_clusters_data(project_id):
@@ -0,0 +1,192 @@
+import os
+import json
+import hashlib
+import threading
+from datetime import datetime
+from rich.table import Table
+from mongone.utils.helpers import Console
+
+console = Console()
+
+REPORT_SNAPSHOT_FILE = os.path.join("reports", "report_snapshot.json")
+
+# Format of last_access_time in report cluster entries
+REPORT_TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Minimum cost difference, in USD, reported as a change
+COST_CHANGE_THRESHOLD = 0.01
+
+
+def project_fingerprint(clusters):
+    """Hash the Atlas cluster documents of a project to detect changes."""
+    documents = sorted(clusters, key=lambda cluster: cluster.get("name", ""))
+    payload = json.dumps(documents, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def parse_report_timestamp(value):
+    try:
+        return datetime.strptime(value, REPORT_TIMESTAMP_FORMAT)
+    except (TypeError, ValueError):
+        return None
+
+
+def carried_usages(previous_project, fingerprint, cutoff_date):
+    """Return the previous usages that still hold for an unchanged project.
+
+    Nothing is carried forward when the project's cluster documents changed.
+    Otherwise the usage of every cluster that was in use with a last access
+    still inside the report period is returned, keyed by cluster name: newer
+    accesses can only keep it in use. Unused clusters, or clusters whose
+    access was unknown, may have been accessed since and are recomputed.
+    """
+    if not previous_project or previous_project.get("fingerprint") != fingerprint:
+        return {}
+    usages = {}
+    for cluster in previous_project["clusters"]:
+        last_access_time = parse_report_timestamp(cluster.get("last_access_time"))
+        if not cluster.get("inuse") or not last_access_time:
+            continue
+        if last_access_time < cutoff_date:
+            continue
+        usages[cluster["name"]] = {
+            "name": cluster["name"],
+            "last_access_time": last_access_time,
+            "unused": False,
+            "autoscaling_compute": cluster.get("autoscaling_compute"),
+            "autoscaling_disk": cluster.get("autoscaling_disk"),
+        }
+    return usages
+
+
+class PreviousReport:
+    """Report of the previous run, used to skip projects that did not change.
+
+    Only the clusters of projects whose cluster list is unchanged are carried
+    forward, and only the ones returned by ``carried_usages``. Costs are always
+    taken from the current invoice when the reports of carried projects are
+    rebuilt, so a changed invoice slice never goes stale; only the per-cluster
+    access and autoscaling fetches are skipped.
+    """
+
+    def __init__(self, report):
+        self.report = report
+        self.projects = {
+            project["id"]: project for project in report.get("report_data", [])
+        }
+        self.lock = threading.Lock()
+        self.carried_projects = 0
+        self.carried_clusters = 0
+
+    def carried_usages(self, project_id, clusters, fingerprint, cutoff_date):
+        """Return the previous usages that still hold for a project, by cluster name."""
+        usages = carried_usages(self.projects.get(project_id), fingerprint, cutoff_date)
+        with self.lock:
+            self.carried_clusters += len(usages)
+            if usages and len(usages) == len(clusters):
+                self.carried_projects += 1
+        return usages
+
+
+def load_report_snapshot(org_id, period, path=REPORT_SNAPSHOT_FILE):
+    """Load the previous report of an organization, if it used the same period."""
+    if not os.path.exists(path):
+        return None
+    with open(path, "r") as file:
+        snapshot = json.load(file)
+    if snapshot.get("org_id") != org_id or snapshot.get("period") != period:
+        console.print(
+            "[INFO] Previous report snapshot is for another organization or period, running a full report.",
+            style="bold blue",
+        )
+        return None
+    return snapshot["report"]
+
+
+def save_report_snapshot(org_id, period, report, path=REPORT_SNAPSHOT_FILE):
+    """Save a report so the next delta run can compare against it."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    snapshot = {
+        "org_id": org_id,
+        "period": period,
+        "created_at": datetime.now().isoformat(),
+        "report": report,
+    }
+    with open(path, "w") as file:
+        json.dump(snapshot, file, default=str)
+
+
+def index_clusters(report):
+    return {
+        (project["id"], cluster["name"]): dict(cluster, project=project["name"])
+        for project in report.get("report_data", [])
+        for cluster in project["clusters"]
+    }
+
+
+def diff_reports(previous_report, report):
+    """Compare two reports cluster by cluster.
+
+    Returns the new, removed, newly unused and cost-changed clusters, each as
+    a list of dicts with the project and cluster names.
+    """
+    previous_clusters = index_clusters(previous_report or {})
+    current_clusters = index_clusters(report)
+    diff = {"new": [], "removed": [], "newly_unused": [], "cost_changed": []}
+
+    for key, cluster in current_clusters.items():
+        entry = {"project": cluster["project"], "cluster": cluster["name"]}
+        previous = previous_clusters.get(key)
+        if previous is None:
+            diff["new"].append(entry)
+            continue
+        if previous.get("inuse") and not cluster.get("inuse"):
+            diff["newly_unused"].append(
+                dict(entry, last_access_time=cluster.get("last_access_time"))
+            )
+        previous_cost = previous.get("cost") or 0
+        cost = cluster.get("cost") or 0
+        if abs(cost - previous_cost) >= COST_CHANGE_THRESHOLD:
+            diff["cost_changed"].append(
+                dict(entry, previous_cost=previous_cost, cost=cost)
+            )
+
+    for key, cluster in previous_clusters.items():
+        if key not in current_clusters:
+            diff["removed"].append(
+                {"project": cluster["project"], "cluster": cluster["name"]}
+            )
+    return diff
+
+
+def display_diff(diff, previous=None):
+    """Print the differences with the previous report as a table."""
+    labels = {
+        "new": "[green]new[/]",
+        "removed": "[red]removed[/]",
+        "newly_unused": "[yellow]newly unused[/]",
+        "cost_changed": "[cyan]cost changed[/]",
+    }
+    table = Table(title="Changes Since Previous Report")
+    table.add_column("Change")
+    table.add_column("Project", style="cyan")
+    table.add_column("Cluster", style="magenta")
+    table.add_column("Detail")
+    for change, entries in diff.items():
+        for entry in entries:
+            detail = ""
+            if change == "cost_changed":
+                detail = f"${entry['previous_cost']:.2f} -> ${entry['cost']:.2f}"
+            elif change == "newly_unused":
+                detail = f"Last access: {entry['last_access_time'] or 'N/A'}"
+            table.add_row(labels[change], entry["project"], entry["cluster"], detail)
+    console.print(table)
+    summary = ", ".join(
+        f"{len(entries)} {change.replace('_', ' ')}" for change, entries in diff.items()
+    )
+    if previous is not None:
+        summary += (
+            f"; {previous.carried_projects} unchanged projects and"
+            f" {previous.carried_clusters} clusters carried forward"
+        )
+    console.print(f"[bold]Delta:[/] {summary}")
@@ -0,0 +1,158 @@
+import os
+import re
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor
+from mongone.core.config import config_organizations
+from mongone.core.report_generator import generate_report_logic, summarize_report
+from mongone.core.snapshot_store import SnapshotStore, STORE_FILE
+from mongone.core.delta import (
+    load_report_snapshot,
+    save_report_snapshot,
+    REPORT_SNAPSHOT_FILE,
+)
+from mongone.utils.helpers import Console
+from mongone.utils.http import (
+    AtlasAPIError,
+    configure_client,
+    register_org_credentials,
+)
+
+console = Console()
+
+# Per-organization reports and plans of a multi-organization run
+ORGS_DIR = "orgs"
+
+
+def organization_label(org_config):
+    """Return the name of an organization, used for its output directory."""
+    name = str(org_config.get("name") or org_config.get("atlas_org_id"))
+    return re.sub(r"[^A-Za-z0-9_.-]+", "-", name).strip("-.") or "org"
+
+
+def organization_dir(label):
+    """Return the directory holding the reports and plans of one organization."""
+    return os.path.join(ORGS_DIR, label)
+
+
+def register_organization_credentials(org_config):
+    """Register the API key an organization reads from its own environment variables.
+
+    Organizations without ``public_key_env``/``private_key_env`` use the default
+    ATLAS_PUBLIC_KEY and ATLAS_PRIVATE_KEY. Raises ValueError when a configured
+    variable is not set.
+    """
+    public_key_env = org_config.get("public_key_env")
+    private_key_env = org_config.get("private_key_env")
+    if not public_key_env and not private_key_env:
+        return
+    public_key_env = public_key_env or "ATLAS_PUBLIC_KEY"
+    private_key_env = private_key_env or "ATLAS_PRIVATE_KEY"
+    public_key = os.getenv(public_key_env)
+    private_key = os.getenv(private_key_env)
+    if not public_key or not private_key:
+        raise ValueError(
+            f"Set the {public_key_env} and {private_key_env} environment variables for organization {org_config.get('atlas_org_id')}."
+        )
+    register_org_credentials(org_config["atlas_org_id"], public_key, private_key)
+
+
+def register_organizations(config):
+    """Register the credentials of every configured organization."""
+    for org_config in config_organizations(config):
+        try:
+            register_organization_credentials(org_config)
+        except ValueError as e:
+            console.print(f"[ERROR] {e}", style="bold red")
+
+
+def generate_organization_report(
+    org_config, period, concurrency=None, incremental=False, delta=False
+):
+    """Generate the report of one organization, with its snapshot store and delta."""
+    atlas_org_id = org_config.get("atlas_org_id")
+    snapshot_file = org_config.get("report_snapshot", REPORT_SNAPSHOT_FILE)
+    previous_report = (
+        load_report_snapshot(atlas_org_id, period, snapshot_file) if delta else None
+    )
+    store = (
+        SnapshotStore(org_config.get("snapshot_store", STORE_FILE))
+        if incremental
+        else None
+    )
+    try:
+        report = generate_report_logic(
+            org_config, period, concurrency, store, previous_report
+        )
+    finally:
+        if store:
+            store.close()
+    for project in report["report_data"]:
+        project["org_id"] = atlas_org_id
+    if delta:
+        save_report_snapshot(atlas_org_id, period, report, snapshot_file)
+    return report
+
+
+def generate_organizations_report(
+    config, period, concurrency=None, incremental=False, delta=False
+):
+    """Generate the report of every configured organization concurrently.
+
+    One thread per organization runs the usual collection engine, and every
+    Atlas call goes through the shared connection pool and rate limiter, so the
+    run takes about as long as the slowest organization. Organizations whose
+    report fails are reported and left out. Returns the reports by label.
+    """
+    organizations = config_organizations(config)
+    workers = concurrency or multiprocessing.cpu_count()
+    # Size the shared pool once so no organization's run replaces the client
+    configure_client(
+        workers * len(organizations), rate_limit=config.get("requests_per_second")
+    )
+
+    futures = {}
+    with ThreadPoolExecutor(max_workers=len(organizations)) as executor:
+        for org_config in organizations:
+            label = organization_label(org_config)
+            try:
+                register_organization_credentials(org_config)
+            except ValueError as e:
+                console.print(f"[ERROR] {e}", style="bold red")
+                continue
+            org_config.setdefault(
+                "report_snapshot",
+                os.path.join(organization_dir(label), REPORT_SNAPSHOT_FILE),
+            )
+            console.print(
+                f"[INFO] Generating report for organization {label}...",
+                style="bold blue",
+            )
+            futures[label] = executor.submit(
+                generate_organization_report,
+                org_config,
+                period,
+                concurrency,
+                incremental,
+                delta,
+            )
+
+        reports = {}
+        for label, future in futures.items():
+            try:
+                reports[label] = future.result()
+            except (AtlasAPIError, ValueError) as e:
+                console.print(
+                    f"[ERROR] Report for organization {label} failed: {e}",
+                    style="bold red",
+                )
+    return reports
+
+
+def consolidate_reports(reports):
+    """Merge the reports of several organizations into one report."""
+    report_data = []
+    all_unused_clusters = []
+    for report in reports.values():
+        report_data.extend(report["report_data"])
+        all_unused_clusters.extend(report["all_unused_clusters"])
+    return summarize_report(report_data, all_unused_clusters)
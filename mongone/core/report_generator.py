@@ -1,117 +1,316 @@
 from datetime import datetime, timedelta
 from concurrent.futures import ThreadPoolExecutor
 import multiprocessing
-from mongone.data.clusters import fetch_cluster_last_access, is_cluster_autoscaling
+from mongone.data.clusters import fetch_cluster_last_access, get_cluster_autoscaling
 from mongone.data.invoices import get_cluster_cost
 from mongone.data.enviroments import detect_environment
 from mongone.optimization.plans import generate_plans
 from mongone.utils.helpers import Console
 from mongone.core.data_loader import (
     fetch_clusters_data,
-    fetch_projects_data,
+    iter_projects_data,
     fetch_invoice_data,
+    INVOICE_HISTORY_MONTHS,
+)
+from mongone.core.delta import (
+    PreviousReport,
+    project_fingerprint,
+    diff_reports,
+    display_diff,
 )
 from mongone.cost.prediction import calculate_predicted_costs
+from mongone.utils.http import configure_client, AtlasAPIError
 
 console = Console()
 
 
-def process_project(project, env_patterns, csv_data, cutoff_date):
-    project_id = project["id"]
-    project_name = project["name"]
-    environment = detect_environment(project_name, env_patterns)
-    clusters = fetch_clusters_data(project["id"])
-
-    if not clusters:
+def fetch_project_clusters(project):
+    """Fetch the clusters of a project, returning None if Atlas fails."""
+    try:
+        return fetch_clusters_data(project["id"])
+    except AtlasAPIError as e:
+        console.print(
+            f"[ERROR] Skipping project {project['name']}: unable to fetch clusters ({e})",
+            style="bold red",
+        )
         return None
 
+
+def fetch_cluster_usage(project_id, cluster, cutoff_date):
+    """Fetch the last access time and autoscaling flags of a single cluster."""
+    cluster_name = cluster["name"]
+    access_unknown = False
+    try:
+        last_access_time = fetch_cluster_last_access(
+            project_id, cluster_name, cutoff_date
+        )
+    except AtlasAPIError as e:
+        console.print(
+            f"[ERROR] Unable to fetch last access for cluster {cluster_name}: {e}",
+            style="bold red",
+        )
+        last_access_time = None
+        access_unknown = True
+
+    cluster_unused = True
+    if last_access_time and last_access_time.replace(tzinfo=None) >= cutoff_date:
+        cluster_unused = False
+    if access_unknown:
+        # Never flag a cluster as unused when its access history is unknown
+        cluster_unused = False
+
+    try:
+        autoscaling_compute, autoscaling_disk = get_cluster_autoscaling(
+            project_id, cluster
+        )
+    except AtlasAPIError as e:
+        console.print(
+            f"[ERROR] Unable to fetch autoscaling for cluster {cluster_name}: {e}",
+            style="bold red",
+        )
+        autoscaling_compute, autoscaling_disk = None, None
+
+    return {
+        "name": cluster_name,
+        "last_access_time": last_access_time,
+        "unused": cluster_unused,
+        "autoscaling_compute": autoscaling_compute,
+        "autoscaling_disk": autoscaling_disk,
+    }
+
+
+def collect_cluster_usage(project_id, cluster, cutoff_date, snapshot=None):
+    """Return a cluster's usage, reusing the stored one when the cluster is unchanged."""
+    usage = (
+        snapshot.reusable_usage(project_id, cluster, cutoff_date) if snapshot else None
+    )
+    reused = usage is not None
+    if not reused:
+        usage = fetch_cluster_usage(project_id, cluster, cutoff_date)
+    if snapshot:
+        snapshot.record(project_id, cluster, usage, reused=reused)
+    return usage
+
+
+def build_cluster_report(project_name, usage, cost_index):
+    """Combine a cluster's usage with its invoiced cost into a report entry."""
+    cost = get_cluster_cost(cost_index, project_name, usage["name"])
+
+    # Use the invoice history forecast, or extrapolate the cost to month end
+    predicted_cost = cost_index.get_forecast(project_name, usage["name"])
+    if predicted_cost is None:
+        predicted_values = calculate_predicted_costs(cost, 0)
+        predicted_cost = predicted_values["total_predicted_cost"]
+
+    last_access_time = usage["last_access_time"]
+    return {
+        "name": usage["name"],
+        # None when the access history is unknown or has no entries
+        "last_access_time": (
+            last_access_time.strftime("%Y-%m-%d %H:%M:%S") if last_access_time else None
+        ),
+        "cost": cost,
+        "predicted_cost": predicted_cost,
+        "autoscaling_compute": usage["autoscaling_compute"],
+        "autoscaling_disk": usage["autoscaling_disk"],
+        "inuse": not usage["unused"],
+    }
+
+
+def build_project_report(project, env_patterns, cluster_usages, cost_index):
+    """Build a project report and its unused cluster names from cluster usages."""
+    project_name = project["name"]
     project_report = {
-        "id": project_id,
+        "id": project["id"],
         "name": project_name,
-        "environment": environment,
+        "environment": detect_environment(project_name, env_patterns),
         "clusters": [],
     }
-
     unused_clusters = []
+    for usage in cluster_usages:
+        if usage["unused"]:
+            unused_clusters.append(usage["name"])
+        project_report["clusters"].append(
+            build_cluster_report(project_name, usage, cost_index)
+        )
+    return project_report, unused_clusters
 
-    for cluster in clusters:
-        cluster_name = cluster["name"]
-        last_access_time = fetch_cluster_last_access(project["id"], cluster_name)
 
-        cluster_unused = True
-        if last_access_time and last_access_time.replace(tzinfo=None) >= cutoff_date:
-            cluster_unused = False
+def carry_forward_usages(
+    project, clusters, fingerprint, cutoff_date, snapshot=None, previous=None
+):
+    """Return the cluster usages carried from the previous report, by cluster name."""
+    if not previous:
+        return {}
+    carried = previous.carried_usages(project["id"], clusters, fingerprint, cutoff_date)
+    if snapshot:
+        for cluster in clusters:
+            if cluster["name"] in carried:
+                snapshot.record(
+                    project["id"], cluster, carried[cluster["name"]], reused=True
+                )
+    return carried
 
-        if cluster_unused:
-            unused_clusters.append(cluster_name)
 
-        autoscaling_compute, autoscaling_disk = is_cluster_autoscaling(
-            project["id"], cluster_name
-        )
+def process_project(
+    project, env_patterns, cost_index, cutoff_date, snapshot=None, previous=None
+):
+    clusters = fetch_project_clusters(project)
 
-        cost = get_cluster_cost(csv_data, project_name, cluster_name)
+    if not clusters:
+        return None
 
-        # Llamar a la función calculate_predicted_costs
-        predicted_values = calculate_predicted_costs(cost, 0)
+    fingerprint = project_fingerprint(clusters)
+    carried = carry_forward_usages(
+        project, clusters, fingerprint, cutoff_date, snapshot, previous
+    )
+    cluster_usages = [
+        carried.get(cluster["name"])
+        or collect_cluster_usage(project["id"], cluster, cutoff_date, snapshot)
+        for cluster in clusters
+    ]
+    project_report, unused_clusters = build_project_report(
+        project, env_patterns, cluster_usages, cost_index
+    )
+    project_report["fingerprint"] = fingerprint
+    return project_report, unused_clusters
 
-        # Extraer los valores calculados
-        predicted_cost = predicted_values["total_predicted_cost"]
 
-        cluster_report = {
-            "name": cluster_name,
-            "last_access_time": (
-                last_access_time.strftime("%Y-%m-%d %H:%M:%S")
-                if last_access_time
-                else "N/A"
-            ),
-            "cost": get_cluster_cost(csv_data, project_name, cluster_name),
-            "predicted_cost": predicted_cost,
-            "autoscaling_compute": autoscaling_compute,
-            "autoscaling_disk": autoscaling_disk,
-            "inuse": not cluster_unused,
-        }
+def summarize_report(report_data, all_unused_clusters):
+    """Compute organization-wide totals for a list of project reports."""
+    total_clusters = 0
+    clusters_without_autoscaling_compute = 0
+    clusters_without_autoscaling_disk = 0
+    unused_cluster_count = 0
+    total_cost = 0.0
+    total_predicted_cost = 0.0
+    estimated_saves = 0.0
 
-        project_report["clusters"].append(cluster_report)
+    for project_report in report_data:
+        for cluster in project_report["clusters"]:
+            total_clusters += 1
+            if not cluster["autoscaling_compute"]:
+                clusters_without_autoscaling_compute += 1
+            if not cluster["autoscaling_disk"]:
+                clusters_without_autoscaling_disk += 1
+            if not cluster["inuse"]:
+                unused_cluster_count += 1
+                estimated_saves += cluster[
+                    "cost"
+                ]  # Assuming full cost is saved when scaled to free tier
+            total_cost += cluster["cost"]
+            total_predicted_cost += cluster["predicted_cost"]
+
+            # Estimating potential savings from enabling autoscaling
+            if not cluster["autoscaling_compute"] or not cluster["autoscaling_disk"]:
+                estimated_saves += (
+                    cluster["cost"] * 0.2
+                )  # Assuming autoscaling saves 20% of cost
+
+    # Savings are projected with the same month-end ratio as the cluster forecasts
+    if total_cost:
+        estimated_saves_projected = estimated_saves * total_predicted_cost / total_cost
+    else:
+        predicted_values = calculate_predicted_costs(total_cost, estimated_saves)
+        estimated_saves_projected = predicted_values["estimated_saves_projected"]
 
-    return project_report, unused_clusters
+    return {
+        "report_data": report_data,
+        "total_clusters": total_clusters,
+        "clusters_without_autoscaling_compute": clusters_without_autoscaling_compute,
+        "clusters_without_autoscaling_disk": clusters_without_autoscaling_disk,
+        "unused_cluster_count": unused_cluster_count,
+        "total_cost": total_cost,
+        "total_predicted_cost": total_predicted_cost,
+        "all_unused_clusters": all_unused_clusters,
+        "estimated_saves": estimated_saves,
+        "estimated_saves_projected": estimated_saves_projected,
+    }
+
+
+def generate_report_logic(
+    config, period, concurrency=None, store=None, previous_report=None
+):
+    """Generate a usage report for all projects in the MongoDB Atlas organization.
+
+    When ``concurrency`` is set, the asyncio collection engine is used and every
+    per-cluster fetch runs as its own task under that global limit. With a
+    ``SnapshotStore``, clusters unchanged since the previous run reuse their
+    stored usage, and the collected inventory is saved back to the store.
+    With a ``previous_report``, projects whose clusters did not change carry
+    their still-valid cluster usage forward instead of fetching it again, and
+    the changes since that report are printed.
+    """
+    atlas_org_id = config.get("atlas_org_id")
+    snapshot = store.load_snapshot(atlas_org_id) if store else None
+    previous = PreviousReport(previous_report) if previous_report else None
+
+    if concurrency:
+        from mongone.core.async_collector import collect_report
+
+        report, cost_index = collect_report(
+            config, period, concurrency, snapshot, previous
+        )
+    else:
+        report, cost_index = collect_report_threaded(config, period, snapshot, previous)
+
+    if previous:
+        display_diff(diff_reports(previous_report, report), previous)
+
+    if store:
+        store.save_run(atlas_org_id, period, report, snapshot, cost_index)
+        console.print(
+            f"[INFO] Snapshot saved to {store.path}: {snapshot.refreshed} clusters refreshed, {snapshot.reused} unchanged clusters reused.",
+            style="bold blue",
+        )
+    return report
 
 
-def generate_report_logic(config, period):
-    """Generate a usage report for all projects in the MongoDB Atlas organization."""
+def collect_report_threaded(config, period, snapshot=None, previous=None):
+    """Collect the report with a thread pool; returns the report and cost index."""
     atlas_org_id = config.get("atlas_org_id")
     env_patterns = config.get("environment_patterns")
+    max_workers = multiprocessing.cpu_count()
 
-    console.print("[INFO] Fetching projects from MongoDB Atlas...", style="bold blue")
-    projects = fetch_projects_data(atlas_org_id)
+    # Share one keep-alive connection per worker across every Atlas call
+    configure_client(max_workers, rate_limit=config.get("requests_per_second"))
 
     console.print(
-        f"[INFO] Found {len(projects)} projects. Fetching latest invoice ID...",
-        style="bold blue",
+        "[INFO] Fetching latest invoice from MongoDB Atlas...", style="bold blue"
+    )
+    cost_index = fetch_invoice_data(
+        atlas_org_id,
+        config.get("invoice_history_months", INVOICE_HISTORY_MONTHS),
+        max_workers,
     )
-    csv_data = fetch_invoice_data(atlas_org_id)
 
     console.print(
-        f"[INFO] Found {len(projects)} projects. Fetching cluster information...",
+        "[INFO] Streaming projects from MongoDB Atlas and fetching cluster information...",
         style="bold blue",
     )
     report_data = []
     all_unused_clusters = []
     cutoff_date = datetime.now().replace(tzinfo=None) - timedelta(days=period)
 
-    total_clusters = 0
-    clusters_without_autoscaling_compute = 0
-    clusters_without_autoscaling_disk = 0
-    unused_cluster_count = 0
-    total_cost = 0.0
-    estimated_saves = 0.0
-
-    with ThreadPoolExecutor(max_workers=multiprocessing.cpu_count()) as executor:
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # Projects are submitted as their page arrives instead of after the crawl
         futures = [
             executor.submit(
-                process_project, project, env_patterns, csv_data, cutoff_date
+                process_project,
+                project,
+                env_patterns,
+                cost_index,
+                cutoff_date,
+                snapshot,
+                previous,
             )
-            for project in projects
+            for project in iter_projects_data(atlas_org_id)
         ]
+        if not futures:
+            raise ValueError(
+                "No projects found in the organization or an error occurred."
+            )
+        console.print(f"[INFO] Found {len(futures)} projects.", style="bold blue")
         for future in futures:
             result = future.result()
             if result:
@@ -119,47 +318,7 @@ def generate_report_logic(config, period):
                 report_data.append(project_report)
                 all_unused_clusters.extend(unused_clusters)
 
-                for cluster in project_report["clusters"]:
-                    total_clusters += 1
-                    if not cluster["autoscaling_compute"]:
-                        clusters_without_autoscaling_compute += 1
-                    if not cluster["autoscaling_disk"]:
-                        clusters_without_autoscaling_disk += 1
-                    if cluster["name"] in unused_clusters:
-                        unused_cluster_count += 1
-                        estimated_saves += cluster[
-                            "cost"
-                        ]  # Assuming full cost is saved when scaled to free tier
-                    total_cost += cluster["cost"]
-
-                    # Estimating potential savings from enabling autoscaling
-                    if (
-                        not cluster["autoscaling_compute"]
-                        or not cluster["autoscaling_disk"]
-                    ):
-                        estimated_saves += (
-                            cluster["cost"] * 0.2
-                        )  # Assuming autoscaling saves 20% of cost
-
-    # Llamar a la función calculate_predicted_costs
-    predicted_values = calculate_predicted_costs(total_cost, estimated_saves)
-
-    # Extraer los valores calculados
-    total_predicted_cost = predicted_values["total_predicted_cost"]
-    estimated_saves_projected = predicted_values["estimated_saves_projected"]
-
-    return {
-        "report_data": report_data,
-        "total_clusters": total_clusters,
-        "clusters_without_autoscaling_compute": clusters_without_autoscaling_compute,
-        "clusters_without_autoscaling_disk": clusters_without_autoscaling_disk,
-        "unused_cluster_count": unused_cluster_count,
-        "total_cost": total_cost,
-        "total_predicted_cost": total_predicted_cost,
-        "all_unused_clusters": all_unused_clusters,
-        "estimated_saves": estimated_saves,
-        "estimated_saves_projected": estimated_saves_projected,
-    }
+    return summarize_report(report_data, all_unused_clusters), cost_index
 
 
 def transform_force_data_to_expected_structure(raw_data, period=30):
@@ -199,7 +358,12 @@ def transform_force_data_to_expected_structure(raw_data, period=30):
 
             cluster_report = {
                 "name": cluster.get("name"),
-                "last_access_time": cluster.get("last_access_time", "N/A"),
+                # Data files may spell an unknown access "N/A"
+                "last_access_time": (
+                    None
+                    if cluster.get("last_access_time") == "N/A"
+                    else cluster.get("last_access_time")
+                ),
                 "databases": cluster.get("databases", []),
                 "cost": cluster.get("cost", 0),
                 "predicted_cost": cluster.get("predicted_cost", 0),
@@ -0,0 +1,337 @@
+import json
+import sqlite3
+import hashlib
+import threading
+from datetime import datetime
+
+STORE_FILE = ".mongone-store.sqlite"
+
+# Seconds to wait for another organization's run to release the database
+BUSY_TIMEOUT_SECONDS = 60
+
+TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%S"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    org_id TEXT,
+    created_at TEXT NOT NULL,
+    period_days INTEGER,
+    invoice_id TEXT,
+    refreshed_clusters INTEGER,
+    reused_clusters INTEGER
+);
+CREATE TABLE IF NOT EXISTS projects (
+    id TEXT PRIMARY KEY,
+    org_id TEXT,
+    name TEXT,
+    environment TEXT,
+    updated_run_id INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_projects_environment ON projects (environment);
+CREATE TABLE IF NOT EXISTS clusters (
+    project_id TEXT NOT NULL,
+    cluster_name TEXT NOT NULL,
+    environment TEXT,
+    metadata_hash TEXT,
+    state_name TEXT,
+    autoscaling_compute INTEGER,
+    autoscaling_disk INTEGER,
+    last_access_time TEXT,
+    inuse INTEGER,
+    cost REAL,
+    checked_at TEXT,
+    updated_run_id INTEGER,
+    PRIMARY KEY (project_id, cluster_name)
+);
+CREATE INDEX IF NOT EXISTS idx_clusters_environment ON clusters (environment);
+CREATE TABLE IF NOT EXISTS cluster_history (
+    run_id INTEGER NOT NULL,
+    project_id TEXT NOT NULL,
+    cluster_name TEXT NOT NULL,
+    environment TEXT,
+    last_access_time TEXT,
+    inuse INTEGER,
+    autoscaling_compute INTEGER,
+    autoscaling_disk INTEGER,
+    cost REAL
+);
+CREATE INDEX IF NOT EXISTS idx_cluster_history_cluster
+    ON cluster_history (project_id, cluster_name);
+CREATE INDEX IF NOT EXISTS idx_cluster_history_environment
+    ON cluster_history (environment);
+CREATE TABLE IF NOT EXISTS invoice_costs_by_sku (
+    invoice_id TEXT NOT NULL,
+    project_name TEXT,
+    cluster_name TEXT,
+    sku TEXT,
+    amount REAL
+);
+CREATE INDEX IF NOT EXISTS idx_invoice_costs_by_sku_cluster
+    ON invoice_costs_by_sku (project_name, cluster_name);
+CREATE INDEX IF NOT EXISTS idx_invoice_costs_by_sku_invoice
+    ON invoice_costs_by_sku (invoice_id);
+CREATE TABLE IF NOT EXISTS invoice_costs_by_date (
+    invoice_id TEXT NOT NULL,
+    project_name TEXT,
+    cluster_name TEXT,
+    usage_date TEXT,
+    amount REAL
+);
+CREATE INDEX IF NOT EXISTS idx_invoice_costs_by_date_cluster
+    ON invoice_costs_by_date (project_name, cluster_name);
+CREATE INDEX IF NOT EXISTS idx_invoice_costs_by_date_invoice
+    ON invoice_costs_by_date (invoice_id);
+"""
+
+
+def cluster_metadata_hash(cluster):
+    """Hash the Atlas cluster document to detect configuration changes."""
+    document = json.dumps(cluster, sort_keys=True, default=str)
+    return hashlib.sha1(document.encode("utf-8")).hexdigest()
+
+
+def format_timestamp(value):
+    return value.strftime(TIMESTAMP_FORMAT) if value else None
+
+
+def parse_timestamp(value):
+    return datetime.strptime(value, TIMESTAMP_FORMAT) if value else None
+
+
+class InventorySnapshot:
+    """Cluster state of the previous run, used to skip unchanged clusters.
+
+    A stored cluster is reused when its Atlas document is unchanged and its
+    stored last access is still inside the report period: newer accesses can
+    only keep it in use. Clusters that were unused, or whose access history
+    or autoscaling was unknown, are always fetched again. Every cluster collected in this run
+    is recorded so it can be written back to the store.
+    """
+
+    def __init__(self, known_clusters=None):
+        self.known_clusters = known_clusters or {}
+        self.records = {}
+        self.lock = threading.Lock()
+        self.reused = 0
+        self.refreshed = 0
+
+    def reusable_usage(self, project_id, cluster, cutoff_date):
+        """Return the stored usage of an unchanged cluster, or None."""
+        known = self.known_clusters.get((project_id, cluster["name"]))
+        if not known or known["metadata_hash"] != cluster_metadata_hash(cluster):
+            return None
+        last_access_time = parse_timestamp(known["last_access_time"])
+        if not last_access_time or last_access_time < cutoff_date:
+            return None
+        # Autoscaling that could not be fetched last time is fetched again
+        if known["autoscaling_compute"] is None or known["autoscaling_disk"] is None:
+            return None
+        return {
+            "name": cluster["name"],
+            "last_access_time": last_access_time,
+            "unused": False,
+            "autoscaling_compute": known["autoscaling_compute"],
+            "autoscaling_disk": known["autoscaling_disk"],
+        }
+
+    def record(self, project_id, cluster, usage, reused=False):
+        """Remember the usage collected for a cluster in this run."""
+        with self.lock:
+            self.records[(project_id, cluster["name"])] = {
+                "metadata_hash": cluster_metadata_hash(cluster),
+                "state_name": cluster.get("stateName"),
+                "last_access_time": usage["last_access_time"],
+                "autoscaling_compute": usage["autoscaling_compute"],
+                "autoscaling_disk": usage["autoscaling_disk"],
+            }
+            if reused:
+                self.reused += 1
+            else:
+                self.refreshed += 1
+
+
+class SnapshotStore:
+    """SQLite store of the organization inventory collected by each report.
+
+    Holds the latest state of every project and cluster, a per-run history of
+    cluster usage and cost, and the per-SKU and per-day costs of the invoices
+    seen, so past reports can be queried locally instead of re-crawling Atlas.
+    """
+
+    def __init__(self, path=STORE_FILE):
+        self.path = path
+        self.connection = sqlite3.connect(path, timeout=BUSY_TIMEOUT_SECONDS)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.executescript(SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    def load_snapshot(self, org_id):
+        """Return an InventorySnapshot with the stored clusters of an organization."""
+        rows = self.connection.execute(
+            """
+            SELECT c.project_id, c.cluster_name, c.metadata_hash, c.last_access_time,
+                   c.autoscaling_compute, c.autoscaling_disk
+            FROM clusters c JOIN projects p ON p.id = c.project_id
+            WHERE p.org_id = ?
+            """,
+            (org_id,),
+        )
+        known_clusters = {
+            (row["project_id"], row["cluster_name"]): {
+                "metadata_hash": row["metadata_hash"],
+                "last_access_time": row["last_access_time"],
+                "autoscaling_compute": (
+                    None
+                    if row["autoscaling_compute"] is None
+                    else bool(row["autoscaling_compute"])
+                ),
+                "autoscaling_disk": (
+                    None
+                    if row["autoscaling_disk"] is None
+                    else bool(row["autoscaling_disk"])
+                ),
+            }
+            for row in rows
+        }
+        return InventorySnapshot(known_clusters)
+
+    def save_run(self, org_id, period, report, snapshot, cost_index=None):
+        """Store the projects, clusters and invoice costs of a finished report."""
+        now = datetime.now().strftime(TIMESTAMP_FORMAT)
+        invoice_id = getattr(cost_index, "invoice_id", None)
+        with self.connection:
+            cursor = self.connection.execute(
+                """
+                INSERT INTO runs (org_id, created_at, period_days, invoice_id,
+                                  refreshed_clusters, reused_clusters)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    org_id,
+                    now,
+                    period,
+                    invoice_id,
+                    snapshot.refreshed,
+                    snapshot.reused,
+                ),
+            )
+            run_id = cursor.lastrowid
+
+            project_rows = []
+            cluster_rows = []
+            history_rows = []
+            for project in report["report_data"]:
+                project_rows.append(
+                    (
+                        project["id"],
+                        org_id,
+                        project["name"],
+                        project["environment"],
+                        run_id,
+                    )
+                )
+                for cluster in project["clusters"]:
+                    record = snapshot.records.get((project["id"], cluster["name"]))
+                    if not record:
+                        continue
+                    last_access_time = format_timestamp(record["last_access_time"])
+                    cluster_rows.append(
+                        (
+                            project["id"],
+                            cluster["name"],
+                            project["environment"],
+                            record["metadata_hash"],
+                            record["state_name"],
+                            record["autoscaling_compute"],
+                            record["autoscaling_disk"],
+                            last_access_time,
+                            cluster["inuse"],
+                            cluster["cost"],
+                            now,
+                            run_id,
+                        )
+                    )
+                    history_rows.append(
+                        (
+                            run_id,
+                            project["id"],
+                            cluster["name"],
+                            project["environment"],
+                            last_access_time,
+                            cluster["inuse"],
+                            record["autoscaling_compute"],
+                            record["autoscaling_disk"],
+                            cluster["cost"],
+                        )
+                    )
+
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO projects VALUES (?, ?, ?, ?, ?)", project_rows
+            )
+            # Clusters that disappeared from the organization are dropped
+            self.connection.execute(
+                """
+                DELETE FROM clusters WHERE project_id IN (
+                    SELECT id FROM projects WHERE org_id = ?
+                )
+                """,
+                (org_id,),
+            )
+            self.connection.executemany(
+                "INSERT INTO clusters VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                cluster_rows,
+            )
+            self.connection.executemany(
+                "INSERT INTO cluster_history VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                history_rows,
+            )
+            if invoice_id:
+                self.save_invoice_costs(invoice_id, cost_index)
+        return run_id
+
+    def save_invoice_costs(self, invoice_id, cost_index):
+        """Replace the stored costs of an invoice, per cluster and SKU or day."""
+        for table in ["invoice_costs_by_sku", "invoice_costs_by_date"]:
+            self.connection.execute(
+                f"DELETE FROM {table} WHERE invoice_id = ?", (invoice_id,)
+            )
+        self.connection.executemany(
+            "INSERT INTO invoice_costs_by_sku VALUES (?, ?, ?, ?, ?)",
+            (
+                (invoice_id, project_name, cluster_name, sku, amount)
+                for (project_name, cluster_name), skus in cost_index.by_sku.items()
+                for sku, amount in skus.items()
+            ),
+        )
+        self.connection.executemany(
+            "INSERT INTO invoice_costs_by_date VALUES (?, ?, ?, ?, ?)",
+            (
+                (invoice_id, project_name, cluster_name, usage_date, amount)
+                for (project_name, cluster_name), dates in cost_index.by_date.items()
+                for usage_date, amount in dates.items()
+            ),
+        )
+
+    def cluster_history(self, project, cluster_name):
+        """Return the stored usage and cost of a cluster across runs, oldest first.
+
+        ``project`` is the project ID or name.
+        """
+        return [
+            dict(row)
+            for row in self.connection.execute(
+                """
+                SELECT r.created_at, h.project_id, h.environment, h.last_access_time,
+                       h.inuse, h.autoscaling_compute, h.autoscaling_disk, h.cost
+                FROM cluster_history h
+                JOIN runs r ON r.id = h.run_id
+                LEFT JOIN projects p ON p.id = h.project_id
+                WHERE (h.project_id = ? OR p.name = ?) AND h.cluster_name = ?
+                ORDER BY h.run_id
+                """,
+                (project, project, cluster_name),
+            )
+        ]
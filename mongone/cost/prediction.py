@@ -1,7 +1,33 @@
-from datetime import datetime
+import calendar
+from array import array
+from datetime import datetime, date, timedelta
+from operator import mul
+from mongone.utils.helpers import Console
 
+console = Console()
 
-def calculate_predicted_costs(total_cost, estimated_saves):
+# Usage Date formats found in invoice CSVs: ISO and the US MM/DD/YYYY
+USAGE_DATE_FORMATS = ["%Y-%m-%d", "%m/%d/%Y"]
+
+# Number of trailing billed days used to fit each cluster's cost trend
+TREND_WINDOW_DAYS = 14
+
+
+def parse_usage_date(value):
+    for usage_date_format in USAGE_DATE_FORMATS:
+        try:
+            return datetime.strptime(value, usage_date_format).date()
+        except (TypeError, ValueError):
+            continue
+    return None
+
+
+def days_in_month(day):
+    """Return the number of days of the month containing the given date."""
+    return calendar.monthrange(day.year, day.month)[1]
+
+
+def calculate_predicted_costs(total_cost, estimated_saves, today=None):
     """
     Calculate the predicted total cost and estimated savings for the month
     based on the current usage and day of the month.
@@ -9,13 +35,13 @@ def calculate_predicted_costs(total_cost, estimated_saves):
     Args:
         total_cost (float): The current total cost.
         estimated_saves (float): The estimated savings based on optimizations.
+        today (date, optional): The day the costs were accrued up to. Defaults to today.
 
     Returns:
         dict: A dictionary containing 'total_predicted_cost' and 'estimated_saves_projected'.
     """
-    days_in_month = 30  # Assuming a 30-day month for simplicity
-    today = datetime.now().day
-    predicted_multiplier = days_in_month / today if today > 0 else 1
+    today = today or datetime.now().date()
+    predicted_multiplier = days_in_month(today) / today.day
 
     total_predicted_cost = total_cost * predicted_multiplier
     estimated_saves_projected = estimated_saves * predicted_multiplier
@@ -24,3 +50,113 @@ def calculate_predicted_costs(total_cost, estimated_saves):
         "total_predicted_cost": total_predicted_cost,
         "estimated_saves_projected": estimated_saves_projected,
     }
+
+
+class DailyCostHistory:
+    """Daily cost of every cluster over a contiguous range of usage dates.
+
+    Costs are stored in a single flat array of doubles, one row of ``days``
+    values per cluster, so tens of thousands of clusters times several months
+    take a few megabytes and every row can be reduced without Python objects
+    per value.
+    """
+
+    def __init__(self, keys, start_date, days, costs):
+        self.keys = keys
+        self.rows = {key: index for index, key in enumerate(keys)}
+        self.start_date = start_date
+        self.days = days
+        self.costs = costs
+
+    @property
+    def end_date(self):
+        return self.start_date + timedelta(days=self.days - 1)
+
+    @classmethod
+    def from_cost_indexes(cls, cost_indexes):
+        """Merge the per-day costs of several invoice cost indexes."""
+        # Usage dates repeat for every cluster, so each one is parsed once
+        usage_days = {}
+        keys = set()
+        for cost_index in cost_indexes:
+            invoice_dates = set()
+            for key, dates in cost_index.by_date.items():
+                keys.add(key)
+                invoice_dates.update(dates)
+            for usage_date in invoice_dates:
+                if usage_date not in usage_days:
+                    usage_days[usage_date] = parse_usage_date(usage_date)
+            if invoice_dates and not any(usage_days[d] for d in invoice_dates):
+                console.print(
+                    f"[WARNING] No usage date of invoice {getattr(cost_index, 'invoice_id', None)} could be parsed "
+                    f"(for example {min(invoice_dates)!r}); its costs are left out of the forecast.",
+                    style="bold yellow",
+                )
+        known_days = [day for day in usage_days.values() if day]
+        if not known_days:
+            return cls([], date.today(), 0, array("d"))
+
+        start_date = min(known_days)
+        days = (max(known_days) - start_date).days + 1
+        offsets = {
+            usage_date: (day - start_date).days
+            for usage_date, day in usage_days.items()
+            if day
+        }
+        keys = sorted(keys)
+        history = cls(keys, start_date, days, array("d", [0.0]) * (len(keys) * days))
+        for cost_index in cost_indexes:
+            for key, dates in cost_index.by_date.items():
+                row_start = history.rows[key] * days
+                for usage_date, amount in dates.items():
+                    offset = offsets.get(usage_date)
+                    if offset is not None:
+                        history.costs[row_start + offset] += amount
+        return history
+
+
+def forecast_month_costs(history, trend_days=TREND_WINDOW_DAYS):
+    """Forecast the month-end cost of every cluster in a cost history.
+
+    The month forecast is the cost already billed in the month of the last
+    billed day plus the remaining days of that month, whose real length is
+    used. The remaining days are projected from a least-squares line fitted to
+    each cluster's last ``trend_days`` billed days and clipped at zero. The fit
+    weights are shared by all clusters, so each cluster is reduced with a few
+    C-level passes over its row of the flat cost array.
+
+    Returns a dict of predicted month costs keyed like the history rows.
+    """
+    if not history.days:
+        return {}
+    end_date = history.end_date
+    month_start = max(0, (end_date.replace(day=1) - history.start_date).days)
+    remaining_days = days_in_month(end_date) - end_date.day
+
+    window = min(trend_days, history.days)
+    window_start = history.days - window
+    center = (window - 1) / 2
+    weights = array("d", [x - center for x in range(window)])
+    weights_norm = sum(w * w for w in weights)
+    # Sum of the future day offsets 1..remaining_days, counted from the window end
+    future_offsets = remaining_days * (window - 1 - center) + (
+        remaining_days * (remaining_days + 1) / 2
+    )
+
+    costs = memoryview(history.costs)
+    forecasts = {}
+    for index, key in enumerate(history.keys):
+        row_start = index * history.days
+        month_to_date = sum(costs[row_start + month_start : row_start + history.days])
+        recent = costs[row_start + window_start : row_start + history.days]
+        level = sum(recent) / window
+        slope = sum(map(mul, weights, recent)) / weights_norm if weights_norm else 0.0
+
+        projected = remaining_days * level + slope * future_offsets
+        if slope < 0:
+            # Stop the projection on the day the trend line reaches zero
+            last_level = level + slope * (window - 1 - center)
+            days_left = max(0, min(remaining_days, int(last_level / -slope)))
+            projected = days_left * last_level + slope * days_left * (days_left + 1) / 2
+        forecasts[key] = month_to_date + max(0.0, projected)
+    return forecasts
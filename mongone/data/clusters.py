@@ -1,47 +1,102 @@
+import calendar
 from rich.console import Console
 import dateutil.parser
-from mongone.utils.http import make_request
+from mongone.utils.http import make_request, atlas_api_url
+from mongone.data.pagination import paginate
 
 console = Console()
 
+# Largest number of access log entries Atlas returns per request
+ACCESS_LOGS_PAGE_SIZE = 20000
+# Number of entries requested when only checking for access since the cutoff
+ACCESS_LOGS_PROBE_SIZE = 10
+
+
+def iter_clusters(project_id):
+    """Stream cluster information from MongoDB Atlas project, page by page."""
+    url = atlas_api_url(f"/groups/{project_id}/clusters")
+    return paginate(url)
+
 
 def fetch_clusters(project_id):
     """Fetch cluster information from MongoDB Atlas project."""
-    url = f"https://cloud.mongodb.com/api/atlas/v2/groups/{project_id}/clusters"
-    response = make_request(url)
-    if response:
+    clusters = list(iter_clusters(project_id))
+    if clusters:
         console.print(
-            f"[INFO] Successfully fetched {len(response.json().get('results', []))} clusters for project ID: {project_id}.",
+            f"[INFO] Successfully fetched {len(clusters)} clusters for project ID: {project_id}.",
             style="bold green",
         )
-        return response.json().get("results", [])
-    return []
+    return clusters
 
 
-def fetch_cluster_last_access(project_id, cluster_name):
-    """Fetch the last access time for a specific cluster from MongoDB Atlas."""
-    url = f"https://cloud.mongodb.com/api/atlas/v2/groups/{project_id}/dbAccessHistory/clusters/{cluster_name}"
-    response = make_request(url)
-    if response and "accessLogs" in response.json() and response.json()["accessLogs"]:
-        # Sort by timestamp to find the most recent access
-        access_logs = sorted(
-            response.json()["accessLogs"],
-            key=lambda x: x.get("timestamp", ""),
-            reverse=True,
-        )
+def parse_access_timestamp(timestamp):
+    """Parse an access log timestamp, returning None if it is malformed."""
+    try:
+        return dateutil.parser.parse(timestamp)
+    except (ValueError, TypeError, OverflowError):
         console.print(
-            f"[DEBUG] Timestamp received: {access_logs[0]['timestamp']}",
-            style="bold blue",
+            f"[ERROR] Unable to parse timestamp: {timestamp}",
+            style="bold red",
         )
-        try:
-            # Attempt to parse the timestamp
-            return dateutil.parser.parse(access_logs[0]["timestamp"])
-        except (ValueError, TypeError):
+        return None
+
+
+def probe_recent_access(url, cutoff_date):
+    """Ask Atlas only for access logs newer than the cutoff, returning the latest."""
+    # Round the bound down to the hour so repeated runs share cached responses;
+    # entries between the rounded bound and the cutoff are filtered below.
+    start = cutoff_date.replace(minute=0, second=0, microsecond=0)
+    params = {
+        "start": calendar.timegm(start.timetuple()) * 1000,
+        "nLogs": ACCESS_LOGS_PROBE_SIZE,
+    }
+    response = make_request(url, params=params)
+    if not response:
+        return None
+
+    latest_access = None
+    for log in response.json().get("accessLogs", []) or []:
+        access_time = parse_access_timestamp(log.get("timestamp"))
+        if access_time is None or access_time.replace(tzinfo=None) < cutoff_date:
+            continue
+        if latest_access is None or access_time > latest_access:
+            latest_access = access_time
+    return latest_access
+
+
+def fetch_cluster_last_access(project_id, cluster_name, cutoff_date=None):
+    """Fetch the last access time for a specific cluster from MongoDB Atlas.
+
+    With a ``cutoff_date`` the lookup first asks for a handful of entries newer
+    than the cutoff and stops there when one is found; only clusters without
+    recent access fall back to scanning their whole access history.
+    """
+    url = atlas_api_url(f"/groups/{project_id}/dbAccessHistory/clusters/{cluster_name}")
+    if cutoff_date is not None:
+        latest_access = probe_recent_access(url, cutoff_date)
+        if latest_access is not None:
             console.print(
-                f"[ERROR] Unable to parse timestamp: {access_logs[0]['timestamp']}",
-                style="bold red",
+                f"[DEBUG] Recent access found for cluster {cluster_name}: {latest_access}",
+                style="bold blue",
             )
-            return None
+            return latest_access
+
+    access_logs = paginate(
+        url,
+        params={"nLogs": ACCESS_LOGS_PAGE_SIZE},
+        items_key="accessLogs",
+        paged=False,
+    )
+    # Keep the most recent access in a single pass over every page
+    latest_timestamp = max(
+        (log.get("timestamp", "") for log in access_logs), default=None
+    )
+    if latest_timestamp:
+        console.print(
+            f"[DEBUG] Timestamp received: {latest_timestamp}",
+            style="bold blue",
+        )
+        return parse_access_timestamp(latest_timestamp)
     console.print(
         f"[WARNING] No access logs found for cluster: {cluster_name}",
         style="bold yellow",
@@ -49,30 +104,60 @@ def fetch_cluster_last_access(project_id, cluster_name):
     return None
 
 
-from mongone.utils.http import make_request
+def extract_cluster_autoscaling(cluster_data):
+    """Extract compute and disk autoscaling flags from a cluster document.
+
+    Every region config of every replication spec is considered; a flag is only
+    reported as enabled when all region configs have it enabled. Returns
+    (None, None) when the document carries no region configs.
+    """
+    region_configs = [
+        region_config
+        for replication_spec in cluster_data.get("replicationSpecs", []) or []
+        for region_config in replication_spec.get("regionConfigs", []) or []
+    ]
+    if not region_configs:
+        return None, None
+
+    compute_scaling = all(
+        (region_config.get("autoScaling") or {})
+        .get("compute", {})
+        .get("enabled", False)
+        for region_config in region_configs
+    )
+    disk_scaling = all(
+        (region_config.get("autoScaling") or {}).get("diskGB", {}).get("enabled", False)
+        for region_config in region_configs
+    )
+    return compute_scaling, disk_scaling
 
 
 def is_cluster_autoscaling(group_id, cluster_name):
     """Check if the cluster has autoscaling enabled for compute or disk."""
-    url = f"https://cloud.mongodb.com/api/atlas/v2/groups/{group_id}/clusters/{cluster_name}"
+    url = atlas_api_url(f"/groups/{group_id}/clusters/{cluster_name}")
     response = make_request(url)
 
     if not response or response.status_code != 200:
         return None, None
 
     try:
-        cluster_data = response.json()
-        replication_specs = cluster_data.get("replicationSpecs", [])
-
-        if replication_specs:
-            region_configs = replication_specs[0].get("regionConfigs", [])
-            if region_configs:
-                auto_scaling = region_configs[0].get("autoScaling", {})
-                compute_scaling = auto_scaling.get("compute", {}).get("enabled", False)
-                disk_scaling = auto_scaling.get("diskGB", {}).get("enabled", False)
-                return compute_scaling, disk_scaling
+        compute_scaling, disk_scaling = extract_cluster_autoscaling(response.json())
+        if compute_scaling is not None:
+            return compute_scaling, disk_scaling
 
     except Exception as e:
         print(f"[ERROR] Failed to parse autoscaling information: {e}")
 
     return False, False
+
+
+def get_cluster_autoscaling(group_id, cluster):
+    """Get autoscaling flags from a cluster list entry, fetching it only if needed."""
+    compute_scaling, disk_scaling = extract_cluster_autoscaling(cluster)
+    if compute_scaling is not None:
+        return compute_scaling, disk_scaling
+    console.print(
+        f"[DEBUG] No region configs in cluster list entry for {cluster['name']}, fetching cluster details.",
+        style="bold blue",
+    )
+    return is_cluster_autoscaling(group_id, cluster["name"])
@@ -1,79 +1,187 @@
 from rich.console import Console
 import csv
+import codecs
 from io import StringIO
-from mongone.utils.http import make_request
+from itertools import chain
+from mongone.utils.http import make_request, atlas_api_url
+from mongone.utils.cache import IMMUTABLE, STREAM_CHUNK_SIZE
+from mongone.data.pagination import paginate
 
 console = Console()
 
+INVOICE_CSV_HEADER = "Date,Usage Date,"
 
-def get_latest_invoice_id(org_id):
-    """Fetch the latest invoice ID for the MongoDB Atlas organization."""
-    url = f"https://cloud.mongodb.com/api/atlas/v2/orgs/{org_id}/invoices"
-    response = make_request(url)
-    if response:
-        invoices = response.json().get("results", [])
-        if invoices:
-            # Sort invoices by end date and get the latest one
-            latest_invoice = sorted(invoices, key=lambda x: x["endDate"], reverse=True)[
-                0
-            ]
-            console.print(
-                f"[DEBUG] Latest invoice ID: {latest_invoice['id']}", style="bold blue"
-            )
-            return latest_invoice["id"]
+
+def get_latest_invoice(org_id):
+    """Fetch the latest invoice for the MongoDB Atlas organization."""
+    url = atlas_api_url(f"/orgs/{org_id}/invoices")
+    # Walk every page and keep the invoice with the latest end date
+    latest_invoice = max(paginate(url), key=lambda x: x["endDate"], default=None)
+    if latest_invoice:
+        console.print(
+            f"[DEBUG] Latest invoice ID: {latest_invoice['id']}", style="bold blue"
+        )
+        return latest_invoice
     console.print("[ERROR] No invoices found for the organization.", style="bold red")
     return None
 
 
-def fetch_invoice_csv(org_id, invoice_id):
-    """Fetch the CSV data for a specific invoice."""
-    csv_url = f"https://cloud.mongodb.com/api/atlas/v2/orgs/{org_id}/invoices/{invoice_id}/csv"
-    csv_response = make_request(csv_url, response_format="csv")
+def get_recent_invoices(org_id, count):
+    """Fetch the ``count`` invoices with the latest end dates, newest first."""
+    url = atlas_api_url(f"/orgs/{org_id}/invoices")
+    invoices = sorted(paginate(url), key=lambda x: x["endDate"], reverse=True)
+    return invoices[:count]
+
+
+def get_latest_invoice_id(org_id):
+    """Fetch the latest invoice ID for the MongoDB Atlas organization."""
+    latest_invoice = get_latest_invoice(org_id)
+    return latest_invoice["id"] if latest_invoice else None
+
+
+def is_invoice_closed(invoice):
+    """Check whether an invoice is final and its line items can no longer change."""
+    return invoice.get("statusName", "PENDING") != "PENDING"
+
+
+def iter_text_lines(chunks, encoding="utf-8"):
+    """Decode streamed chunks strictly and yield their lines.
+
+    Unlike ``iter_lines(decode_unicode=True)``, which replaces invalid bytes,
+    a malformed invoice raises UnicodeDecodeError.
+    """
+    pending = ""
+    for text in codecs.iterdecode(chunks, encoding):
+        lines = (pending + text).splitlines()
+        pending = lines.pop() if lines and not text.endswith(("\n", "\r")) else ""
+        yield from lines
+    if pending:
+        yield pending
+
+
+def stream_invoice_cost_index(org_id, invoice_id, closed=False):
+    """Stream the CSV of an invoice into an InvoiceCostIndex, or return None.
+
+    The CSV is read line by line as it downloads: the metadata preamble is
+    skipped up to the line-item header and every row is aggregated as soon as
+    it is parsed, so memory stays bounded by the index, not the invoice size.
+    """
+    csv_url = atlas_api_url(f"/orgs/{org_id}/invoices/{invoice_id}/csv")
+    csv_response = make_request(
+        csv_url,
+        response_format="csv",
+        cache_ttl=IMMUTABLE if closed else None,
+        stream=True,
+    )
 
     if not csv_response or csv_response.status_code != 200:
         console.print("[ERROR] Unable to retrieve invoice CSV data.", style="bold red")
         return None
 
     try:
-        csv_data = csv_response.content.decode("utf-8")
+        csv_lines = iter_text_lines(csv_response.iter_content(STREAM_CHUNK_SIZE))
+        # Skip the metadata before the actual CSV header (the line that starts with "Date,")
+        header = next(
+            (line for line in csv_lines if line.startswith(INVOICE_CSV_HEADER)),
+            None,
+        )
+        if header is None:
+            console.print(
+                "[ERROR] CSV header not found in the response.", style="bold red"
+            )
+            return None
+        return build_invoice_cost_index(chain([header], csv_lines))
     except UnicodeDecodeError as e:
         console.print(f"[ERROR] Unable to decode CSV data: {e}", style="bold red")
         return None
+    finally:
+        csv_response.close()
 
-    # Remove metadata before the actual CSV header (find the line that starts with "Date,")
-    csv_lines = csv_data.splitlines()
-    start_index = next(
-        (i for i, line in enumerate(csv_lines) if line.startswith("Date,Usage Date,")),
-        None,
-    )
 
-    if start_index is not None:
-        csv_data = "\n".join(csv_lines[start_index:])
-    else:
-        console.print("[ERROR] CSV header not found in the response.", style="bold red")
-        return None
+class InvoiceCostIndex:
+    """Invoice line items aggregated in one pass, keyed by (project, cluster).
+
+    Totals are also broken down by SKU and by usage date so every cost lookup
+    made while building the report is a dictionary access instead of a CSV scan.
+    """
+
+    def __init__(self):
+        self.totals = {}
+        self.by_sku = {}
+        self.by_date = {}
+        self.row_count = 0
+        self.invoice_id = None
+        self.forecasts = {}
+
+    def add_row(self, row):
+        """Aggregate a single invoice CSV row."""
+        project_name = row.get("Project")
+        cluster_name = row.get("Cluster")
+        self.row_count += 1
+        if not cluster_name:
+            return
+        try:
+            amount = float(row.get("Amount") or 0)
+        except ValueError:
+            console.print(
+                f"[ERROR] Unable to parse cost amount for cluster: {cluster_name} in project: {project_name}",
+                style="bold red",
+            )
+            return
 
-    return csv_data
+        key = (project_name, cluster_name)
+        self.totals[key] = self.totals.get(key, 0.0) + amount
 
+        sku = row.get("SKU") or "unknown"
+        skus = self.by_sku.setdefault(key, {})
+        skus[sku] = skus.get(sku, 0.0) + amount
 
-def get_cluster_cost(csv_data, project_name, cluster_name):
-    """Fetch the total cost for a specific cluster from the provided CSV data."""
-    csv_reader = csv.DictReader(StringIO(csv_data))
-    total_cost = 0.0
-    headers = csv_reader.fieldnames
+        usage_date = row.get("Usage Date") or "unknown"
+        dates = self.by_date.setdefault(key, {})
+        dates[usage_date] = dates.get(usage_date, 0.0) + amount
+
+    def get_cost(self, project_name, cluster_name):
+        """Return the total cost for a cluster, or 0.0 if it is not invoiced."""
+        return self.totals.get((project_name, cluster_name), 0.0)
+
+    def get_cost_by_sku(self, project_name, cluster_name):
+        """Return the cluster cost broken down by SKU."""
+        return dict(self.by_sku.get((project_name, cluster_name), {}))
+
+    def get_cost_by_date(self, project_name, cluster_name):
+        """Return the cluster cost broken down by usage date."""
+        return dict(self.by_date.get((project_name, cluster_name), {}))
+
+    def get_forecast(self, project_name, cluster_name):
+        """Return the forecast month cost for a cluster, or None if not forecast."""
+        return self.forecasts.get((project_name, cluster_name))
+
+
+def build_invoice_cost_index(csv_data):
+    """Parse the invoice CSV once and aggregate costs per (project, cluster).
+
+    ``csv_data`` is either the CSV text or an iterable of its lines.
+    """
+    if isinstance(csv_data, str):
+        csv_data = StringIO(csv_data)
+    csv_reader = csv.DictReader(csv_data)
+    cost_index = InvoiceCostIndex()
+    headers = csv_reader.fieldnames or []
     if "Cluster" not in headers or "Project" not in headers:
         console.print(
             f"[ERROR] 'Cluster' or 'Project' column not found in CSV headers: {headers}",
             style="bold red",
         )
-        return total_cost
+        return cost_index
     for row in csv_reader:
-        if row.get("Cluster") == cluster_name and row.get("Project") == project_name:
-            try:
-                total_cost += float(row.get("Amount", 0))
-            except ValueError:
-                console.print(
-                    f"[ERROR] Unable to parse cost amount for cluster: {cluster_name} in project: {project_name}",
-                    style="bold red",
-                )
-    return total_cost
+        cost_index.add_row(row)
+    console.print(
+        f"[DEBUG] Indexed {cost_index.row_count} invoice rows for {len(cost_index.totals)} clusters.",
+        style="bold blue",
+    )
+    return cost_index
+
+
+def get_cluster_cost(cost_index, project_name, cluster_name):
+    """Fetch the total cost for a specific cluster from the invoice cost index."""
+    return cost_index.get_cost(project_name, cluster_name)
@@ -0,0 +1,93 @@
+import math
+import multiprocessing
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from rich.console import Console
+from mongone.utils.http import make_request
+
+console = Console()
+
+ATLAS_MAX_ITEMS_PER_PAGE = 500
+
+
+def get_link(page, rel):
+    """Return the href of a link relation in an Atlas list response."""
+    for link in page.get("links", []) or []:
+        if link.get("rel") == rel:
+            return link.get("href")
+    return None
+
+
+def is_main_thread():
+    return threading.current_thread() is threading.main_thread()
+
+
+def paginate(
+    url,
+    params=None,
+    items_key="results",
+    items_per_page=ATLAS_MAX_ITEMS_PER_PAGE,
+    max_workers=None,
+    paged=True,
+):
+    """Yield every item of a paginated Atlas list endpoint.
+
+    The first page is requested with ``includeCount`` so that, once
+    ``totalCount`` is known, the remaining pages are fetched in parallel and
+    yielded in order. Endpoints that do not report a total are followed through
+    their ``next`` link instead, as are endpoints without page parameters
+    (``paged=False``), such as the database access history.
+
+    Called from a worker thread, pages are fetched one at a time unless
+    ``max_workers`` is given, so the caller's pool bounds the requests in flight.
+    """
+    params = dict(params or {})
+    if paged:
+        params.setdefault("itemsPerPage", items_per_page)
+        params.setdefault("includeCount", "true")
+        params["pageNum"] = 1
+
+    response = make_request(url, params=params)
+    if not response:
+        return
+    page = response.json()
+    items = page.get(items_key, []) or []
+    yield from items
+
+    total_count = page.get("totalCount")
+    if paged and total_count is not None:
+        total_pages = math.ceil(total_count / params["itemsPerPage"])
+        if total_pages <= 1:
+            return
+
+        def fetch_page(page_num):
+            page_response = make_request(url, params={**params, "pageNum": page_num})
+            if not page_response:
+                return []
+            return page_response.json().get(items_key, []) or []
+
+        console.print(
+            f"[DEBUG] Fetching {total_pages - 1} more pages ({total_count} items) from URL: {url}",
+            style="bold blue",
+        )
+        if max_workers is None and not is_main_thread():
+            max_workers = 1
+        workers = min(total_pages - 1, max_workers or multiprocessing.cpu_count())
+        if workers == 1:
+            for page_num in range(2, total_pages + 1):
+                yield from fetch_page(page_num)
+            return
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for page_items in executor.map(fetch_page, range(2, total_pages + 1)):
+                yield from page_items
+        return
+
+    next_url = get_link(page, "next")
+    while next_url and items:
+        response = make_request(next_url)
+        if not response:
+            return
+        page = response.json()
+        items = page.get(items_key, []) or []
+        yield from items
+        next_url = get_link(page, "next")
@@ -1,17 +1,24 @@
 from rich.console import Console
-from mongone.utils.http import make_request
+from mongone.utils.http import atlas_api_url, register_project_org
+from mongone.data.pagination import paginate
 
 console = Console()
 
 
+def iter_projects(org_id):
+    """Stream project information from MongoDB Atlas organization, page by page."""
+    url = atlas_api_url(f"/orgs/{org_id}/groups")
+    for project in paginate(url):
+        # Later project requests are sent with the organization's credentials
+        register_project_org(project["id"], org_id)
+        yield project
+
+
 def fetch_projects(org_id):
     """Fetch project information from MongoDB Atlas organization."""
-    url = f"https://cloud.mongodb.com/api/atlas/v2/groups?itemsPerPage=500"
-    response = make_request(url)
-    if response:
-        console.print(
-            f"[INFO] Successfully fetched {len(response.json().get('results', []))} projects.",
-            style="bold green",
-        )
-        return response.json().get("results", [])
-    return []
+    projects = list(iter_projects(org_id))
+    console.print(
+        f"[INFO] Successfully fetched {len(projects)} projects.",
+        style="bold green",
+    )
+    return projects
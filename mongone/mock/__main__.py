@@ -0,0 +1,101 @@
+import click
+from mongone.mock.generator import generate_org, generate_orgs
+from mongone.mock.server import MockAtlasServer
+from mongone.utils.helpers import Console
+
+console = Console()
+
+
+@click.command()
+@click.option("--projects", default=10, help="Number of projects to generate.")
+@click.option("--clusters", default=10, help="Number of clusters per project.")
+@click.option(
+    "--invoice-days", default=30, help="Days of invoice line items per cluster."
+)
+@click.option("--skus", default=2, help="Invoice SKUs per cluster and day.")
+@click.option(
+    "--unused-ratio", default=0.3, help="Share of clusters without recent access."
+)
+@click.option("--seed", default=42, help="Random seed for the synthetic organization.")
+@click.option("--org-id", default="mock-org", help="Organization ID to generate.")
+@click.option(
+    "--orgs",
+    default=1,
+    help="Number of organizations to serve, with IDs '<org-id>-1', '<org-id>-2'...",
+)
+@click.option("--host", default="127.0.0.1", help="Address to listen on.")
+@click.option("--port", default=8080, help="Port to listen on.")
+@click.option(
+    "--latency", default=0.0, help="Seconds of latency added to every request."
+)
+@click.option("--error-rate", default=0.0, help="Probability of answering 500.")
+@click.option("--rate-limit-rate", default=0.0, help="Probability of answering 429.")
+@click.option("--retry-after", default=1, help="Retry-After seconds sent with 429s.")
+@click.option(
+    "--transition-seconds",
+    default=2.0,
+    help="Seconds a cluster stays UPDATING or DELETING after a change.",
+)
+def main(
+    projects,
+    clusters,
+    invoice_days,
+    skus,
+    unused_ratio,
+    seed,
+    org_id,
+    orgs,
+    host,
+    port,
+    latency,
+    error_rate,
+    rate_limit_rate,
+    retry_after,
+    transition_seconds,
+):
+    """Serve a synthetic organization through a local mock of the Atlas API."""
+    options = dict(
+        projects=projects,
+        clusters_per_project=clusters,
+        invoice_days=invoice_days,
+        skus_per_cluster=skus,
+        unused_ratio=unused_ratio,
+        seed=seed,
+    )
+    if orgs > 1:
+        org = generate_orgs(orgs, org_id=org_id, **options)
+        org_ids = [generated["org_id"] for generated in org]
+    else:
+        org = generate_org(org_id=org_id, **options)
+        org_ids = [org_id]
+    server = MockAtlasServer(
+        org,
+        host=host,
+        port=port,
+        latency=latency,
+        error_rate=error_rate,
+        rate_limit_rate=rate_limit_rate,
+        retry_after=retry_after,
+        transition_seconds=transition_seconds,
+        seed=seed,
+    )
+    console.print(
+        f"[INFO] Mock Atlas API serving {projects} projects x {clusters} clusters at {server.url}",
+        style="bold green",
+    )
+    console.print(
+        f"[INFO] export MONGONE_ATLAS_API_URL={server.url} ATLAS_PUBLIC_KEY=mock ATLAS_PRIVATE_KEY=mock",
+        style="bold blue",
+    )
+    console.print(
+        f"[INFO] Use atlas_org_id {' or '.join(repr(i) for i in org_ids)} in mongone.yaml.",
+        style="bold blue",
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+import random
+from datetime import datetime, timedelta, timezone
+
+ENVIRONMENTS = ["staging", "production", "development"]
+INSTANCE_SIZES = ["M10", "M20", "M30", "M40", "M50"]
+HOURLY_RATES = {"M10": 0.08, "M20": 0.2, "M30": 0.54, "M40": 1.04, "M50": 2.0}
+REGIONS = ["US_EAST_1", "US_WEST_2", "EU_WEST_1"]
+INVOICE_HEADER = (
+    "Date,Usage Date,Organization ID,Organization Name,Project ID,Project,SKU,"
+    "Cluster,Replica Set,Config Server,Region,Hours,Hourly Rate,Quantity,Amount"
+)
+
+
+def generate_cluster(rng, project_id, name):
+    """Build an Atlas cluster document with random size and autoscaling."""
+    instance_size = rng.choice(INSTANCE_SIZES)
+    return {
+        "id": f"{project_id}-{name}",
+        "groupId": project_id,
+        "name": name,
+        "clusterType": "REPLICASET",
+        "stateName": "IDLE",
+        "replicationSpecs": [
+            {
+                "zoneName": "Zone 1",
+                "regionConfigs": [
+                    {
+                        "providerName": "AWS",
+                        "regionName": rng.choice(REGIONS),
+                        "priority": 7,
+                        "electableSpecs": {
+                            "instanceSize": instance_size,
+                            "nodeCount": 3,
+                            "diskSizeGB": 10,
+                        },
+                        "autoScaling": {
+                            "compute": {"enabled": rng.random() < 0.5},
+                            "diskGB": {"enabled": rng.random() < 0.5},
+                        },
+                    }
+                ],
+            }
+        ],
+    }
+
+
+def generate_access_logs(rng, now, unused, count):
+    """Build access log entries, recent for used clusters and old otherwise."""
+    if unused:
+        days = [rng.uniform(60, 180) for _ in range(count)]
+    else:
+        days = [rng.uniform(0, 10) for _ in range(count)]
+    return [
+        {
+            "timestamp": (now - timedelta(days=age)).strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "authResult": True,
+            "username": "app",
+            "ipAddress": "10.0.0.1",
+        }
+        for age in sorted(days)
+    ]
+
+
+def generate_org(
+    projects=10,
+    clusters_per_project=10,
+    invoice_days=30,
+    skus_per_cluster=2,
+    access_logs_per_cluster=20,
+    unused_ratio=0.3,
+    seed=42,
+    org_id="mock-org",
+    project_offset=0,
+):
+    """Generate a synthetic Atlas organization of projects x clusters.
+
+    The result holds the project and cluster documents, the access history of
+    every cluster and two invoices (a closed one and the pending current one)
+    whose CSV line items cover ``invoice_days`` days per cluster and SKU.
+    Project IDs start at ``project_offset``, so several organizations can be
+    served together without clashing.
+    """
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc).replace(microsecond=0)
+    org = {
+        "org_id": org_id,
+        "org_name": "Mock Organization",
+        "projects": [],
+        "clusters": {},
+        "access_logs": {},
+        "invoice_days": invoice_days,
+        "skus_per_cluster": skus_per_cluster,
+        "seed": seed,
+    }
+
+    for project_index in range(projects):
+        environment = ENVIRONMENTS[project_index % len(ENVIRONMENTS)]
+        project_id = f"{project_offset + project_index:024x}"
+        org["projects"].append(
+            {
+                "id": project_id,
+                "name": f"mock-project-{project_index}-{environment}",
+                "orgId": org_id,
+                "clusterCount": clusters_per_project,
+            }
+        )
+        clusters = []
+        for cluster_index in range(clusters_per_project):
+            name = f"cluster-{cluster_index}"
+            clusters.append(generate_cluster(rng, project_id, name))
+            org["access_logs"][(project_id, name)] = generate_access_logs(
+                rng, now, rng.random() < unused_ratio, access_logs_per_cluster
+            )
+        org["clusters"][project_id] = clusters
+
+    current_start = now.replace(day=1, hour=0, minute=0, second=0)
+    previous_start = (current_start - timedelta(days=1)).replace(day=1)
+    org["invoices"] = [
+        {
+            "id": f"{org_id}-invoice-previous",
+            "orgId": org_id,
+            "startDate": previous_start.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "endDate": current_start.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "statusName": "CLOSED",
+        },
+        {
+            "id": f"{org_id}-invoice-current",
+            "orgId": org_id,
+            "startDate": current_start.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "endDate": (current_start + timedelta(days=32))
+            .replace(day=1)
+            .strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "statusName": "PENDING",
+        },
+    ]
+    return org
+
+
+def generate_orgs(count, projects=10, seed=42, org_id="mock-org", **options):
+    """Generate ``count`` synthetic organizations with distinct IDs and projects."""
+    return [
+        generate_org(
+            projects=projects,
+            seed=seed + index,
+            org_id=f"{org_id}-{index + 1}",
+            project_offset=index * projects,
+            **options,
+        )
+        for index in range(count)
+    ]
+
+
+def iter_invoice_csv_lines(org, invoice):
+    """Yield the lines of an invoice CSV, including the Atlas preamble."""
+    rng = random.Random(f"{org['seed']}-{invoice['id']}")
+    start = datetime.strptime(invoice["startDate"], "%Y-%m-%dT%H:%M:%SZ")
+    yield f"Invoice Number,{invoice['id']}"
+    yield f"Organization ID,{org['org_id']}"
+    yield f"Organization Name,{org['org_name']}"
+    yield ""
+    yield INVOICE_HEADER
+    for project in org["projects"]:
+        for cluster in org["clusters"].get(project["id"], []):
+            region_config = cluster["replicationSpecs"][0]["regionConfigs"][0]
+            instance_size = region_config["electableSpecs"]["instanceSize"]
+            hourly_rate = HOURLY_RATES.get(instance_size, 0.1)
+            for day in range(org["invoice_days"]):
+                usage_date = (start + timedelta(days=day)).strftime("%Y-%m-%d")
+                for sku_index in range(org["skus_per_cluster"]):
+                    if sku_index == 0:
+                        sku = f"ATLAS_AWS_INSTANCE_{instance_size}"
+                        hours = 24.0
+                        amount = round(hours * hourly_rate * 3, 2)
+                    else:
+                        sku = f"ATLAS_AWS_DATA_TRANSFER_{sku_index}"
+                        hours = 0.0
+                        amount = round(rng.uniform(0.01, 2.0), 2)
+                    yield (
+                        f"{usage_date},{usage_date},{org['org_id']},{org['org_name']},"
+                        f"{project['id']},{project['name']},{sku},{cluster['name']},"
+                        f"{cluster['name']}-shard-0,,{region_config['regionName']},"
+                        f"{hours},{hourly_rate},{hours},{amount}"
+                    )
+
+
+def generate_invoice_csv(org, invoice):
+    """Render an invoice CSV as a single string."""
+    return "\n".join(iter_invoice_csv_lines(org, invoice)) + "\n"
+
+
+def to_force_data(org, period=30):
+    """Convert a synthetic organization into the force-data.yaml structure."""
+    now = datetime.now(timezone.utc)
+    cutoff = now - timedelta(days=period)
+    projects = []
+    for project in org["projects"]:
+        environment = project["name"].rsplit("-", 1)[-1]
+        clusters = []
+        for cluster in org["clusters"].get(project["id"], []):
+            logs = org["access_logs"].get((project["id"], cluster["name"]), [])
+            last_access = logs[0]["timestamp"] if logs else None
+            auto_scaling = cluster["replicationSpecs"][0]["regionConfigs"][0][
+                "autoScaling"
+            ]
+            instance_size = cluster["replicationSpecs"][0]["regionConfigs"][0][
+                "electableSpecs"
+            ]["instanceSize"]
+            cost = round(HOURLY_RATES.get(instance_size, 0.1) * 24 * 3 * 30, 2)
+            inuse = bool(last_access) and (
+                datetime.strptime(last_access, "%Y-%m-%dT%H:%M:%SZ").replace(
+                    tzinfo=timezone.utc
+                )
+                >= cutoff
+            )
+            clusters.append(
+                {
+                    "name": cluster["name"],
+                    "last_access_time": (
+                        last_access.rstrip("Z") if last_access else None
+                    ),
+                    "autoscaling_compute": auto_scaling["compute"]["enabled"],
+                    "autoscaling_disk": auto_scaling["diskGB"]["enabled"],
+                    "cost": cost,
+                    "predicted_cost": round(cost * 1.2, 2),
+                    "inuse": inuse,
+                }
+            )
+        projects.append(
+            {
+                "id": project["id"],
+                "name": project["name"],
+                "environment": environment,
+                "clusters": clusters,
+            }
+        )
+    return {"projects": projects}
@@ -0,0 +1,340 @@
+import re
+import json
+import calendar
+import time
+import random
+import hashlib
+import threading
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+from mongone.mock.generator import iter_invoice_csv_lines
+
+API_PREFIX = "/api/atlas/v2"
+
+ROUTES = [
+    ("projects", re.compile(r"^/groups$")),
+    ("clusters", re.compile(r"^/groups/(?P<project_id>[^/]+)/clusters$")),
+    (
+        "cluster",
+        re.compile(r"^/groups/(?P<project_id>[^/]+)/clusters/(?P<cluster_name>[^/]+)$"),
+    ),
+    (
+        "access_history",
+        re.compile(
+            r"^/groups/(?P<project_id>[^/]+)/dbAccessHistory/clusters/(?P<cluster_name>[^/]+)$"
+        ),
+    ),
+    ("org_projects", re.compile(r"^/orgs/(?P<org_id>[^/]+)/groups$")),
+    ("invoices", re.compile(r"^/orgs/(?P<org_id>[^/]+)/invoices$")),
+    (
+        "invoice_csv",
+        re.compile(r"^/orgs/(?P<org_id>[^/]+)/invoices/(?P<invoice_id>[^/]+)/csv$"),
+    ),
+]
+
+
+class MockAtlasServer(ThreadingHTTPServer):
+    """Local stand-in for the Atlas Administration API v2 endpoints MonGone uses.
+
+    The server answers from a synthetic organization (see
+    ``mongone.mock.generator.generate_org``), paginates like Atlas, supports
+    ETag revalidation, applies cluster PATCH/DELETE requests with a short
+    UPDATING/DELETING transition, and can inject latency, 5xx errors and 429
+    responses. Several organizations can be served at once by passing a list
+    of them. Credentials are accepted but never checked.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        org,
+        host="127.0.0.1",
+        port=0,
+        latency=0.0,
+        error_rate=0.0,
+        rate_limit_rate=0.0,
+        retry_after=1,
+        transition_seconds=2.0,
+        seed=None,
+    ):
+        super().__init__((host, port), MockAtlasHandler)
+        orgs = org if isinstance(org, list) else [org]
+        self.org = orgs[0]
+        self.orgs = {org["org_id"]: org for org in orgs}
+        self.project_orgs = {
+            project["id"]: org for org in orgs for project in org["projects"]
+        }
+        self.latency = latency
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self.transition_seconds = transition_seconds
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.request_counts = {}
+        self.pending_changes = {}
+        self.thread = None
+
+    @property
+    def url(self):
+        """Base URL to export as MONGONE_ATLAS_API_URL."""
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}{API_PREFIX}"
+
+    def start(self):
+        """Serve requests from a background thread."""
+        self.thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        """Stop serving and close the listening socket."""
+        self.shutdown()
+        self.server_close()
+
+    def count_request(self, route):
+        with self.lock:
+            self.request_counts[route] = self.request_counts.get(route, 0) + 1
+
+    def should_fail(self, rate):
+        if not rate:
+            return False
+        with self.lock:
+            return self.random.random() < rate
+
+    def org_of(self, project_id):
+        """Return the organization a project belongs to."""
+        return self.project_orgs.get(project_id, self.org)
+
+    def find_cluster(self, project_id, cluster_name):
+        for cluster in self.org_of(project_id)["clusters"].get(project_id, []):
+            if cluster["name"] == cluster_name:
+                return cluster
+        return None
+
+    def settle_cluster_states(self, project_id):
+        """Finish UPDATING/DELETING transitions whose time has passed."""
+        now = time.monotonic()
+        clusters = self.org_of(project_id)["clusters"]
+        with self.lock:
+            for cluster in list(clusters.get(project_id, [])):
+                key = (project_id, cluster["name"])
+                change = self.pending_changes.get(key)
+                if not change or change["done_at"] > now:
+                    continue
+                del self.pending_changes[key]
+                if change["state"] == "DELETING":
+                    clusters[project_id].remove(cluster)
+                else:
+                    cluster["stateName"] = "IDLE"
+
+    def schedule_transition(self, project_id, cluster, state):
+        with self.lock:
+            cluster["stateName"] = state
+            self.pending_changes[(project_id, cluster["name"])] = {
+                "state": state,
+                "done_at": time.monotonic() + self.transition_seconds,
+            }
+
+
+class MockAtlasHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately; avoid Nagle/delayed-ACK stalls
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self.handle_request("GET")
+
+    def do_PATCH(self):
+        self.handle_request("PATCH")
+
+    def do_DELETE(self):
+        self.handle_request("DELETE")
+
+    def handle_request(self, method):
+        # Always consume the body so keep-alive connections stay in sync
+        body = self.read_body()
+        parsed = urlparse(self.path)
+        query = {key: values[-1] for key, values in parse_qs(parsed.query).items()}
+        path = parsed.path
+        if path.startswith(API_PREFIX):
+            path = path[len(API_PREFIX) :]
+
+        for route, pattern in ROUTES:
+            match = pattern.match(path)
+            if match:
+                break
+        else:
+            return self.send_json(404, {"detail": f"No mock route for {path}"})
+
+        server = self.server
+        server.count_request(f"{method} {route}")
+        if server.latency:
+            time.sleep(server.latency)
+        if server.should_fail(server.rate_limit_rate):
+            return self.send_json(
+                429,
+                {"detail": "Rate limit exceeded", "errorCode": "RATE_LIMITED"},
+                headers={"Retry-After": str(server.retry_after)},
+            )
+        if server.should_fail(server.error_rate):
+            return self.send_json(500, {"detail": "Injected server error"})
+
+        handler = getattr(self, f"{method.lower()}_{route}", None)
+        if handler is None:
+            return self.send_json(405, {"detail": f"{method} not allowed on {path}"})
+        handler(query, body, **match.groupdict())
+
+    def read_body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if not length:
+            return None
+        try:
+            return json.loads(self.rfile.read(length))
+        except ValueError:
+            return None
+
+    def send_body(self, status, body, content_type, headers=None):
+        etag = f'"{hashlib.md5(body).hexdigest()}"'
+        if status == 200 and self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        if status == 200:
+            self.send_header("ETag", etag)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_json(self, status, payload, headers=None):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_body(
+            status, body, "application/vnd.atlas.2024-08-05+json", headers=headers
+        )
+
+    def send_page(self, items, query):
+        """Send a list response paginated the way Atlas does."""
+        items_per_page = min(int(query.get("itemsPerPage", 100)), 500)
+        page_num = max(int(query.get("pageNum", 1)), 1)
+        start = (page_num - 1) * items_per_page
+        links = [{"rel": "self", "href": self.path}]
+        if start + items_per_page < len(items):
+            base_path = self.path.split("?", 1)[0]
+            next_query = {**query, "pageNum": page_num + 1}
+            links.append(
+                {
+                    "rel": "next",
+                    "href": f"{self.server.url[: -len(API_PREFIX)]}{base_path}?"
+                    + "&".join(f"{key}={value}" for key, value in next_query.items()),
+                }
+            )
+        payload = {"links": links, "results": items[start : start + items_per_page]}
+        if query.get("includeCount", "true") != "false":
+            payload["totalCount"] = len(items)
+        self.send_json(200, payload)
+
+    def get_projects(self, query, body):
+        projects = [
+            project for org in self.server.orgs.values() for project in org["projects"]
+        ]
+        self.send_page(projects, query)
+
+    def get_org_projects(self, query, body, org_id):
+        org = self.server.orgs.get(org_id)
+        if org is None:
+            return self.send_json(404, {"detail": "Organization not found"})
+        self.send_page(org["projects"], query)
+
+    def get_clusters(self, query, body, project_id):
+        self.server.settle_cluster_states(project_id)
+        clusters = self.server.org_of(project_id)["clusters"]
+        self.send_page(list(clusters.get(project_id, [])), query)
+
+    def get_cluster(self, query, body, project_id, cluster_name):
+        self.server.settle_cluster_states(project_id)
+        cluster = self.server.find_cluster(project_id, cluster_name)
+        if cluster is None:
+            return self.send_json(404, {"detail": "Cluster not found"})
+        self.send_json(200, cluster)
+
+    def patch_cluster(self, query, body, project_id, cluster_name):
+        self.server.settle_cluster_states(project_id)
+        cluster = self.server.find_cluster(project_id, cluster_name)
+        if cluster is None:
+            return self.send_json(404, {"detail": "Cluster not found"})
+        if cluster["stateName"] != "IDLE":
+            return self.send_json(
+                409,
+                {
+                    "detail": "Cluster is already being updated",
+                    "errorCode": "CLUSTER_UPDATE_IN_PROGRESS",
+                },
+            )
+        for key, value in (body or {}).items():
+            if key not in ["name", "groupId", "id", "stateName"]:
+                cluster[key] = value
+        self.server.schedule_transition(project_id, cluster, "UPDATING")
+        self.send_json(200, cluster)
+
+    def delete_cluster(self, query, body, project_id, cluster_name):
+        self.server.settle_cluster_states(project_id)
+        cluster = self.server.find_cluster(project_id, cluster_name)
+        if cluster is None:
+            return self.send_json(404, {"detail": "Cluster not found"})
+        self.server.schedule_transition(project_id, cluster, "DELETING")
+        self.send_json(202, {})
+
+    def get_access_history(self, query, body, project_id, cluster_name):
+        access_logs = self.server.org_of(project_id)["access_logs"]
+        logs = access_logs.get((project_id, cluster_name))
+        if logs is None:
+            return self.send_json(404, {"detail": "Cluster not found"})
+        if "start" in query:
+            start = int(query["start"]) / 1000
+            logs = [
+                log
+                for log in logs
+                if calendar.timegm(
+                    datetime.strptime(
+                        log["timestamp"], "%Y-%m-%dT%H:%M:%SZ"
+                    ).timetuple()
+                )
+                >= start
+            ]
+        n_logs = int(query.get("nLogs", 20000))
+        self.send_json(200, {"accessLogs": logs[:n_logs]})
+
+    def get_invoices(self, query, body, org_id):
+        org = self.server.orgs.get(org_id)
+        if org is None:
+            return self.send_json(404, {"detail": "Organization not found"})
+        self.send_page(org["invoices"], query)
+
+    def get_invoice_csv(self, query, body, org_id, invoice_id):
+        org = self.server.orgs.get(org_id)
+        invoice = next(
+            (i for i in (org or {}).get("invoices", []) if i["id"] == invoice_id),
+            None,
+        )
+        if invoice is None:
+            return self.send_json(404, {"detail": "Invoice not found"})
+        body = "\n".join(iter_invoice_csv_lines(org, invoice)) + "\n"
+        self.send_body(
+            200, body.encode("utf-8"), "application/vnd.atlas.2024-08-05+csv"
+        )
+
+
+def run_mock_server(org, host="127.0.0.1", port=0, **options):
+    """Start a MockAtlasServer in the background and return it."""
+    return MockAtlasServer(org, host=host, port=port, **options).start()
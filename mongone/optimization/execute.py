@@ -1,28 +1,62 @@
 import os
-import yaml
+import glob
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from rich.console import Console
-from mongone.utils.http import make_request
+from rich.live import Live
+from rich.table import Table
+from mongone.utils.http import (
+    make_request,
+    atlas_api_url,
+    configure_client,
+    register_project_org,
+    AtlasAPIError,
+)
 from mongone.core.config import load_config
+from mongone.optimization.journal import ExecutionJournal, JOURNAL_SUFFIX
+from mongone.utils.serialization import load_document
+from mongone.optimization.tracking import (
+    CompletionTracker,
+    DEFAULT_WAIT_TIMEOUT,
+    display_tracking_summary,
+)
 
 console = Console()
 
-# Base URL for MongoDB Atlas API
-BASE_URL = (
-    "https://cloud.mongodb.com/api/atlas/v2/groups/{groupId}/clusters/{clusterName}"
-)
+# Cluster path in the MongoDB Atlas API
+CLUSTER_PATH = "/groups/{groupId}/clusters/{clusterName}"
+
+# Number of cluster actions run at once when not configured
+DEFAULT_EXECUTE_CONCURRENCY = 4
+
+STATUS_STYLES = {"applied": "green", "failed": "red", "skipped": "yellow"}
+
+PLAN_TYPES = [
+    "autoscaling_computation",
+    "autoscaling_disk",
+    "scale_to_free_tier",
+    "delete_clusters",
+]
 
 
 # Proxy function to execute plans based on type and environment
-def execute_plan(plan_type, environment, plan_filename):
+def execute_plan(
+    plan_type,
+    environment,
+    plan_filename,
+    concurrency=None,
+    wait=False,
+    wait_timeout=None,
+    resume=False,
+):
     if not os.path.exists(plan_filename):
         console.print(
             f"[red]No plan file found for {plan_type} in environment {environment}. Skipping execution.[/]"
         )
         return
 
-    with open(plan_filename, "r") as plan_file:
-        plan_data = yaml.safe_load(plan_file)
+    plan_data = load_document(plan_filename, "clusters")
 
     # Verify plan metadata matches the provided context
     if (
@@ -50,21 +84,323 @@ def execute_plan(plan_type, environment, plan_filename):
         console.print("[red]Execution aborted by user.[/]")
         return
 
-    # Call the respective function based on plan type
-    if plan_type == "autoscaling_computation":
-        enable_autoscaling_computation(plan_data)
-    elif plan_type == "autoscaling_disk":
-        enable_autoscaling_disk(plan_data)
-    elif plan_type == "scale_to_free_tier":
-        scale_to_free_tier(plan_data)
-    elif plan_type == "delete_clusters":
-        delete_clusters(plan_data)
-    else:
+    if plan_type not in PLAN_TYPES:
         console.print(f"[red]Unknown plan type: {plan_type}[/]")
+        return None
+
+    outcomes = run_plan(plan_type, plan_data, plan_filename, concurrency, resume)
+    if wait:
+        track_completion([(plan_type, outcomes)], wait_timeout)
+    return outcomes
+
+
+def run_plan(
+    plan_type, plan_data, plan_filename, concurrency=None, resume=False, pool=None
+):
+    """Apply a loaded plan, journaling every cluster action next to the plan file."""
+    plan_functions = {
+        "autoscaling_computation": enable_autoscaling_computation,
+        "autoscaling_disk": enable_autoscaling_disk,
+        "scale_to_free_tier": scale_to_free_tier,
+        "delete_clusters": delete_clusters,
+    }
+    # Requests on a project use the credentials of the organization it belongs to
+    for cluster in plan_data.get("clusters", []):
+        if cluster.get("org_id") and cluster.get("project_id"):
+            register_project_org(cluster["project_id"], cluster["org_id"])
+    journal = ExecutionJournal(plan_filename).start(plan_type, resume=resume)
+    try:
+        return plan_functions[plan_type](plan_data, concurrency, journal, pool)
+    finally:
+        journal.close()
+
+
+def list_plan_environments(plans_dir="plans"):
+    """Return the environments that have a plans directory."""
+    if not os.path.isdir(plans_dir):
+        return []
+    return sorted(
+        entry
+        for entry in os.listdir(plans_dir)
+        if os.path.isdir(os.path.join(plans_dir, entry))
+    )
+
+
+def list_plan_files(environment, plan_type, plans_dir="plans"):
+    """Return the YAML and JSON Lines plans of a type, oldest first."""
+    pattern = os.path.join(plans_dir, environment, f"{plan_type}_plan_*")
+    plan_files = [
+        path
+        for path in glob.glob(pattern)
+        if path.endswith((".yaml", ".jsonl")) and not path.endswith(JOURNAL_SUFFIX)
+    ]
+    # Plan names end with their run ID, so they sort chronologically
+    return sorted(plan_files, key=lambda path: os.path.splitext(path)[0])
+
+
+def find_latest_plans(plan_types=None, environments=None, plans_dir="plans"):
+    """Return the most recent plan file of each type in each environment."""
+    environments = environments or list_plan_environments(plans_dir)
+    plan_files = []
+    for environment in environments:
+        for plan_type in plan_types or PLAN_TYPES:
+            candidates = list_plan_files(environment, plan_type, plans_dir)
+            if candidates:
+                plan_files.append(candidates[-1])
+    return plan_files
+
+
+def load_plan(plan_filename):
+    """Load a plan file and check it describes a known action."""
+    plan_data = load_document(plan_filename, "clusters") or {}
+    if plan_data.get("action") not in PLAN_TYPES or not plan_data.get("environment"):
+        raise ValueError(
+            f"{plan_filename} is not a valid plan: action {plan_data.get('action')!r}, environment {plan_data.get('environment')!r}"
+        )
+    return plan_data
+
+
+def execute_plans(
+    plan_filenames, concurrency=None, wait=False, wait_timeout=None, resume=False
+):
+    """Execute several plans unattended, without confirmation prompts.
+
+    Plans run one after the other, so two plans touching the same cluster never
+    race, but they share the Atlas HTTP client and a single worker pool and
+    per-project locks. Returns a list of ``(plan_filename, outcomes)`` pairs.
+    """
+    plans = [
+        (plan_filename, load_plan(plan_filename)) for plan_filename in plan_filenames
+    ]
+    if not concurrency:
+        concurrency = load_config().get(
+            "execute_concurrency", DEFAULT_EXECUTE_CONCURRENCY
+        )
+    configure_client(concurrency)
+
+    results = []
+    pool = ExecutionPool(concurrency)
+    try:
+        for plan_filename, plan_data in plans:
+            console.print(
+                f"[blue]Executing {plan_data['action']} in {plan_data['environment']} from {plan_filename}[/]"
+            )
+            outcomes = run_plan(
+                plan_data["action"], plan_data, plan_filename, concurrency, resume, pool
+            )
+            results.append((plan_filename, outcomes))
+    finally:
+        pool.shutdown()
+
+    if wait:
+        track_completion(
+            [
+                (plan_data["action"], outcomes)
+                for (_, plan_data), (_, outcomes) in zip(plans, results)
+            ],
+            wait_timeout,
+        )
+    return results
+
+
+def track_completion(plan_outcomes, wait_timeout=None):
+    """Wait for submitted changes to complete and print a summary.
+
+    ``plan_outcomes`` is a list of ``(plan_type, outcomes)`` pairs.
+    """
+    tracker = CompletionTracker(
+        timeout=wait_timeout
+        or load_config().get("wait_timeout_seconds", DEFAULT_WAIT_TIMEOUT)
+    )
+    for plan_type, outcomes in plan_outcomes:
+        for outcome in outcomes:
+            if outcome["status"] == "applied":
+                tracker.track(
+                    plan_type,
+                    outcome["project_id"],
+                    outcome["cluster_name"],
+                    outcome["project_name"],
+                )
+            elif outcome["status"] == "failed":
+                tracker.record_failure(
+                    plan_type,
+                    outcome["project_id"],
+                    outcome["cluster_name"],
+                    outcome["project_name"],
+                )
+    console.print(
+        f"[blue]Waiting up to {tracker.timeout}s for {len(tracker.pending)} changes to complete...[/]"
+    )
+    summary = tracker.wait()
+    display_tracking_summary(summary)
+    return summary
+
+
+def render_progress(outcomes, total, title):
+    """Render the per-cluster outcomes of a running plan as a table."""
+    table = Table(title=title, caption=f"{len(outcomes)}/{total} clusters processed")
+    table.add_column("Project", style="cyan")
+    table.add_column("Cluster", style="magenta")
+    table.add_column("Status")
+    table.add_column("Detail")
+    for outcome in outcomes:
+        style = STATUS_STYLES.get(outcome["status"], "white")
+        table.add_row(
+            outcome["project_name"] or outcome["project_id"] or "",
+            outcome["cluster_name"] or "",
+            f"[{style}]{outcome['status']}[/]",
+            outcome["detail"],
+        )
+    return table
+
+
+class ExecutionPool:
+    """Worker threads and per-project locks shared by the plans of a run."""
+
+    def __init__(self, concurrency):
+        self.executor = ThreadPoolExecutor(max_workers=concurrency)
+        self.project_locks = {}
+        self.lock = threading.Lock()
+
+    def project_lock(self, project_id):
+        with self.lock:
+            return self.project_locks.setdefault(project_id, threading.Lock())
+
+    def shutdown(self, cancel=False):
+        self.executor.shutdown(wait=True, cancel_futures=cancel)
+
+
+def run_cluster_actions(
+    plan_data, action, title, concurrency=None, journal=None, pool=None
+):
+    """Run ``action`` for every cluster of a plan concurrently.
+
+    Up to ``concurrency`` clusters are processed at once, but modifications
+    inside the same Atlas project are serialized through a per-project lock to
+    avoid conflicting updates. ``action(cluster, url, project_lock)`` returns a
+    short description of what was done. Returns the list of per-cluster
+    outcomes, which are also shown in a live progress table.
+
+    When a ``journal`` is given, clusters it already lists as applied are
+    skipped and every new outcome is appended to it by its worker as soon as
+    the action returns.
+    A shared ``pool`` may be passed to reuse its workers across plans.
+    """
+    if not concurrency:
+        concurrency = load_config().get(
+            "execute_concurrency", DEFAULT_EXECUTE_CONCURRENCY
+        )
+    clusters = plan_data.get("clusters", [])
+    if journal:
+        clusters = [
+            cluster for cluster in clusters if not journal.is_completed(cluster)
+        ]
+
+    def apply(cluster):
+        outcome = {
+            "org_id": cluster.get("org_id"),
+            "project_id": cluster.get("project_id"),
+            "project_name": cluster.get("project_name"),
+            "cluster_name": cluster.get("cluster_name"),
+            "status": "applied",
+            "detail": "",
+        }
+        if (
+            not outcome["org_id"]
+            or not outcome["project_id"]
+            or not outcome["cluster_name"]
+        ):
+            outcome["status"] = "skipped"
+            outcome["detail"] = "Missing necessary information to execute plan"
+            return outcome
+
+        url = atlas_api_url(
+            CLUSTER_PATH.format(
+                groupId=outcome["project_id"], clusterName=outcome["cluster_name"]
+            )
+        )
+        try:
+            outcome["detail"] = action(
+                cluster, url, active_pool.project_lock(outcome["project_id"])
+            )
+        except AtlasAPIError as e:
+            outcome["status"] = "failed"
+            outcome["detail"] = (
+                f"Atlas returned {e.status_code}: {e.message}"
+                if e.status_code
+                else e.message
+            )[:200]
+        except (KeyError, IndexError, TypeError, ValueError) as e:
+            outcome["status"] = "failed"
+            outcome["detail"] = f"Unexpected cluster details: {e}"
+        return outcome
+
+    def run(cluster):
+        outcome = apply(cluster)
+        # Journal from the worker, so actions still running when the run is
+        # interrupted are recorded before it stops
+        if journal:
+            journal.record(outcome)
+        return outcome
+
+    outcomes = []
+    with Live(render_progress(outcomes, len(clusters), title), console=console) as live:
+        active_pool = pool or ExecutionPool(concurrency)
+        try:
+            futures = [
+                active_pool.executor.submit(run, cluster) for cluster in clusters
+            ]
+            for future in as_completed(futures):
+                outcome = future.result()
+                outcomes.append(outcome)
+                live.update(render_progress(outcomes, len(clusters), title))
+        except KeyboardInterrupt:
+            # Let running actions finish but do not start the queued ones
+            active_pool.shutdown(cancel=True)
+            if journal:
+                console.print(
+                    f"[yellow]Execution interrupted. Progress saved to {journal.path}, rerun with --resume to continue.[/]"
+                )
+            raise
+        if pool is None:
+            active_pool.shutdown()
+
+    summary = {status: 0 for status in STATUS_STYLES}
+    for outcome in outcomes:
+        summary[outcome["status"]] += 1
+    console.print(
+        f"[bold]{title}:[/] [green]{summary['applied']} applied[/], "
+        f"[red]{summary['failed']} failed[/], [yellow]{summary['skipped']} skipped[/]"
+    )
+    return outcomes
+
+
+def fetch_cluster_details(url, cluster):
+    """Fetch the current cluster document before modifying it."""
+    response = make_request(url, method="GET")
+    if response is None:
+        raise AtlasAPIError(
+            url,
+            message=f"Failed to fetch cluster details for {cluster.get('cluster_name')} in project {cluster.get('project_id')}",
+        )
+    return response.json()
+
+
+def send_cluster_change(url, cluster, method, payload=None):
+    """Send a cluster modification, raising AtlasAPIError when nothing was sent."""
+    response = make_request(url, method=method, data=payload, response_format="json")
+    if response is None:
+        raise AtlasAPIError(
+            url,
+            message=f"Failed to send {method} for {cluster.get('cluster_name')} in project {cluster.get('project_id')}",
+        )
+    return response
 
 
 # Function to enable auto-scaling computation for clusters
-def enable_autoscaling_computation(plan_data):
+def enable_autoscaling_computation(
+    plan_data, concurrency=None, journal=None, pool=None
+):
     # Load configuration for autoscaling settings
     config = load_config()
     autoscaling_defaults = config.get("autoscaling_defaults", {})
@@ -75,28 +411,9 @@ def enable_autoscaling_computation(plan_data):
     min_instance_size = autoscaling_defaults.get("min_instance_size", "M10")
     priority = autoscaling_defaults.get("priority", 7)
 
-    clusters = plan_data.get("clusters", [])
-    for cluster in clusters:
-        org_id = cluster.get("org_id")
-        project_id = cluster.get("project_id")
-        cluster_name = cluster.get("cluster_name")
-
-        if not org_id or not project_id or not cluster_name:
-            console.print("[red]Missing necessary information to execute plan[/]")
-            continue
-
+    def action(cluster, url, project_lock):
         # Fetch current cluster details
-        url = BASE_URL.format(groupId=project_id, clusterName=cluster_name)
-
-        response = make_request(url, method="GET")
-
-        if response is None:
-            console.print(
-                f"[red]Failed to fetch cluster details for {cluster_name} in project {project_id}. Skipping...[/]"
-            )
-            continue
-
-        cluster_details = response.json()
+        cluster_details = fetch_cluster_details(url, cluster)
         current_region_name = cluster_details["replicationSpecs"][0]["regionConfigs"][
             0
         ]["regionName"]
@@ -132,14 +449,22 @@ def enable_autoscaling_computation(plan_data):
             ]
         }
 
-        console.print(
-            f"[blue]Enabling auto-scaling computation for cluster {cluster_name} in project {project_id}[/]"
-        )
-        make_request(url, method="PATCH", data=payload, response_format="json")
+        with project_lock:
+            send_cluster_change(url, cluster, "PATCH", payload)
+        return f"Compute auto-scaling enabled in {region_name}"
+
+    return run_cluster_actions(
+        plan_data,
+        action,
+        "Enabling auto-scaling computation",
+        concurrency,
+        journal,
+        pool,
+    )
 
 
 # Function to enable auto-scaling disk for clusters
-def enable_autoscaling_disk(plan_data):
+def enable_autoscaling_disk(plan_data, concurrency=None, journal=None, pool=None):
     # Load configuration for autoscaling settings
     config = load_config()
     autoscaling_defaults = config.get("autoscaling_defaults", {})
@@ -149,28 +474,9 @@ def enable_autoscaling_disk(plan_data):
     max_instance_size = autoscaling_defaults.get("max_instance_size", "M40")
     min_instance_size = autoscaling_defaults.get("min_instance_size", "M10")
 
-    clusters = plan_data.get("clusters", [])
-    for cluster in clusters:
-        org_id = cluster.get("org_id")
-        project_id = cluster.get("project_id")
-        cluster_name = cluster.get("cluster_name")
-
-        if not org_id or not project_id or not cluster_name:
-            console.print("[red]Missing necessary information to execute plan[/]")
-            continue
-
+    def action(cluster, url, project_lock):
         # Fetch current cluster details
-        url = BASE_URL.format(groupId=project_id, clusterName=cluster_name)
-
-        response = make_request(url, method="GET")
-
-        if response is None:
-            console.print(
-                f"[red]Failed to fetch cluster details for {cluster_name} in project {project_id}. Skipping...[/]"
-            )
-            continue
-
-        cluster_details = response.json()
+        cluster_details = fetch_cluster_details(url, cluster)
         current_region_name = cluster_details["replicationSpecs"][0]["regionConfigs"][
             0
         ]["regionName"]
@@ -209,26 +515,17 @@ def enable_autoscaling_disk(plan_data):
             ],
         }
 
-        console.print(
-            f"[blue]Enabling auto-scaling disk for cluster {cluster_name} in project {project_id}[/]"
-        )
-        make_request(url, method="PATCH", data=payload, response_format="json")
-
+        with project_lock:
+            send_cluster_change(url, cluster, "PATCH", payload)
+        return f"Disk auto-scaling enabled in {region_name}"
 
-def scale_to_free_tier(plan_data):
-    # Load configuration for autoscaling settings
-    clusters = plan_data.get("clusters", [])
-    for cluster in clusters:
-        org_id = cluster.get("org_id")
-        project_id = cluster.get("project_id")
-        cluster_name = cluster.get("cluster_name")
-
-        if not org_id or not project_id or not cluster_name:
-            console.print("[red]Missing necessary information to execute plan[/]")
-            continue
+    return run_cluster_actions(
+        plan_data, action, "Enabling auto-scaling disk", concurrency, journal, pool
+    )
 
-        url = BASE_URL.format(groupId=project_id, clusterName=cluster_name)
 
+def scale_to_free_tier(plan_data, concurrency=None, journal=None, pool=None):
+    def action(cluster, url, project_lock):
         # Payload to scale to free tier and disable autoscaling
         payload = {
             "replicaSetScalingStrategy": "SEQUENTIAL",
@@ -260,27 +557,22 @@ def scale_to_free_tier(plan_data):
             "redactClientLogData": True,
         }
 
-        console.print(
-            f"[blue]Scaling cluster {cluster_name} to free tier in project {project_id}[/]"
-        )
-        make_request(url, data=payload, method="PATCH", response_format="json")
-
-
-# Function to delete clusters
-def delete_clusters(plan_data):
-    clusters = plan_data.get("clusters", [])
-    for cluster in clusters:
-        org_id = cluster.get("org_id")
-        project_id = cluster.get("project_id")
-        cluster_name = cluster.get("cluster_name")
+        with project_lock:
+            send_cluster_change(url, cluster, "PATCH", payload)
+        return "Scaled to free tier"
 
-        if not org_id or not project_id or not cluster_name:
-            console.print("[red]Missing necessary information to execute plan[/]")
-            continue
+    return run_cluster_actions(
+        plan_data, action, "Scaling clusters to free tier", concurrency, journal, pool
+    )
 
-        url = BASE_URL.format(groupId=project_id, clusterName=cluster_name)
 
-        console.print(
-            f"[blue]Deleting cluster {cluster_name} in project {project_id}[/]"
-        )
-        make_request(url, method="DELETE")
+# Function to delete clusters
+def delete_clusters(plan_data, concurrency=None, journal=None, pool=None):
+    def action(cluster, url, project_lock):
+        with project_lock:
+            send_cluster_change(url, cluster, "DELETE")
+        return "Deletion requested"
+
+    return run_cluster_actions(
+        plan_data, action, "Deleting clusters", concurrency, journal, pool
+    )
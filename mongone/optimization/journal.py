@@ -0,0 +1,103 @@
+import os
+import json
+import threading
+import datetime
+from rich.console import Console
+
+console = Console()
+
+JOURNAL_SUFFIX = ".journal.jsonl"
+
+
+def journal_path(plan_filename):
+    """Return the journal file that sits next to a plan file."""
+    base, _ = os.path.splitext(plan_filename)
+    return f"{base}{JOURNAL_SUFFIX}"
+
+
+def cluster_key(cluster):
+    """Identify a plan entry by its project and cluster."""
+    return f"{cluster.get('project_id')}/{cluster.get('cluster_name')}"
+
+
+class ExecutionJournal:
+    """Append-only record of the cluster actions of a plan execution.
+
+    Every run starts with a ``start`` event followed by one ``cluster`` event
+    per finished action, flushed to disk as soon as it completes. A resumed
+    run skips the clusters already applied since the last fresh run, so an
+    interrupted plan can be restarted without resending its changes.
+    """
+
+    def __init__(self, plan_filename):
+        self.path = journal_path(plan_filename)
+        self.completed = set()
+        self.file = None
+        self.lock = threading.Lock()
+
+    def load_completed(self):
+        """Collect the clusters applied since the last non-resumed run."""
+        completed = set()
+        if not os.path.exists(self.path):
+            return completed
+        with open(self.path, "r") as journal_file:
+            for line in journal_file:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # A line cut short by an interruption
+                    continue
+                if entry.get("event") == "start" and not entry.get("resume"):
+                    completed = set()
+                elif entry.get("event") == "cluster" and entry["status"] == "applied":
+                    completed.add(entry["key"])
+        return completed
+
+    def start(self, action, resume=False):
+        """Open the journal for a new run, loading progress when resuming."""
+        self.completed = self.load_completed() if resume else set()
+        self.file = open(self.path, "a")
+        self.write(
+            {
+                "event": "start",
+                "action": action,
+                "resume": resume,
+                "skipped": len(self.completed),
+            }
+        )
+        if resume:
+            console.print(
+                f"[blue]Resuming from {self.path}: {len(self.completed)} clusters already applied.[/]"
+            )
+        return self
+
+    def is_completed(self, cluster):
+        return cluster_key(cluster) in self.completed
+
+    def record(self, outcome):
+        """Append the outcome of a cluster action; safe to call from any worker."""
+        self.write(
+            {
+                "event": "cluster",
+                "key": cluster_key(outcome),
+                "project_id": outcome.get("project_id"),
+                "cluster_name": outcome.get("cluster_name"),
+                "status": outcome["status"],
+                "detail": outcome.get("detail", ""),
+            }
+        )
+        if outcome["status"] == "applied":
+            with self.lock:
+                self.completed.add(cluster_key(outcome))
+
+    def write(self, entry):
+        entry["timestamp"] = datetime.datetime.now().isoformat()
+        with self.lock:
+            self.file.write(json.dumps(entry) + "\n")
+            self.file.flush()
+            os.fsync(self.file.fileno())
+
+    def close(self):
+        if self.file:
+            self.file.close()
+            self.file = None
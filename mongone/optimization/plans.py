@@ -1,7 +1,7 @@
 import os
-import yaml
 import datetime
 from rich.console import Console
+from mongone.utils.serialization import write_document
 
 console = Console()
 
@@ -15,141 +15,103 @@ def ensure_directory(directory):
         os.makedirs(directory)
 
 
-# Generate a YAML file
-def write_yaml_file(plan_name, environment, data):
-    filename = f"{PLANS_DIR}/{environment}/{plan_name}_plan_{datetime.datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}.yaml"
+# Plan file formats, selected with `plan_format` in mongone.yaml
+PLAN_FORMATS = {"yaml": ".yaml", "jsonl": ".jsonl"}
+
+
+# Generate a plan file, as YAML or JSON Lines (one cluster per line)
+def write_plan_file(
+    plan_name, environment, data, run_id=None, plan_format="yaml", plans_dir=PLANS_DIR
+):
+    run_id = run_id or datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+    extension = PLAN_FORMATS.get(plan_format)
+    if extension is None:
+        raise ValueError(
+            f"Unknown plan format '{plan_format}'. Use one of: {', '.join(PLAN_FORMATS)}"
+        )
+    filename = f"{plans_dir}/{environment}/{plan_name}_plan_{run_id}{extension}"
     ensure_directory(os.path.dirname(filename))
-    with open(filename, "w") as yaml_file:
-        yaml.dump(data, yaml_file, default_flow_style=False)
+    write_document(filename, data, "clusters", default_flow_style=False)
     console.print(f"[green]Plan generated:[/] {filename}")
 
 
-# Generate plans to activate computation autoscaling
-def generate_autoscaling_computation_plan(config, report_data, environment):
-    clusters = [
-        {
-            "org_id": config.get("atlas_org_id"),
-            "project_id": project.get("id"),
-            "project_name": project.get("name"),
-            "cluster_name": cluster["name"],
-        }
-        for project in report_data.get("report_data", [])
-        if project.get("environment") == environment
-        for cluster in project.get("clusters", [])
-        if not cluster.get("autoscaling_compute")
-    ]
-    if clusters:
-        plan_data = {
-            "action": "autoscaling_computation",
-            "environment": environment,
-            "timestamp": datetime.datetime.now().isoformat(),
-            "clusters": clusters,
-        }
-        write_yaml_file("autoscaling_computation", environment, plan_data)
-        return True
-    return False
-
-
-# Generate plans to activate disk autoscaling
-def generate_autoscaling_disk_plan(config, report_data, environment):
-    clusters = [
-        {
-            "org_id": config.get("atlas_org_id"),
-            "project_id": project.get("id"),
-            "project_name": project.get("name"),
-            "cluster_name": cluster["name"],
-        }
-        for project in report_data.get("report_data", [])
-        if project.get("environment") == environment
-        for cluster in project.get("clusters", [])
-        if not cluster.get("autoscaling_disk")
-    ]
-    if clusters:
-        plan_data = {
-            "action": "autoscaling_disk",
-            "environment": environment,
-            "timestamp": datetime.datetime.now().isoformat(),
-            "clusters": clusters,
-        }
-        write_yaml_file("autoscaling_disk", environment, plan_data)
-        return True
-    return False
-
-
-# Generate plans to scale to free tier and remove autoscaling
-def generate_scale_to_free_tier_plan(config, report_data, environment):
-    clusters = [
-        {
-            "org_id": config.get("atlas_org_id"),
-            "project_id": project.get("id"),
-            "project_name": project.get("name"),
-            "cluster_name": cluster["name"],
-        }
-        for project in report_data.get("report_data", [])
-        if project.get("environment") == environment
-        for cluster in project.get("clusters", [])
-        if not cluster.get("inuse")
-    ]
-    if clusters:
-        plan_data = {
-            "action": "scale_to_free_tier",
-            "remove_autoscaling": True,
-            "environment": environment,
-            "timestamp": datetime.datetime.now().isoformat(),
-            "clusters": clusters,
-        }
-        write_yaml_file("scale_to_free_tier", environment, plan_data)
-        return True
-    return False
-
-
-# Generate plans to delete clusters
-def generate_delete_clusters_plan(config, report_data, environment):
-    clusters = [
-        {
-            "org_id": config.get("atlas_org_id"),
-            "project_id": project.get("id"),
-            "project_name": project.get("name"),
-            "cluster_name": cluster["name"],
-        }
-        for project in report_data.get("report_data", [])
-        if project.get("environment") == environment
-        for cluster in project.get("clusters", [])
-        if not cluster.get("inuse")
-    ]
-    if clusters:
-        plan_data = {
-            "action": "delete_clusters",
-            "environment": environment,
-            "timestamp": datetime.datetime.now().isoformat(),
-            "clusters": clusters,
-        }
-        write_yaml_file("delete_clusters", environment, plan_data)
-        return True
-    return False
+# Actions a cluster can be planned for, in plan generation order. Autoscaling
+# flags are None when they could not be fetched, and unknown state never plans a change
+PLAN_ACTIONS = [
+    (
+        "autoscaling_computation",
+        lambda cluster: cluster.get("autoscaling_compute") is False,
+    ),
+    ("autoscaling_disk", lambda cluster: cluster.get("autoscaling_disk") is False),
+    ("scale_to_free_tier", lambda cluster: not cluster.get("inuse")),
+    ("delete_clusters", lambda cluster: not cluster.get("inuse")),
+]
+
+# Extra metadata written into the plans of an action
+PLAN_METADATA = {"scale_to_free_tier": {"remove_autoscaling": True}}
+
+
+def plan_environments(config, report_data):
+    """Return the configured environments, ``unknown`` and any other found in the report."""
+    environments = list((config.get("environment_patterns") or {}).keys())
+    environments.append("unknown")
+    for project in report_data.get("report_data", []):
+        environment = project.get("environment")
+        if environment and environment not in environments:
+            environments.append(environment)
+    return environments
+
+
+def partition_clusters(config, report_data):
+    """Group plan entries by ``(environment, action)`` in a single pass over the report."""
+    org_id = config.get("atlas_org_id")
+    partitions = {}
+    for project in report_data.get("report_data", []):
+        environment = project.get("environment")
+        for cluster in project.get("clusters", []):
+            entry = {
+                # Projects of a multi-organization report carry their own org
+                "org_id": project.get("org_id") or org_id,
+                "project_id": project.get("id"),
+                "project_name": project.get("name"),
+                "cluster_name": cluster["name"],
+            }
+            for action, applies in PLAN_ACTIONS:
+                if applies(cluster):
+                    partitions.setdefault((environment, action), []).append(entry)
+    return partitions
 
 
 # Main function to coordinate plan generation
-def generate_plans(config, report_data):
-    ensure_directory(PLANS_DIR)
+def generate_plans(config, report_data, plans_dir=PLANS_DIR):
+    """Write every plan of the report, sharing one run ID across all of them."""
+    ensure_directory(plans_dir)
+    now = datetime.datetime.now()
+    run_id = now.strftime("%Y-%m-%d_%H-%M-%S")
+    partitions = partition_clusters(config, report_data)
+    plan_format = config.get("plan_format", "yaml")
 
     # Generate different plans for each environment based on report data
-    for environment in ["staging", "production", "unknown"]:
+    for environment in plan_environments(config, report_data):
         console.print(f"[blue]Generating plans for environment:[/] {environment}")
         plans_generated = False
 
-        plans_generated |= generate_autoscaling_computation_plan(
-            config, report_data, environment
-        )
-        plans_generated |= generate_autoscaling_disk_plan(
-            config, report_data, environment
-        )
-        plans_generated |= generate_scale_to_free_tier_plan(
-            config, report_data, environment
-        )
-        plans_generated |= generate_delete_clusters_plan(
-            config, report_data, environment
-        )
+        for action, _ in PLAN_ACTIONS:
+            clusters = partitions.get((environment, action))
+            if not clusters:
+                continue
+            plan_data = {
+                "action": action,
+                **PLAN_METADATA.get(action, {}),
+                "environment": environment,
+                "run_id": run_id,
+                "timestamp": now.isoformat(),
+                "clusters": clusters,
+            }
+            write_plan_file(
+                action, environment, plan_data, run_id, plan_format, plans_dir
+            )
+            plans_generated = True
 
         # Print message only if no plans were generated for the environment
         if not plans_generated:
@@ -0,0 +1,169 @@
+import time
+from rich.console import Console
+from rich.table import Table
+from mongone.data.clusters import iter_clusters, extract_cluster_autoscaling
+from mongone.utils.http import AtlasAPIError
+
+console = Console()
+
+# Polling defaults for completion tracking, in seconds
+DEFAULT_WAIT_TIMEOUT = 1800
+MIN_POLL_INTERVAL = 5
+MAX_POLL_INTERVAL = 60
+
+
+def change_applied(action, cluster):
+    """Check whether a cluster document reflects the change requested by a plan."""
+    if action == "delete_clusters":
+        return cluster is None
+    if cluster is None or cluster.get("stateName") != "IDLE":
+        return False
+    compute_scaling, disk_scaling = extract_cluster_autoscaling(cluster)
+    if action == "autoscaling_computation":
+        return bool(compute_scaling)
+    if action == "autoscaling_disk":
+        return bool(disk_scaling)
+    if action == "scale_to_free_tier":
+        return all(
+            region_config.get("electableSpecs", {}).get("instanceSize") == "M0"
+            for replication_spec in cluster.get("replicationSpecs", [])
+            for region_config in replication_spec.get("regionConfigs", [])
+        )
+    return True
+
+
+class CompletionTracker:
+    """Track submitted cluster changes until Atlas reports them as done.
+
+    A single scheduler polls the cluster list endpoint once per project with
+    pending changes, so every round costs one paginated request per project
+    instead of one request per cluster. The interval starts at
+    ``min_interval`` and doubles, up to ``max_interval``, while nothing
+    completes; it resets as soon as a change lands.
+    """
+
+    def __init__(
+        self,
+        timeout=DEFAULT_WAIT_TIMEOUT,
+        min_interval=MIN_POLL_INTERVAL,
+        max_interval=MAX_POLL_INTERVAL,
+    ):
+        self.timeout = timeout
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.pending = {}
+        self.applied = []
+        self.failed = []
+
+    def track(self, action, project_id, cluster_name, project_name=None):
+        """Start tracking a change submitted for a cluster."""
+        self.pending[(project_id, cluster_name)] = {
+            "action": action,
+            "project_id": project_id,
+            "project_name": project_name,
+            "cluster_name": cluster_name,
+            "state": "SUBMITTED",
+        }
+
+    def record_failure(self, action, project_id, cluster_name, project_name=None):
+        """Record a change that Atlas rejected when it was submitted."""
+        self.failed.append(
+            {
+                "action": action,
+                "project_id": project_id,
+                "project_name": project_name,
+                "cluster_name": cluster_name,
+                "state": "REJECTED",
+            }
+        )
+
+    def poll_project(self, project_id):
+        """Refresh the state of every pending change in a project."""
+        try:
+            clusters = {
+                cluster["name"]: cluster for cluster in iter_clusters(project_id)
+            }
+        except AtlasAPIError as e:
+            console.print(
+                f"[yellow]Unable to poll clusters of project {project_id}: {e}[/]"
+            )
+            return 0
+
+        completed = 0
+        for key, change in list(self.pending.items()):
+            if key[0] != project_id:
+                continue
+            cluster = clusters.get(change["cluster_name"])
+            change["state"] = cluster.get("stateName") if cluster else "DELETED"
+            if change_applied(change["action"], cluster):
+                self.applied.append(self.pending.pop(key))
+                completed += 1
+            elif cluster is None or cluster.get("stateName") == "IDLE":
+                # Atlas may still show the old configuration right after the
+                # request, so only give up after two idle polls in a row
+                change["idle_polls"] = change.get("idle_polls", 0) + 1
+                if cluster is None or change["idle_polls"] >= 2:
+                    change["state"] = (
+                        "MISSING" if cluster is None else "IDLE_WITHOUT_CHANGE"
+                    )
+                    self.failed.append(self.pending.pop(key))
+                    completed += 1
+            else:
+                change["idle_polls"] = 0
+        return completed
+
+    def wait(self):
+        """Poll until every change completes or the timeout expires."""
+        deadline = time.monotonic() + self.timeout
+        interval = self.min_interval
+        while self.pending:
+            projects = sorted({project_id for project_id, _ in self.pending})
+            completed = sum(self.poll_project(project_id) for project_id in projects)
+            console.print(
+                f"[blue]Tracking changes: {len(self.applied)} applied, {len(self.pending)} pending, {len(self.failed)} failed[/]"
+            )
+            if not self.pending:
+                break
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                console.print(
+                    f"[yellow]Stopped waiting after {self.timeout}s with {len(self.pending)} changes pending.[/]"
+                )
+                break
+            interval = (
+                self.min_interval if completed else min(interval * 2, self.max_interval)
+            )
+            time.sleep(min(interval, remaining))
+        return self.summary()
+
+    def summary(self):
+        """Return the applied, still-pending and failed changes."""
+        return {
+            "applied": list(self.applied),
+            "pending": list(self.pending.values()),
+            "failed": list(self.failed),
+        }
+
+
+def display_tracking_summary(summary):
+    """Print the outcome of tracked changes as a table."""
+    table = Table(title="Change Completion Summary")
+    table.add_column("Project", style="cyan")
+    table.add_column("Cluster", style="magenta")
+    table.add_column("Action")
+    table.add_column("Result")
+    table.add_column("Last State")
+    styles = {"applied": "green", "pending": "yellow", "failed": "red"}
+    for result, changes in summary.items():
+        for change in changes:
+            table.add_row(
+                change.get("project_name") or change["project_id"],
+                change["cluster_name"],
+                change["action"],
+                f"[{styles[result]}]{result}[/]",
+                change.get("state", ""),
+            )
+    console.print(table)
+    console.print(
+        f"[bold]Applied: {len(summary['applied'])}, still pending: {len(summary['pending'])}, failed: {len(summary['failed'])}[/]"
+    )
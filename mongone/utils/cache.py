@@ -0,0 +1,248 @@
+import os
+import re
+import json
+import time
+import hashlib
+import threading
+from urllib.parse import urlencode
+from rich.console import Console
+import requests
+from requests.structures import CaseInsensitiveDict
+
+console = Console()
+
+CACHE_DIR = ".mongone-cache"
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+IMMUTABLE = -1  # TTL for responses that never change, such as closed invoices
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Time-to-live in seconds per Atlas endpoint, first match wins
+ENDPOINT_TTLS = [
+    (re.compile(r"/orgs/[^/]+/invoices/[^/]+/csv$"), 3600),
+    (re.compile(r"/orgs/[^/]+/invoices$"), 3600),
+    (re.compile(r"/groups/[^/]+/dbAccessHistory/"), 300),
+    (re.compile(r"/groups/[^/]+/clusters(/[^/]+)?$"), 300),
+    (re.compile(r"/groups$"), 300),
+]
+DEFAULT_TTL = 300
+
+
+def endpoint_ttl(url):
+    """Return the cache TTL configured for an Atlas endpoint."""
+    path = url.split("?", 1)[0]
+    for pattern, ttl in ENDPOINT_TTLS:
+        if pattern.search(path):
+            return ttl
+    return DEFAULT_TTL
+
+
+class ResponseCache:
+    """Persistent LRU cache of Atlas GET responses stored on disk.
+
+    Each entry is a body file plus a small JSON metadata file. Expired entries
+    that carry an ETag are kept so they can be revalidated with If-None-Match,
+    and the least recently used entries are evicted once the cache grows past
+    ``max_bytes``.
+    """
+
+    def __init__(self, directory=CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES, refresh=False):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.refresh = refresh
+        self.lock = threading.Lock()
+        self.entries = {}
+        os.makedirs(self.directory, exist_ok=True)
+        self._load_index()
+
+    def _load_index(self):
+        for filename in os.listdir(self.directory):
+            if not filename.endswith(".json"):
+                continue
+            key = filename[: -len(".json")]
+            try:
+                with open(self._meta_path(key), "r") as meta_file:
+                    meta = json.load(meta_file)
+                accessed_at = os.path.getmtime(self._meta_path(key))
+            except (OSError, ValueError):
+                continue
+            self.entries[key] = {
+                "url": meta.get("url", ""),
+                "size": meta.get("size", 0),
+                "accessed_at": accessed_at,
+            }
+
+    def _meta_path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+
+    def _body_path(self, key):
+        return os.path.join(self.directory, f"{key}.body")
+
+    @staticmethod
+    def make_key(url, params=None, accept=None):
+        """Build a cache key from the URL, query parameters and Accept header."""
+        query = urlencode(sorted((params or {}).items()), doseq=True)
+        raw = f"{url}?{query}|{accept or ''}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def lookup(self, key, stream=False):
+        """Return (response, is_fresh, etag) for a cached entry, or None.
+
+        With ``stream``, the body is not read: the response streams it from
+        the cache file and must be closed by the caller.
+        """
+        if self.refresh or key not in self.entries:
+            return None
+        try:
+            with open(self._meta_path(key), "r") as meta_file:
+                meta = json.load(meta_file)
+            if stream:
+                body = open(self._body_path(key), "rb")
+            else:
+                with open(self._body_path(key), "rb") as body_file:
+                    body = body_file.read()
+        except (OSError, ValueError):
+            self._remove(key)
+            return None
+
+        with self.lock:
+            self.entries[key]["accessed_at"] = time.time()
+        try:
+            os.utime(self._meta_path(key))
+        except OSError:
+            pass
+
+        ttl = meta.get("ttl", DEFAULT_TTL)
+        is_fresh = ttl == IMMUTABLE or time.time() - meta["stored_at"] < ttl
+        response = self._build_response(meta, body)
+        return response, is_fresh, meta.get("headers", {}).get("ETag")
+
+    def store(self, key, response, ttl, stream=False):
+        """Persist a successful response with its TTL and return it.
+
+        A streamed response is copied to the cache file chunk by chunk, and a
+        response streaming the cached body is returned in its place.
+        """
+        headers = {
+            name: response.headers[name]
+            for name in ["Content-Type", "ETag"]
+            if name in response.headers
+        }
+        meta = {
+            "url": response.url,
+            "status_code": response.status_code,
+            "headers": headers,
+            "stored_at": time.time(),
+            "ttl": ttl,
+        }
+        body_tmp = f"{self._body_path(key)}.{threading.get_ident()}.tmp"
+        meta_tmp = f"{self._meta_path(key)}.{threading.get_ident()}.tmp"
+        with open(body_tmp, "wb") as body_file:
+            if stream:
+                for chunk in response.iter_content(STREAM_CHUNK_SIZE):
+                    body_file.write(chunk)
+                response.close()
+            else:
+                body_file.write(response.content)
+            meta["size"] = body_file.tell()
+        with open(meta_tmp, "w") as meta_file:
+            json.dump(meta, meta_file)
+        os.replace(body_tmp, self._body_path(key))
+        os.replace(meta_tmp, self._meta_path(key))
+        if stream:
+            # Opened before eviction, which may remove an oversized entry
+            response = self._build_response(meta, open(self._body_path(key), "rb"))
+
+        with self.lock:
+            self.entries[key] = {
+                "url": meta["url"],
+                "size": meta["size"],
+                "accessed_at": time.time(),
+            }
+        self._evict()
+        return response
+
+    def touch(self, key):
+        """Mark a revalidated entry as fresh again."""
+        try:
+            with open(self._meta_path(key), "r") as meta_file:
+                meta = json.load(meta_file)
+            meta["stored_at"] = time.time()
+            with open(self._meta_path(key), "w") as meta_file:
+                json.dump(meta, meta_file)
+        except (OSError, ValueError):
+            self._remove(key)
+
+    def invalidate(self, url_prefix):
+        """Drop every entry whose URL starts with the given prefix."""
+        with self.lock:
+            keys = [
+                key
+                for key, entry in self.entries.items()
+                if entry["url"].startswith(url_prefix)
+            ]
+        for key in keys:
+            self._remove(key)
+
+    def _remove(self, key):
+        with self.lock:
+            self.entries.pop(key, None)
+        for path in [self._meta_path(key), self._body_path(key)]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def _evict(self):
+        with self.lock:
+            total = sum(entry["size"] for entry in self.entries.values())
+            if total <= self.max_bytes:
+                return
+            victims = []
+            for key, entry in sorted(
+                self.entries.items(), key=lambda item: item[1]["accessed_at"]
+            ):
+                if total <= self.max_bytes:
+                    break
+                total -= entry["size"]
+                victims.append(key)
+        for key in victims:
+            self._remove(key)
+
+    @staticmethod
+    def _build_response(meta, body):
+        """Build a response from a cached body, given as bytes or an open file."""
+        response = requests.Response()
+        response.status_code = meta.get("status_code", 200)
+        response.url = meta.get("url", "")
+        response.headers = CaseInsensitiveDict(meta.get("headers", {}))
+        if isinstance(body, bytes):
+            response._content = body
+            response._content_consumed = True
+        else:
+            response.raw = body
+        response.encoding = "utf-8"
+        return response
+
+
+_cache = None
+
+
+def configure_cache(enabled=True, refresh=False, directory=CACHE_DIR, max_bytes=None):
+    """Enable or disable the shared response cache used by make_request."""
+    global _cache
+    if not enabled:
+        _cache = None
+        return None
+    _cache = ResponseCache(
+        directory=directory, max_bytes=max_bytes or DEFAULT_MAX_BYTES, refresh=refresh
+    )
+    console.print(
+        f"[DEBUG] Response cache enabled in {directory}{' (refresh)' if refresh else ''}.",
+        style="bold blue",
+    )
+    return _cache
+
+
+def get_cache():
+    """Return the shared response cache, or None when caching is disabled."""
+    return _cache
@@ -0,0 +1,124 @@
+import csv
+import json
+from mongone.utils.helpers import Console
+from mongone.utils.rendering import cluster_status, report_output_path
+
+console = Console()
+
+# Fields of every exported cluster row, in column order
+EXPORT_FIELDS = [
+    "project_id",
+    "project",
+    "environment",
+    "cluster",
+    "last_access_time",
+    "status",
+    "inuse",
+    "autoscaling_compute",
+    "autoscaling_disk",
+    "cost",
+    "predicted_cost",
+]
+
+# Organization-wide totals included in the columnar export
+SUMMARY_FIELDS = [
+    "total_clusters",
+    "clusters_without_autoscaling_compute",
+    "clusters_without_autoscaling_disk",
+    "unused_cluster_count",
+    "total_cost",
+    "total_predicted_cost",
+    "estimated_saves",
+    "estimated_saves_projected",
+]
+
+
+def known_flag(value):
+    return None if value is None else bool(value)
+
+
+def last_access_time(cluster):
+    value = cluster.get("last_access_time")
+    return None if value == "N/A" else value
+
+
+def iter_export_rows(data):
+    """Yield one flat dict per cluster of a report, with EXPORT_FIELDS keys.
+
+    Unknown values (last access, autoscaling) stay None: null in JSON and an
+    empty cell in CSV.
+    """
+    for project in data["report_data"]:
+        for cluster in project.get("clusters", []):
+            yield {
+                "project_id": project.get("id"),
+                "project": project.get("name"),
+                "environment": project.get("environment"),
+                "cluster": cluster.get("name"),
+                "last_access_time": last_access_time(cluster),
+                "status": cluster_status(cluster),
+                "inuse": bool(cluster.get("inuse")),
+                "autoscaling_compute": known_flag(cluster.get("autoscaling_compute")),
+                "autoscaling_disk": known_flag(cluster.get("autoscaling_disk")),
+                "cost": cluster.get("cost") or 0,
+                "predicted_cost": cluster.get("predicted_cost") or 0,
+            }
+
+
+def export_jsonl(data, path):
+    """Write one JSON object per cluster and line."""
+    with open(path, "w") as file:
+        for row in iter_export_rows(data):
+            file.write(json.dumps(row, default=str) + "\n")
+
+
+def export_csv(data, path):
+    """Write one CSV row per cluster, with a header row."""
+    with open(path, "w", newline="") as file:
+        writer = csv.DictWriter(file, fieldnames=EXPORT_FIELDS)
+        writer.writeheader()
+        writer.writerows(iter_export_rows(data))
+
+
+def export_columnar(data, path):
+    """Write a JSON document holding one array per field.
+
+    The layout is ``{"columns": [...], "data": {field: [...]}, "row_count": n,
+    "summary": {...}}``, which loads directly into dataframes and columnar
+    formats such as Parquet. Each array is streamed in its own pass over the
+    report, so only one value is serialized at a time.
+    """
+    with open(path, "w") as file:
+        file.write('{"columns": ' + json.dumps(EXPORT_FIELDS) + ', "data": {')
+        row_count = 0
+        for index, field in enumerate(EXPORT_FIELDS):
+            file.write(("" if index == 0 else ", ") + json.dumps(field) + ": [")
+            row_count = 0
+            for row in iter_export_rows(data):
+                file.write(
+                    ("," if row_count else "") + json.dumps(row[field], default=str)
+                )
+                row_count += 1
+            file.write("]")
+        summary = {field: data.get(field) for field in SUMMARY_FIELDS}
+        file.write(f'}}, "row_count": {row_count}, "summary": ')
+        file.write(json.dumps(summary, default=str) + "}\n")
+
+
+EXPORT_FORMATS = {
+    "jsonl": (export_jsonl, ".jsonl"),
+    "csv": (export_csv, ".csv"),
+    "columnar": (export_columnar, ".columns.json"),
+}
+
+
+def export_report(data, formats, output_dir="reports"):
+    """Export a report dict in the given formats next to the HTML reports."""
+    paths = []
+    for export_format in formats:
+        export, suffix = EXPORT_FORMATS[export_format]
+        path = report_output_path(output_dir, suffix=suffix)
+        export(data, path)
+        console.print(f"Report exported: {path}", style="bold green")
+        paths.append(path)
+    return paths
@@ -1,23 +1,355 @@
 import os
+import re
+import time
+import asyncio
+import functools
+import random
+import threading
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
 from rich.console import Console
 import requests
+from requests.adapters import HTTPAdapter
 from requests.auth import HTTPDigestAuth
+from urllib3.exceptions import NewConnectionError
+from mongone.utils.cache import ResponseCache, get_cache, endpoint_ttl
 
 console = Console()
 
+DEFAULT_ATLAS_API_URL = "https://cloud.mongodb.com/api/atlas/v2"
+SUPPORTED_METHODS = ["GET", "POST", "PATCH", "PUT", "DELETE"]
+SUCCESS_STATUS_CODES = [200, 201, 202]
+RETRY_STATUS_CODES = [429, 500, 502, 503, 504]
+# Methods that can be sent again after a 5xx or a dropped connection. A write
+# may already have been applied, so it is only retried on 429 or when it was
+# never sent
+IDEMPOTENT_METHODS = ["GET"]
 
-def make_request(url, params=None, data=None, method="GET", response_format="json"):
-    """Make an authenticated request to the MongoDB Atlas API."""
+# Retry and rate limiting defaults for the Atlas Administration API
+MAX_RETRIES = 5
+BACKOFF_BASE_SECONDS = 1.0
+BACKOFF_MAX_SECONDS = 60.0
+DEFAULT_RATE_LIMIT = None  # requests per second shared by all workers, or unlimited
+DEFAULT_BURST = 10
+# Seconds to establish a connection and between two bytes of the response
+REQUEST_TIMEOUT = (10, 120)
+
+
+def atlas_api_url(path):
+    """Build an Atlas Administration API URL.
+
+    The base URL can be pointed at another server, such as the bundled mock
+    Atlas API, through the MONGONE_ATLAS_API_URL environment variable.
+    """
+    base_url = os.getenv("MONGONE_ATLAS_API_URL", DEFAULT_ATLAS_API_URL)
+    return f"{base_url.rstrip('/')}{path}"
+
+
+class AtlasAPIError(Exception):
+    """Raised when the Atlas API returns an unsuccessful response."""
+
+    def __init__(self, url, status_code=None, message=""):
+        self.url = url
+        self.status_code = status_code
+        self.message = message
+        super().__init__(
+            f"Atlas request to {url} failed with status {status_code}: {message}"
+        )
+
+
+class AtlasRateLimitError(AtlasAPIError):
+    """Raised when Atlas keeps answering 429 after all retries."""
+
+
+class AtlasServerError(AtlasAPIError):
+    """Raised when Atlas keeps answering 5xx after all retries."""
+
+
+class AtlasConnectionError(AtlasAPIError):
+    """Raised when Atlas cannot be reached after all retries."""
+
+
+class RateLimiter:
+    """Thread-safe token bucket shared by every Atlas request.
+
+    Without a ``rate``, requests are not throttled and only wait while the
+    bucket is paused after a 429.
+    """
+
+    def __init__(self, rate=DEFAULT_RATE_LIMIT, burst=DEFAULT_BURST):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated_at = time.monotonic()
+        self.blocked_until = 0.0
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available."""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                if self.rate is None:
+                    if now >= self.blocked_until:
+                        return
+                    wait = self.blocked_until - now
+                else:
+                    self.tokens = min(
+                        self.burst, self.tokens + (now - self.updated_at) * self.rate
+                    )
+                    self.updated_at = now
+                    if now >= self.blocked_until and self.tokens >= 1:
+                        self.tokens -= 1
+                        return
+                    wait = max(self.blocked_until - now, (1 - self.tokens) / self.rate)
+            time.sleep(wait)
+
+    def pause(self, seconds):
+        """Stop handing out tokens for the given number of seconds."""
+        with self.lock:
+            self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+            self.tokens = 0.0
+
+
+def parse_retry_after(value):
+    """Parse a Retry-After header given in seconds or as an HTTP date."""
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+def backoff_delay(attempt, retry_after=None):
+    """Exponential backoff with full jitter, honoring Retry-After when present."""
+    if retry_after is not None:
+        return min(retry_after, BACKOFF_MAX_SECONDS)
+    return random.uniform(
+        0, min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * (2**attempt))
+    )
+
+
+def is_unsent_request_error(error):
+    """Return whether a connection error was raised before the request was sent."""
+    if isinstance(error, requests.ConnectTimeout):
+        return True
+    reason = error.args[0] if error.args else None
+    return isinstance(getattr(reason, "reason", reason), NewConnectionError)
+
+
+def is_retryable(method, status_code=None, error=None):
+    """Return whether a failed request can be sent again without applying it twice."""
+    if method in IDEMPOTENT_METHODS:
+        return True
+    if error is not None:
+        return is_unsent_request_error(error)
+    return status_code == 429
+
+
+# Organization and project IDs of an Atlas API path, used to pick its credentials
+SCOPE_PATTERN = re.compile(r"/(orgs|groups)/([^/?]+)")
+
+_org_credentials = {}
+_project_orgs = {}
+_credentials_lock = threading.Lock()
+
+
+def register_org_credentials(org_id, public_key, private_key):
+    """Use an API key pair for every request made on behalf of an organization."""
+    with _credentials_lock:
+        _org_credentials[org_id] = (public_key, private_key)
+
+
+def register_project_org(project_id, org_id):
+    """Record the organization of a project, so its requests use the org credentials."""
+    with _credentials_lock:
+        _project_orgs[project_id] = org_id
+
+
+def credentials_for(url):
+    """Return the key pair registered for the organization a URL belongs to, or None."""
+    match = SCOPE_PATTERN.search(url)
+    if not match:
+        return None
+    scope, scope_id = match.groups()
+    with _credentials_lock:
+        org_id = scope_id if scope == "orgs" else _project_orgs.get(scope_id)
+        return _org_credentials.get(org_id)
+
+
+class AtlasClient:
+    """Shared, pooled HTTP client for the MongoDB Atlas API.
+
+    A single ``requests.Session`` keeps TCP/TLS connections alive and a single
+    ``HTTPDigestAuth`` instance per API key keeps the digest nonce per thread,
+    so every worker pays one handshake and one digest challenge instead of one
+    per call. Requests for an organization, or one of its projects, with
+    registered credentials use that organization's key instead of the default.
+    """
+
+    def __init__(
+        self, public_key, private_key, pool_size=None, rate_limit=None, burst=None
+    ):
+        self.pool_size = pool_size or multiprocessing.cpu_count()
+        self.rate_limiter = RateLimiter(
+            rate=rate_limit or DEFAULT_RATE_LIMIT, burst=burst or DEFAULT_BURST
+        )
+        self.auth = (
+            HTTPDigestAuth(public_key, private_key)
+            if public_key and private_key
+            else None
+        )
+        self.org_auths = {}
+        self.org_auths_lock = threading.Lock()
+        self.session = requests.Session()
+        self.session.auth = self.auth
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_size, pool_maxsize=self.pool_size
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def auth_for(self, url):
+        """Return the digest auth of the organization a URL belongs to."""
+        credentials = credentials_for(url)
+        if not credentials:
+            return self.auth
+        with self.org_auths_lock:
+            if credentials not in self.org_auths:
+                self.org_auths[credentials] = HTTPDigestAuth(*credentials)
+            return self.org_auths[credentials]
+
+    def request(self, method, url, headers=None, params=None, data=None, stream=False):
+        """Send a rate-limited request, retrying on 429, 5xx and network errors.
+
+        Writes are only retried on 429 or when the connection failed before the
+        request was sent, since Atlas may already have applied them.
+        """
+        auth = self.auth_for(url)
+        for attempt in range(MAX_RETRIES + 1):
+            self.rate_limiter.acquire()
+            try:
+                response = self.session.request(
+                    method,
+                    url,
+                    headers=headers,
+                    params=params,
+                    json=data if method in ["POST", "PATCH", "PUT"] else None,
+                    stream=stream,
+                    auth=auth,
+                    timeout=REQUEST_TIMEOUT,
+                )
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if attempt == MAX_RETRIES or not is_retryable(method, error=e):
+                    raise AtlasConnectionError(url, message=str(e)) from e
+                delay = backoff_delay(attempt)
+                console.print(
+                    f"[WARNING] Connection error for {url}: {e}. Retrying in {delay:.1f}s...",
+                    style="bold yellow",
+                )
+                time.sleep(delay)
+                continue
+
+            if (
+                response.status_code not in RETRY_STATUS_CODES
+                or attempt == MAX_RETRIES
+                or not is_retryable(method, response.status_code)
+            ):
+                return response
+
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            delay = backoff_delay(attempt, retry_after)
+            if response.status_code == 429:
+                # Every worker shares the limit, so hold the whole bucket back
+                self.rate_limiter.pause(delay)
+            console.print(
+                f"[WARNING] Status {response.status_code} from {url}. Retrying in {delay:.1f}s ({attempt + 1}/{MAX_RETRIES})...",
+                style="bold yellow",
+            )
+            # Release the connection of a streamed response before retrying
+            response.close()
+            time.sleep(delay)
+        return response
+
+    def close(self):
+        """Close all pooled connections."""
+        self.session.close()
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client(pool_size=None, rate_limit=None):
+    """Return the shared Atlas client, creating it on first use."""
+    global _client
     public_key = os.getenv("ATLAS_PUBLIC_KEY")
     private_key = os.getenv("ATLAS_PRIVATE_KEY")
 
-    if not public_key or not private_key:
+    if (not public_key or not private_key) and not _org_credentials:
         console.print(
             "Atlas public or private key not found. Please set the ATLAS_PUBLIC_KEY and ATLAS_PRIVATE_KEY environment variables.",
             style="bold red",
         )
         return None
 
+    with _client_lock:
+        if _client is None or (pool_size and _client.pool_size < pool_size):
+            if _client is not None:
+                _client.close()
+            _client = AtlasClient(
+                public_key, private_key, pool_size=pool_size, rate_limit=rate_limit
+            )
+        elif rate_limit:
+            _client.rate_limiter.rate = rate_limit
+        return _client
+
+
+def configure_client(pool_size, rate_limit=None):
+    """Size the shared connection pool to the number of concurrent workers."""
+    return get_client(pool_size=pool_size, rate_limit=rate_limit)
+
+
+def close_client():
+    """Close the shared Atlas client and release its connections."""
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+            _client = None
+
+
+def make_request(
+    url,
+    params=None,
+    data=None,
+    method="GET",
+    response_format="json",
+    cache_ttl=None,
+    stream=False,
+):
+    """Make an authenticated request to the MongoDB Atlas API.
+
+    GET responses are served from the response cache when it is enabled, using
+    ``cache_ttl`` or the endpoint's default TTL. Raises AtlasAPIError (or one of
+    its subclasses) when the request still fails after retries. With
+    ``stream``, the body is not loaded into memory: read it with
+    ``iter_content`` or ``iter_lines`` and close the response.
+    """
+    client = get_client()
+    if client is None:
+        return None
+
     headers = {
         "Content-Type": "application/json",
         "Accept": (
@@ -31,58 +363,82 @@ def make_request(url, params=None, data=None, method="GET", response_format="jso
     method = method.upper()
     console.print(f"[DEBUG] Sending {method} request to URL: {url}", style="bold blue")
 
-    if method == "GET":
-        response = requests.get(
-            url,
-            auth=HTTPDigestAuth(public_key, private_key),
-            headers=headers,
-            params=params,
-        )
-    elif method == "POST":
-        response = requests.post(
-            url,
-            auth=HTTPDigestAuth(public_key, private_key),
-            headers=headers,
-            params=params,
-            json=data,
-        )
-    elif method == "PATCH":
-        response = requests.patch(
-            url,
-            auth=HTTPDigestAuth(public_key, private_key),
-            headers=headers,
-            params=params,
-            json=data,
-        )
-    elif method == "PUT":
-        response = requests.put(
-            url,
-            auth=HTTPDigestAuth(public_key, private_key),
-            headers=headers,
-            params=params,
-            json=data,
-        )
-    elif method == "DELETE":
-        response = requests.delete(
-            url,
-            auth=HTTPDigestAuth(public_key, private_key),
-            headers=headers,
-            params=params,
-        )
-    else:
+    if method not in SUPPORTED_METHODS:
         console.print(f"[red]HTTP method '{method}' is not supported.[/]")
         return None
 
+    cache = get_cache() if method == "GET" else None
+    cache_key = None
+    cached = None
+    if cache is not None:
+        cache_key = ResponseCache.make_key(url, params, headers["Accept"])
+        cached = cache.lookup(cache_key, stream=stream)
+        if cached and cached[1]:
+            console.print(f"[DEBUG] Cache hit for URL: {url}", style="bold blue")
+            return cached[0]
+        if cached and cached[2]:
+            # Stale entry with an ETag, ask Atlas whether it changed
+            headers["If-None-Match"] = cached[2]
+
+    response = client.request(
+        method, url, headers=headers, params=params, data=data, stream=stream
+    )
+
+    if cached and response.status_code == 304:
+        console.print(f"[DEBUG] Cache revalidated for URL: {url}", style="bold blue")
+        cache.touch(cache_key)
+        return cached[0]
+    if cached:
+        cached[0].close()
+
     # Check for successful request
-    if response.status_code not in [200, 201, 202]:
+    if response.status_code not in SUCCESS_STATUS_CODES:
         console.print(f"[ERROR] Failed to fetch data from URL: {url}", style="bold red")
         console.print(
             f"[ERROR] Status Code: {response.status_code}, Response: {response.text}",
             style="bold red",
         )
-        exit(1)
+        if response.status_code == 429:
+            raise AtlasRateLimitError(url, response.status_code, response.text)
+        if response.status_code >= 500:
+            raise AtlasServerError(url, response.status_code, response.text)
+        raise AtlasAPIError(url, response.status_code, response.text)
+
+    if cache is not None:
+        response = cache.store(
+            cache_key, response, cache_ttl or endpoint_ttl(url), stream=stream
+        )
+    elif method != "GET" and get_cache() is not None:
+        # Drop cached views of the resource and its collection after a change
+        get_cache().invalidate(url.rsplit("/", 1)[0])
 
     console.print(
         f"[INFO] Successfully fetched data from URL: {url}", style="bold green"
     )
     return response
+
+
+class AsyncAtlasClient:
+    """Asyncio front-end for the shared Atlas client.
+
+    Blocking Atlas calls run on a dedicated thread pool while a semaphore bounds
+    how many of them are in flight, so callers can schedule one task per fetch
+    and still respect the global concurrency limit.
+    """
+
+    def __init__(self, concurrency):
+        self.concurrency = concurrency
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.executor = ThreadPoolExecutor(max_workers=concurrency)
+
+    async def run(self, func, *args, **kwargs):
+        """Run a blocking Atlas-backed function under the concurrency limit."""
+        async with self.semaphore:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self.executor, functools.partial(func, *args, **kwargs)
+            )
+
+    def close(self):
+        """Wait for in-flight calls and release the worker threads."""
+        self.executor.shutdown(wait=True)
@@ -1,50 +1,243 @@
 import os
+import re
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from jinja2 import Environment, FileSystemLoader
+from jinja2 import Environment, FileSystemLoader, FileSystemBytecodeCache
+from jinja2.utils import htmlsafe_json_dumps
 from rich.table import Table
 from mongone.utils.helpers import Console
 
 console = Console()
 
+TEMPLATE_DIR = os.path.join(os.path.dirname(__file__), "..", "templates")
 
-def render_html_report(data):
-    """Render the HTML report using Jinja2 template."""
-    template_dir = os.path.join(os.path.dirname(__file__), "..", "templates")
-    env = Environment(loader=FileSystemLoader(template_dir))
-    template = env.get_template("report.html")
-    output_from_parsed_template = template.render(
-        projects=data["report_data"],
-        total_clusters=data["total_clusters"],
-        percentage_no_autoscaling_compute=(
-            data["clusters_without_autoscaling_compute"] / data["total_clusters"]
-        )
-        * 100,
-        percentage_no_autoscaling_disk=(
-            data["clusters_without_autoscaling_disk"] / data["total_clusters"]
-        )
-        * 100,
-        percentage_unused_clusters=(
-            data["unused_cluster_count"] / data["total_clusters"]
+# Number of template chunks joined before each write to the report file
+RENDER_BUFFER_SIZE = 64
+
+# Columns of the cluster rows embedded as JSON in report.html
+REPORT_COLUMNS = [
+    "project",
+    "environment",
+    "cluster",
+    "last_access_time",
+    "status",
+    "autoscaling_compute",
+    "autoscaling_disk",
+    "cost",
+    "predicted_cost",
+]
+
+_environment = None
+_environment_lock = threading.Lock()
+
+
+def get_template_environment():
+    """Return the shared Jinja2 environment, creating it on first use.
+
+    Templates are compiled once per process and their bytecode is cached on
+    disk (in the system temporary directory), so later runs skip compilation.
+    """
+    global _environment
+    with _environment_lock:
+        if _environment is None:
+            _environment = Environment(
+                loader=FileSystemLoader(TEMPLATE_DIR),
+                bytecode_cache=FileSystemBytecodeCache(pattern="mongone-%s.cache"),
+                auto_reload=False,
+            )
+        return _environment
+
+
+def autoscaling_flag(value):
+    """Return 1 or 0 for a known autoscaling setting, or None when it is unknown."""
+    return None if value is None else int(bool(value))
+
+
+def autoscaling_label(value):
+    """Return the label shown for an autoscaling setting."""
+    if value is None:
+        return "Unknown"
+    return "Enabled" if value else "Disabled"
+
+
+def cluster_status(cluster):
+    """Return the usage status shown in the report for a cluster."""
+    if cluster.get("last_access_time") in (None, "N/A"):
+        return "Unknown"
+    return "In Use" if cluster.get("inuse") else "Unused"
+
+
+def iter_report_rows(projects):
+    """Yield one row per cluster, with values in REPORT_COLUMNS order."""
+    for project in projects:
+        for cluster in project.get("clusters", []):
+            yield [
+                project.get("name"),
+                project.get("environment"),
+                cluster.get("name"),
+                cluster.get("last_access_time"),
+                cluster_status(cluster),
+                autoscaling_flag(cluster.get("autoscaling_compute")),
+                autoscaling_flag(cluster.get("autoscaling_disk")),
+                round(cluster.get("cost") or 0, 2),
+                round(cluster.get("predicted_cost") or 0, 2),
+            ]
+
+
+def iter_report_rows_json(projects):
+    """Yield the cluster rows as comma separated, HTML-safe JSON arrays.
+
+    The rows are serialized one at a time so they can be streamed into the
+    template without building the whole JSON document in memory.
+    """
+    for index, row in enumerate(iter_report_rows(projects)):
+        yield ("," if index else "") + htmlsafe_json_dumps(
+            row, default=str, separators=(",", ":")
         )
-        * 100,
-        total_cost=data["total_cost"],
-        total_predicted_cost=data["total_predicted_cost"],
-        estimated_saves=data["estimated_saves"],
-        estimated_saves_projected=data["estimated_saves_projected"],
-    )
 
-    # Save the report in the 'reports' directory
-    output_dir = "reports"
+
+def render_template_to_file(template_name, output_file_path, **context):
+    """Stream a template to a file without building the whole page in memory."""
+    template = get_template_environment().get_template(template_name)
+    stream = template.stream(**context)
+    stream.enable_buffering(RENDER_BUFFER_SIZE)
+    with open(output_file_path, "w") as f:
+        stream.dump(f)
+
+
+def percentage(count, total):
+    return count / total * 100 if total else 0
+
+
+def report_context(data):
+    """Return the template variables of a report page for a report dict."""
+    return {
+        "columns_json": htmlsafe_json_dumps(REPORT_COLUMNS),
+        "rows_json": iter_report_rows_json(data["report_data"]),
+        "total_clusters": data["total_clusters"],
+        "percentage_no_autoscaling_compute": percentage(
+            data["clusters_without_autoscaling_compute"], data["total_clusters"]
+        ),
+        "percentage_no_autoscaling_disk": percentage(
+            data["clusters_without_autoscaling_disk"], data["total_clusters"]
+        ),
+        "percentage_unused_clusters": percentage(
+            data["unused_cluster_count"], data["total_clusters"]
+        ),
+        "total_cost": data["total_cost"],
+        "total_predicted_cost": data["total_predicted_cost"],
+        "estimated_saves": data["estimated_saves"],
+        "estimated_saves_projected": data["estimated_saves_projected"],
+    }
+
+
+def report_output_path(output_dir="reports", suffix=".html"):
+    """Return a timestamped report path, creating the 'reports' directory."""
     if not os.path.exists(output_dir):
         os.makedirs(output_dir)
-
-    output_file_path = os.path.join(
-        output_dir, f"report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.html"
+    return os.path.join(
+        output_dir, f"report_{datetime.now().strftime('%Y%m%d_%H%M%S')}{suffix}"
     )
-    with open(output_file_path, "w") as f:
-        f.write(output_from_parsed_template)
+
+
+def render_html_report(data, output_dir="reports"):
+    """Render the HTML report using Jinja2 template."""
+    # Save the report in the 'reports' directory
+    output_file_path = report_output_path(output_dir)
+    render_template_to_file("report.html", output_file_path, **report_context(data))
 
     console.print(f"Report generated: {output_file_path}", style="bold green")
+    return output_file_path
+
+
+def shard_report(data, split_by):
+    """Split the projects of a report by project or environment, with their totals."""
+    from mongone.core.report_generator import summarize_report
+
+    groups = {}
+    for project in data["report_data"]:
+        key = (
+            project.get("name") if split_by == "project" else project.get("environment")
+        )
+        groups.setdefault(key or "unknown", []).append(project)
+
+    shards = []
+    filenames = set()
+    for name, projects in groups.items():
+        slug = re.sub(r"[^A-Za-z0-9_.-]+", "-", str(name)).strip("-.") or "page"
+        filename = f"{split_by}-{slug}.html"
+        suffix = 2
+        while filename in filenames:
+            filename = f"{split_by}-{slug}-{suffix}.html"
+            suffix += 1
+        filenames.add(filename)
+        unused = [
+            cluster["name"]
+            for project in projects
+            for cluster in project["clusters"]
+            if not cluster["inuse"]
+        ]
+        shard = summarize_report(projects, unused)
+        shard.update(name=name, filename=filename)
+        shards.append(shard)
+    return shards
+
+
+def render_report_page(output_file_path, shard, title, index_url):
+    """Render one page of a sharded report; runs in a worker process."""
+    render_template_to_file(
+        "report.html",
+        output_file_path,
+        title=title,
+        index_url=index_url,
+        **report_context(shard),
+    )
+    return output_file_path
+
+
+def render_sharded_report(data, split_by="project", workers=None, output_dir="reports"):
+    """Render an index page plus one report page per project or environment.
+
+    Pages are rendered in parallel by a process pool, one worker per CPU core
+    by default. Returns the path of the index page.
+    """
+    output_dir = report_output_path(output_dir, suffix="")
+    os.makedirs(output_dir, exist_ok=True)
+    shards = shard_report(data, split_by)
+
+    workers = workers or multiprocessing.cpu_count()
+    with ProcessPoolExecutor(max_workers=max(1, min(workers, len(shards)))) as pool:
+        futures = [
+            pool.submit(
+                render_report_page,
+                os.path.join(output_dir, shard["filename"]),
+                shard,
+                f"{split_by.capitalize()}: {shard['name']}",
+                "index.html",
+            )
+            for shard in shards
+        ]
+        for future in futures:
+            future.result()
+
+    index_file_path = os.path.join(output_dir, "index.html")
+    context = report_context(data)
+    context.pop("rows_json")
+    render_template_to_file(
+        "report_index.html",
+        index_file_path,
+        split_by=split_by,
+        pages=sorted(shards, key=lambda shard: str(shard["name"])),
+        **context,
+    )
+
+    console.print(
+        f"Report generated: {index_file_path} ({len(shards)} {split_by} pages)",
+        style="bold green",
+    )
+    return index_file_path
 
 
 def display_summary(data):
@@ -64,20 +257,59 @@ def display_summary(data):
 
     for project in report_data:
         for cluster in project["clusters"]:
-            status = "In Use" if cluster["inuse"] else "Unused"
-            autoscaling_compute = (
-                "Enabled" if cluster["autoscaling_compute"] else "Disabled"
-            )
-            autoscaling_disk = "Enabled" if cluster["autoscaling_disk"] else "Disabled"
             table.add_row(
                 project["name"],
                 project["environment"],
                 cluster["name"],
-                cluster["last_access_time"],
-                status,
-                autoscaling_compute,
-                autoscaling_disk,
+                cluster["last_access_time"] or "N/A",
+                cluster_status(cluster),
+                autoscaling_label(cluster["autoscaling_compute"]),
+                autoscaling_label(cluster["autoscaling_disk"]),
                 f"${cluster['cost']:.2f}",
             )
 
     console.print(table)
+
+
+def display_cluster_history(project, cluster_name, rows):
+    """Display the stored usage and cost of a cluster across runs."""
+    table = Table(title=f"History of {cluster_name} in {project}")
+    table.add_column("Run", style="bold cyan")
+    table.add_column("Environment", style="bold green")
+    table.add_column("Last Access Time", style="bold green")
+    table.add_column("Status", style="bold yellow")
+    table.add_column("Autoscaling Compute", style="bold blue")
+    table.add_column("Autoscaling Disk", style="bold blue")
+    table.add_column("Cost", style="bold red")
+    for row in rows:
+        table.add_row(
+            row["created_at"],
+            row["environment"],
+            row["last_access_time"] or "",
+            "In Use" if row["inuse"] else "Unused",
+            autoscaling_label(row["autoscaling_compute"]),
+            autoscaling_label(row["autoscaling_disk"]),
+            f"${row['cost'] or 0:.2f}",
+        )
+    console.print(table)
+
+
+def display_organizations_summary(reports):
+    """Display the totals of each organization of a multi-organization report."""
+    table = Table(title="MongoDB Atlas Organizations")
+    table.add_column("Organization", style="bold cyan")
+    table.add_column("Projects", justify="right")
+    table.add_column("Clusters", justify="right")
+    table.add_column("Unused", justify="right", style="bold yellow")
+    table.add_column("Cost", justify="right", style="bold red")
+    table.add_column("Predicted Cost", justify="right", style="bold red")
+    for label, data in reports.items():
+        table.add_row(
+            label,
+            str(len(data["report_data"])),
+            str(data["total_clusters"]),
+            str(data["unused_cluster_count"]),
+            f"${data['total_cost']:.2f}",
+            f"${data['total_predicted_cost']:.2f}",
+        )
+    console.print(table)
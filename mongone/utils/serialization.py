@@ -0,0 +1,63 @@
+import json
+import yaml
+
+# The libyaml bindings are an order of magnitude faster than the pure-Python
+# loader and dumper; fall back to the latter when PyYAML was built without them
+SafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+SafeDumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+JSONL_EXTENSION = ".jsonl"
+
+
+def load_yaml(stream):
+    """Parse a YAML document with the fastest available safe loader."""
+    return yaml.load(stream, Loader=SafeLoader)
+
+
+def dump_yaml(data, stream=None, **options):
+    """Serialize data to YAML with the fastest available safe dumper."""
+    return yaml.dump(data, stream, Dumper=SafeDumper, **options)
+
+
+def iter_jsonl(stream):
+    """Yield the JSON documents of a JSON Lines stream."""
+    for line in stream:
+        if line.strip():
+            yield json.loads(line)
+
+
+def write_jsonl(stream, header, items):
+    """Write a header line followed by one line per item, as they are produced."""
+    stream.write(json.dumps(header, default=str) + "\n")
+    for item in items:
+        stream.write(json.dumps(item, default=str) + "\n")
+
+
+def load_jsonl(stream, items_key):
+    """Rebuild a document from a header line followed by one line per item."""
+    lines = iter_jsonl(stream)
+    document = next(lines, None) or {}
+    document[items_key] = list(lines)
+    return document
+
+
+def load_document(path, items_key):
+    """Load a YAML or JSON Lines document, depending on the file extension.
+
+    JSON Lines documents store every top-level key but ``items_key`` in the
+    first line and one element of ``items_key`` per following line.
+    """
+    with open(path, "r") as file:
+        if path.endswith(JSONL_EXTENSION):
+            return load_jsonl(file, items_key)
+        return load_yaml(file)
+
+
+def write_document(path, data, items_key, **options):
+    """Write a document as YAML or JSON Lines, depending on the file extension."""
+    with open(path, "w") as file:
+        if path.endswith(JSONL_EXTENSION):
+            header = {key: value for key, value in data.items() if key != items_key}
+            write_jsonl(file, header, data.get(items_key, []))
+        else:
+            dump_yaml(data, file, **options)
@@ -0,0 +1,171 @@
+import io
+
+import pytest
+import requests
+
+from mongone.utils import cache as cache_module
+from mongone.utils import http
+from mongone.utils.cache import IMMUTABLE, ResponseCache, endpoint_ttl
+
+BASE_URL = "https://cloud.mongodb.com/api/atlas/v2"
+CLUSTERS_URL = f"{BASE_URL}/groups/p1/clusters"
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache_module, "time", clock)
+    return clock
+
+
+def response(body=b"{}", url=CLUSTERS_URL, status_code=200, etag=None, stream=False):
+    result = requests.Response()
+    result.status_code = status_code
+    result.url = url
+    result.headers["Content-Type"] = "application/json"
+    if etag:
+        result.headers["ETag"] = etag
+    if stream:
+        result.raw = io.BytesIO(body)
+    else:
+        result._content = body
+    return result
+
+
+def test_endpoint_ttls():
+    assert endpoint_ttl(f"{BASE_URL}/orgs/o/invoices/i/csv") == 3600
+    assert endpoint_ttl(f"{BASE_URL}/orgs/o/groups") == 300
+    assert endpoint_ttl(f"{CLUSTERS_URL}/orders?pageNum=2") == 300
+
+
+def test_entry_is_fresh_until_its_ttl_expires(tmp_path, clock):
+    cache = ResponseCache(str(tmp_path))
+    cache.store("k", response(b'{"a": 1}', etag='"v1"'), ttl=300)
+
+    cached, is_fresh, etag = cache.lookup("k")
+    assert (cached.json(), is_fresh, etag) == ({"a": 1}, True, '"v1"')
+
+    clock.now += 301
+    cached, is_fresh, etag = cache.lookup("k")
+    assert (cached.json(), is_fresh, etag) == ({"a": 1}, False, '"v1"')
+
+    cache.touch("k")
+    assert cache.lookup("k")[1] is True
+
+
+def test_immutable_entry_never_expires(tmp_path, clock):
+    cache = ResponseCache(str(tmp_path))
+    cache.store("k", response(), ttl=IMMUTABLE)
+    clock.now += 10 * 365 * 86400
+
+    assert cache.lookup("k")[1] is True
+
+
+def test_refresh_ignores_entries_but_stores_new_ones(tmp_path, clock):
+    ResponseCache(str(tmp_path)).store("k", response(b"old"), ttl=300)
+    refreshing = ResponseCache(str(tmp_path), refresh=True)
+    assert refreshing.lookup("k") is None
+
+    refreshing.store("k", response(b"new"), ttl=300)
+    assert ResponseCache(str(tmp_path)).lookup("k")[0].content == b"new"
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path, clock):
+    cache = ResponseCache(str(tmp_path), max_bytes=10)
+    for key in ["a", "b"]:
+        cache.store(key, response(b"1234"), ttl=300)
+        clock.now += 1
+    cache.lookup("a")
+    clock.now += 1
+
+    cache.store("c", response(b"1234"), ttl=300)
+
+    assert cache.lookup("a") is not None
+    assert cache.lookup("b") is None
+    assert cache.lookup("c") is not None
+
+
+def test_invalidate_drops_entries_under_a_url_prefix(tmp_path, clock):
+    cache = ResponseCache(str(tmp_path))
+    cache.store("list", response(url=CLUSTERS_URL), ttl=300)
+    cache.store("one", response(url=f"{CLUSTERS_URL}/orders"), ttl=300)
+    cache.store("other", response(url=f"{BASE_URL}/groups/p2/clusters"), ttl=300)
+
+    cache.invalidate(CLUSTERS_URL)
+
+    assert cache.lookup("list") is None
+    assert cache.lookup("one") is None
+    assert cache.lookup("other") is not None
+
+
+def test_streamed_entries_are_read_back_from_disk(tmp_path, clock):
+    body = b"Date,Usage Date\n" * 10_000
+    cache = ResponseCache(str(tmp_path))
+
+    stored = cache.store("csv", response(body, stream=True), ttl=300, stream=True)
+    assert stored.content == body
+
+    cached = ResponseCache(str(tmp_path)).lookup("csv", stream=True)[0]
+    assert b"".join(cached.iter_content(1024)) == body
+    cached.close()
+
+
+class FakeClient:
+    def __init__(self, responses):
+        self.responses = responses
+        self.requests = []
+
+    def request(self, method, url, headers=None, params=None, data=None, stream=False):
+        self.requests.append((method, url, dict(headers or {})))
+        return self.responses.pop(0)
+
+
+@pytest.fixture
+def fake_client(monkeypatch):
+    def install(*responses):
+        client = FakeClient(list(responses))
+        monkeypatch.setattr(http, "get_client", lambda: client)
+        return client
+
+    return install
+
+
+def test_stale_entry_is_revalidated_with_its_etag(
+    tmp_path, clock, fake_client, monkeypatch
+):
+    cache = ResponseCache(str(tmp_path))
+    monkeypatch.setattr(http, "get_cache", lambda: cache)
+    client = fake_client(response(b'{"v": 1}', etag='"v1"'), response(status_code=304))
+
+    assert http.make_request(CLUSTERS_URL).json() == {"v": 1}
+    clock.now += 301
+    assert http.make_request(CLUSTERS_URL).json() == {"v": 1}
+
+    assert client.requests[1][2]["If-None-Match"] == '"v1"'
+    assert cache.lookup(next(iter(cache.entries)))[1] is True
+
+
+def test_successful_write_invalidates_the_project_clusters(
+    tmp_path, clock, fake_client, monkeypatch
+):
+    cache = ResponseCache(str(tmp_path))
+    monkeypatch.setattr(http, "get_cache", lambda: cache)
+    client = fake_client(
+        response(b'{"results": []}'),
+        response(b"{}", url=f"{CLUSTERS_URL}/orders", status_code=202),
+        response(b'{"results": [1]}'),
+    )
+
+    http.make_request(CLUSTERS_URL)
+    http.make_request(f"{CLUSTERS_URL}/orders", data={}, method="PATCH")
+
+    assert http.make_request(CLUSTERS_URL).json() == {"results": [1]}
+    assert len(client.requests) == 3
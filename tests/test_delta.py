@@ -0,0 +1,127 @@
+from datetime import datetime
+
+from mongone.core.delta import (
+    PreviousReport,
+    carried_usages,
+    diff_reports,
+    load_report_snapshot,
+    project_fingerprint,
+    save_report_snapshot,
+)
+
+CUTOFF = datetime(2024, 5, 1)
+
+
+def cluster(name, inuse=True, cost=10.0, last_access_time="2024-05-20 08:00:00"):
+    return {
+        "name": name,
+        "inuse": inuse,
+        "cost": cost,
+        "last_access_time": last_access_time,
+        "autoscaling_compute": True,
+        "autoscaling_disk": False,
+    }
+
+
+def report(*clusters, fingerprint="f1"):
+    return {
+        "report_data": [
+            {
+                "id": "p1",
+                "name": "shop-production",
+                "fingerprint": fingerprint,
+                "clusters": list(clusters),
+            }
+        ]
+    }
+
+
+def names(entries):
+    return [entry["cluster"] for entry in entries]
+
+
+def test_diff_reports_classifies_changes():
+    previous = report(cluster("kept"), cluster("idle"), cluster("gone"))
+    current = report(
+        cluster("kept", cost=10.004),
+        cluster("idle", inuse=False, cost=12.0, last_access_time="2024-03-01 00:00:00"),
+        cluster("added"),
+    )
+
+    diff = diff_reports(previous, current)
+
+    assert names(diff["new"]) == ["added"]
+    assert names(diff["removed"]) == ["gone"]
+    assert diff["newly_unused"] == [
+        {
+            "project": "shop-production",
+            "cluster": "idle",
+            "last_access_time": "2024-03-01 00:00:00",
+        }
+    ]
+    assert diff["cost_changed"] == [
+        {
+            "project": "shop-production",
+            "cluster": "idle",
+            "previous_cost": 10.0,
+            "cost": 12.0,
+        }
+    ]
+
+
+def test_diff_without_previous_report_lists_every_cluster_as_new():
+    diff = diff_reports(None, report(cluster("a"), cluster("b")))
+
+    assert names(diff["new"]) == ["a", "b"]
+    assert diff["removed"] == diff["newly_unused"] == diff["cost_changed"] == []
+
+
+def test_only_valid_in_use_clusters_are_carried():
+    previous = report(
+        cluster("recent"),
+        cluster("old", last_access_time="2024-04-01 00:00:00"),
+        cluster("unused", inuse=False),
+        cluster("unknown", last_access_time=None),
+    )["report_data"][0]
+
+    usages = carried_usages(previous, "f1", CUTOFF)
+
+    assert list(usages) == ["recent"]
+    assert usages["recent"]["last_access_time"] == datetime(2024, 5, 20, 8)
+    assert usages["recent"]["unused"] is False
+
+
+def test_changed_project_carries_nothing():
+    previous = report(cluster("recent"))["report_data"][0]
+
+    assert carried_usages(previous, "f2", CUTOFF) == {}
+    assert carried_usages(None, "f1", CUTOFF) == {}
+
+
+def test_previous_report_counts_carried_projects():
+    previous = PreviousReport(report(cluster("a"), cluster("b", inuse=False)))
+
+    previous.carried_usages("p1", [{"name": "a"}, {"name": "b"}], "f1", CUTOFF)
+    assert (previous.carried_projects, previous.carried_clusters) == (0, 1)
+
+    previous = PreviousReport(report(cluster("a")))
+    previous.carried_usages("p1", [{"name": "a"}], "f1", CUTOFF)
+    assert (previous.carried_projects, previous.carried_clusters) == (1, 1)
+
+
+def test_fingerprint_ignores_cluster_order():
+    clusters = [{"name": "a", "size": "M10"}, {"name": "b", "size": "M20"}]
+
+    assert project_fingerprint(clusters) == project_fingerprint(clusters[::-1])
+    assert project_fingerprint(clusters) != project_fingerprint(
+        [{"name": "a", "size": "M30"}, clusters[1]]
+    )
+
+
+def test_snapshot_is_only_loaded_for_the_same_org_and_period(tmp_path):
+    path = str(tmp_path / "reports" / "report_snapshot.json")
+    save_report_snapshot("org", 30, report(cluster("a")), path)
+
+    assert load_report_snapshot("org", 30, path) == report(cluster("a"))
+    assert load_report_snapshot("org", 7, path) is None
+    assert load_report_snapshot("other", 30, path) is None
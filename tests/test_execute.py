@@ -0,0 +1,45 @@
+from mongone.optimization import execute
+
+
+def cluster(index):
+    return {
+        "org_id": "org",
+        "project_id": f"p{index}",
+        "project_name": f"project-{index}",
+        "cluster_name": f"c{index}",
+    }
+
+
+def test_unsent_changes_are_failed_and_not_tracked(monkeypatch):
+    monkeypatch.setattr(execute, "load_config", lambda: {})
+    monkeypatch.setattr(execute, "make_request", lambda *args, **kwargs: None)
+
+    outcomes = execute.scale_to_free_tier(
+        {"clusters": [cluster(0), cluster(1)]}, concurrency=2
+    )
+    # Nothing is pending, so waiting returns without polling Atlas
+    summary = execute.track_completion(
+        [("scale_to_free_tier", outcomes)], wait_timeout=1
+    )
+
+    assert {outcome["status"] for outcome in outcomes} == {"failed"}
+    assert all(
+        outcome["detail"].startswith("Failed to send PATCH") for outcome in outcomes
+    )
+    assert summary["pending"] == summary["applied"] == []
+    assert len(summary["failed"]) == 2
+
+
+def test_sent_changes_are_applied(monkeypatch):
+    monkeypatch.setattr(execute, "load_config", lambda: {})
+    sent = []
+    monkeypatch.setattr(
+        execute,
+        "make_request",
+        lambda url, **kwargs: sent.append((kwargs["method"], url)) or object(),
+    )
+
+    outcomes = execute.delete_clusters({"clusters": [cluster(0)]}, concurrency=1)
+
+    assert [outcome["status"] for outcome in outcomes] == ["applied"]
+    assert [method for method, _ in sent] == ["DELETE"]
@@ -0,0 +1,60 @@
+import csv
+import json
+
+from mongone.utils.export import export_columnar, export_csv, export_jsonl
+
+
+def report(**cluster):
+    cluster = dict(
+        {
+            "name": "c0",
+            "last_access_time": "2024-05-01 10:00:00",
+            "inuse": True,
+            "autoscaling_compute": True,
+            "autoscaling_disk": False,
+            "cost": 12.5,
+            "predicted_cost": 20.0,
+        },
+        **cluster,
+    )
+    project = {"id": "p0", "name": "project", "environment": "prod"}
+    return {"report_data": [dict(project, clusters=[cluster])]}
+
+
+UNKNOWN = {"last_access_time": None, "autoscaling_compute": None}
+
+
+def test_jsonl_keeps_unknown_values_null(tmp_path):
+    path = tmp_path / "report.jsonl"
+    export_jsonl(report(**UNKNOWN), path)
+
+    (row,) = [json.loads(line) for line in path.read_text().splitlines()]
+
+    assert row["last_access_time"] is None
+    assert row["autoscaling_compute"] is None
+    assert row["autoscaling_disk"] is False
+    assert row["status"] == "Unknown"
+
+
+def test_csv_writes_unknown_values_as_empty_cells(tmp_path):
+    path = tmp_path / "report.csv"
+    export_csv(report(**UNKNOWN), path)
+
+    with open(path, newline="") as file:
+        (row,) = list(csv.DictReader(file))
+
+    assert row["last_access_time"] == ""
+    assert row["autoscaling_compute"] == ""
+    assert row["autoscaling_disk"] == "False"
+
+
+def test_columnar_keeps_unknown_values_null(tmp_path):
+    path = tmp_path / "report.columns.json"
+    export_columnar(report(last_access_time="N/A", autoscaling_disk=None), path)
+
+    document = json.loads(path.read_text())
+
+    assert document["row_count"] == 1
+    assert document["data"]["last_access_time"] == [None]
+    assert document["data"]["autoscaling_compute"] == [True]
+    assert document["data"]["autoscaling_disk"] == [None]
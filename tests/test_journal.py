@@ -0,0 +1,146 @@
+import json
+import threading
+
+import pytest
+
+from mongone.optimization import execute
+from mongone.optimization.journal import ExecutionJournal, journal_path
+
+
+def cluster(index):
+    return {
+        "org_id": "org",
+        "project_id": f"p{index}",
+        "project_name": f"project-{index}",
+        "cluster_name": f"c{index}",
+    }
+
+
+def outcome(index, status="applied"):
+    return dict(cluster(index), status=status, detail="")
+
+
+def run(plan_filename, outcomes, resume=False):
+    journal = ExecutionJournal(plan_filename).start("delete_clusters", resume=resume)
+    for entry in outcomes:
+        journal.record(entry)
+    journal.close()
+    return journal
+
+
+def test_journal_sits_next_to_the_plan(tmp_path):
+    assert journal_path(str(tmp_path / "delete_clusters_plan_1.yaml")) == str(
+        tmp_path / "delete_clusters_plan_1.journal.jsonl"
+    )
+
+
+def test_resume_skips_only_applied_clusters(tmp_path):
+    plan = str(tmp_path / "plan.yaml")
+    run(plan, [outcome(0), outcome(1, "failed"), outcome(2, "skipped")])
+
+    journal = ExecutionJournal(plan).start("delete_clusters", resume=True)
+
+    assert journal.is_completed(cluster(0))
+    assert not journal.is_completed(cluster(1))
+    assert not journal.is_completed(cluster(2))
+
+
+def test_resumed_runs_accumulate_progress(tmp_path):
+    plan = str(tmp_path / "plan.yaml")
+    run(plan, [outcome(0)])
+    run(plan, [outcome(1)], resume=True)
+
+    journal = ExecutionJournal(plan).start("delete_clusters", resume=True)
+
+    assert journal.completed == {"p0/c0", "p1/c1"}
+
+
+def test_fresh_run_forgets_previous_progress(tmp_path):
+    plan = str(tmp_path / "plan.yaml")
+    run(plan, [outcome(0)])
+    run(plan, [])
+
+    assert ExecutionJournal(plan).load_completed() == set()
+
+
+def test_truncated_last_line_is_ignored(tmp_path):
+    plan = str(tmp_path / "plan.yaml")
+    journal = run(plan, [outcome(0)])
+    with open(journal.path, "a") as journal_file:
+        journal_file.write('{"event": "cluster", "key": "p1/c1", "sta')
+
+    assert ExecutionJournal(plan).load_completed() == {"p0/c0"}
+
+
+def test_resume_does_not_resend_applied_clusters(tmp_path, monkeypatch):
+    monkeypatch.setattr(execute, "load_config", lambda: {})
+    plan = str(tmp_path / "plan.yaml")
+    run(plan, [outcome(0)])
+    plan_data = {"clusters": [cluster(0), cluster(1)]}
+    sent = []
+
+    journal = ExecutionJournal(plan).start("delete_clusters", resume=True)
+    outcomes = execute.run_cluster_actions(
+        plan_data,
+        lambda entry, url, lock: sent.append(entry["cluster_name"]) or "deleted",
+        "Delete",
+        concurrency=2,
+        journal=journal,
+    )
+    journal.close()
+
+    assert sent == ["c1"]
+    assert [entry["cluster_name"] for entry in outcomes] == ["c1"]
+
+
+def test_interrupted_run_journals_actions_in_flight(tmp_path, monkeypatch):
+    monkeypatch.setattr(execute, "load_config", lambda: {})
+    started = threading.Barrier(3)
+    release = threading.Event()
+
+    def interrupted(futures):
+        # Interrupt once both actions are running
+        started.wait(timeout=5)
+        release.set()
+        raise KeyboardInterrupt
+        yield
+
+    def action(entry, url, lock):
+        started.wait(timeout=5)
+        release.wait(timeout=5)
+        return "deleted"
+
+    monkeypatch.setattr(execute, "as_completed", interrupted)
+    plan = str(tmp_path / "plan.yaml")
+    plan_data = {"clusters": [cluster(index) for index in range(4)]}
+
+    journal = ExecutionJournal(plan).start("delete_clusters")
+    with pytest.raises(KeyboardInterrupt):
+        execute.run_cluster_actions(
+            plan_data, action, "Delete", concurrency=2, journal=journal
+        )
+    journal.close()
+
+    with open(journal.path) as journal_file:
+        entries = [json.loads(line) for line in journal_file]
+    recorded = sorted(entry["key"] for entry in entries if entry["event"] == "cluster")
+    assert recorded == ["p0/c0", "p1/c1"]
+    assert ExecutionJournal(plan).load_completed() == {"p0/c0", "p1/c1"}
+
+
+def test_unsent_change_is_not_journaled_as_applied(tmp_path, monkeypatch):
+    monkeypatch.setattr(execute, "load_config", lambda: {})
+    # make_request returns None when it has no credentials to send with
+    monkeypatch.setattr(execute, "make_request", lambda *args, **kwargs: None)
+    plan = str(tmp_path / "plan.yaml")
+
+    journal = ExecutionJournal(plan).start("delete_clusters")
+    outcomes = execute.delete_clusters(
+        {"clusters": [cluster(0)]}, concurrency=1, journal=journal
+    )
+    journal.close()
+
+    assert [entry["status"] for entry in outcomes] == ["failed"]
+    resumed = ExecutionJournal(plan).start("delete_clusters", resume=True)
+    resumed.close()
+    assert not resumed.is_completed(cluster(0))
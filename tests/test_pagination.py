@@ -0,0 +1,97 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from mongone.data import pagination
+
+URL = "https://cloud.mongodb.com/api/atlas/v2/groups/p1/clusters"
+
+
+class Page:
+    def __init__(self, payload):
+        self.payload = payload
+
+    def json(self):
+        return self.payload
+
+
+class FakeAtlas:
+    """Serve ``total`` items in pages, recording the concurrency of the calls."""
+
+    def __init__(self, total, delay=0.0):
+        self.total = total
+        self.delay = delay
+        self.params = []
+        self.in_flight = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def make_request(self, url, params=None):
+        with self.lock:
+            self.params.append(dict(params or {}))
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        time.sleep(self.delay)
+        with self.lock:
+            self.in_flight -= 1
+        size = params["itemsPerPage"]
+        start = (params["pageNum"] - 1) * size
+        return Page(
+            {
+                "results": list(range(start, min(start + size, self.total))),
+                "totalCount": self.total,
+            }
+        )
+
+
+def test_pages_are_yielded_in_order(monkeypatch):
+    atlas = FakeAtlas(total=23)
+    monkeypatch.setattr(pagination, "make_request", atlas.make_request)
+
+    items = list(pagination.paginate(URL, items_per_page=5, max_workers=4))
+
+    assert items == list(range(23))
+    assert atlas.params[0]["includeCount"] == "true"
+    assert sorted(params["pageNum"] for params in atlas.params) == [1, 2, 3, 4, 5]
+
+
+def test_single_page_is_fetched_once(monkeypatch):
+    atlas = FakeAtlas(total=3)
+    monkeypatch.setattr(pagination, "make_request", atlas.make_request)
+
+    assert list(pagination.paginate(URL, items_per_page=5)) == [0, 1, 2]
+    assert len(atlas.params) == 1
+
+
+def test_next_links_are_followed_without_a_total(monkeypatch):
+    pages = {
+        URL: {"results": [1, 2], "links": [{"rel": "next", "href": "page-2"}]},
+        "page-2": {"results": [3], "links": [{"rel": "self", "href": "page-2"}]},
+    }
+    monkeypatch.setattr(
+        pagination, "make_request", lambda url, params=None: Page(pages[url])
+    )
+
+    assert list(pagination.paginate(URL, paged=False)) == [1, 2, 3]
+
+
+def test_main_thread_fetches_pages_in_parallel(monkeypatch):
+    atlas = FakeAtlas(total=25, delay=0.05)
+    monkeypatch.setattr(pagination, "make_request", atlas.make_request)
+
+    assert len(list(pagination.paginate(URL, items_per_page=5, max_workers=4))) == 25
+    assert atlas.peak > 1
+
+
+def test_worker_thread_fetches_pages_serially(monkeypatch):
+    atlas = FakeAtlas(total=25, delay=0.01)
+    monkeypatch.setattr(pagination, "make_request", atlas.make_request)
+    monkeypatch.setattr(pagination.multiprocessing, "cpu_count", lambda: 8)
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        items = executor.submit(
+            lambda: list(pagination.paginate(URL, items_per_page=5))
+        ).result()
+
+    assert items == list(range(25))
+    assert atlas.peak == 1
@@ -0,0 +1,191 @@
+import asyncio
+import threading
+import time
+from datetime import date, timedelta
+
+import pytest
+
+from mongone.core import async_collector, data_loader
+from mongone.cost.prediction import (
+    DailyCostHistory,
+    calculate_predicted_costs,
+    forecast_month_costs,
+)
+from mongone.data.invoices import InvoiceCostIndex
+from mongone.utils.http import AsyncAtlasClient, AtlasServerError
+
+KEY = ("shop-production", "orders")
+
+
+def cost_index(start, costs, key=KEY):
+    index = InvoiceCostIndex()
+    for offset, amount in enumerate(costs):
+        usage_date = (start + timedelta(days=offset)).isoformat()
+        index.add_row(
+            {
+                "Project": key[0],
+                "Cluster": key[1],
+                "Usage Date": usage_date,
+                "Amount": str(amount),
+            }
+        )
+    return index
+
+
+def forecast(*indexes):
+    return forecast_month_costs(DailyCostHistory.from_cost_indexes(list(indexes)))
+
+
+def test_flat_costs_project_the_rest_of_the_month():
+    # 30 days of April and 10 days of May at 10 per day
+    forecasts = forecast(cost_index(date(2024, 4, 1), [10.0] * 40))
+
+    assert forecasts[KEY] == pytest.approx(100.0 + 21 * 10.0)
+
+
+def test_rising_costs_follow_the_trend():
+    forecasts = forecast(cost_index(date(2024, 5, 1), range(1, 21)))
+
+    # Billed 1..20 on May 1-20, the trend continues with 21..31
+    assert forecasts[KEY] == pytest.approx(sum(range(1, 32)))
+
+
+def test_falling_costs_stop_at_zero():
+    forecasts = forecast(cost_index(date(2024, 5, 1), range(19, 9, -1)))
+
+    # Billed 19..10 on May 1-10, then 9..0 and nothing for the remaining days
+    assert forecasts[KEY] == pytest.approx(sum(range(10, 20)) + sum(range(0, 10)))
+
+
+def test_last_day_of_the_month_is_the_billed_cost():
+    forecasts = forecast(cost_index(date(2024, 2, 20), [5.0] * 10))
+
+    assert forecasts[KEY] == pytest.approx(50.0)
+
+
+def test_history_merges_invoices_and_skips_unknown_dates():
+    april = cost_index(date(2024, 4, 29), [1.0, 2.0])
+    may = cost_index(date(2024, 4, 30), [3.0, 4.0])
+    may.add_row({"Project": KEY[0], "Cluster": KEY[1], "Amount": "100"})
+
+    history = DailyCostHistory.from_cost_indexes([april, may])
+
+    assert (history.start_date, history.end_date) == (
+        date(2024, 4, 29),
+        date(2024, 5, 1),
+    )
+    assert list(history.costs) == [1.0, 5.0, 4.0]
+
+
+def test_us_usage_dates_are_parsed():
+    index = InvoiceCostIndex()
+    for day in range(1, 11):
+        index.add_row(
+            {
+                "Project": KEY[0],
+                "Cluster": KEY[1],
+                "Usage Date": f"05/{day:02d}/2024",
+                "Amount": "10",
+            }
+        )
+
+    history = DailyCostHistory.from_cost_indexes([index])
+
+    assert (history.start_date, history.days) == (date(2024, 5, 1), 10)
+    assert forecast_month_costs(history)[KEY] == pytest.approx(310.0)
+
+
+def test_invoice_without_parsable_dates_is_reported(capsys):
+    index = InvoiceCostIndex()
+    index.invoice_id = "inv-1"
+    index.add_row(
+        {"Project": KEY[0], "Cluster": KEY[1], "Usage Date": "May 1", "Amount": "1"}
+    )
+
+    assert forecast(index) == {}
+    assert "No usage date of invoice inv-1 could be parsed" in capsys.readouterr().out
+
+
+def test_empty_history_has_no_forecasts():
+    assert forecast(InvoiceCostIndex()) == {}
+
+
+def test_predicted_costs_use_the_month_length():
+    predicted = calculate_predicted_costs(100.0, 10.0, today=date(2024, 2, 10))
+
+    assert predicted["total_predicted_cost"] == pytest.approx(290.0)
+    assert predicted["estimated_saves_projected"] == pytest.approx(29.0)
+
+
+def test_failed_history_invoice_is_left_out(monkeypatch):
+    invoices = [{"id": "current"}, {"id": "previous"}, {"id": "older"}]
+    indexes = {
+        "current": cost_index(date(2024, 5, 1), [10.0] * 10),
+        "older": cost_index(date(2024, 4, 1), [10.0] * 30),
+    }
+
+    def fetch_invoice_cost_index(org_id, invoice):
+        if invoice["id"] == "previous":
+            raise AtlasServerError("url", 500, "unavailable")
+        return indexes[invoice["id"]]
+
+    monkeypatch.setattr(data_loader, "get_recent_invoices", lambda org, count: invoices)
+    monkeypatch.setattr(
+        data_loader, "fetch_invoice_cost_index", fetch_invoice_cost_index
+    )
+
+    result = data_loader.fetch_invoice_data("org", 3)
+
+    assert result is indexes["current"]
+    assert result.get_forecast(*KEY) == pytest.approx(310.0)
+
+
+def test_failed_latest_invoice_aborts(monkeypatch):
+    def fetch_invoice_cost_index(org_id, invoice):
+        raise AtlasServerError("url", 500, "unavailable")
+
+    monkeypatch.setattr(
+        data_loader, "get_recent_invoices", lambda org, count: [{"id": "current"}]
+    )
+    monkeypatch.setattr(
+        data_loader, "fetch_invoice_cost_index", fetch_invoice_cost_index
+    )
+
+    with pytest.raises(AtlasServerError):
+        data_loader.fetch_invoice_data("org", 3)
+
+
+def test_async_engine_downloads_invoices_within_its_concurrency(monkeypatch):
+    invoices = [{"id": f"invoice-{month}"} for month in range(4)]
+    lock = threading.Lock()
+    in_flight = []
+    peak = []
+
+    def fetch_invoice_cost_index(org_id, invoice):
+        with lock:
+            in_flight.append(invoice["id"])
+            peak.append(len(in_flight))
+        time.sleep(0.01)
+        with lock:
+            in_flight.remove(invoice["id"])
+        if invoice["id"] == "invoice-2":
+            raise AtlasServerError("url", 500, "unavailable")
+        return cost_index(date(2024, 5 - invoices.index(invoice), 1), [10.0] * 10)
+
+    monkeypatch.setattr(data_loader, "get_recent_invoices", lambda org, count: invoices)
+    monkeypatch.setattr(
+        async_collector, "fetch_invoice_cost_index", fetch_invoice_cost_index
+    )
+
+    async def collect():
+        client = AsyncAtlasClient(2)
+        try:
+            return await async_collector.collect_invoice_data(client, "org", 4)
+        finally:
+            client.close()
+
+    result = asyncio.run(collect())
+
+    assert len(peak) == len(invoices)
+    assert max(peak) == 2
+    assert result.get_forecast(*KEY) is not None
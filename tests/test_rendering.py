@@ -0,0 +1,37 @@
+from mongone.utils.rendering import cluster_status, iter_report_rows
+
+
+def test_unknown_last_access_is_reported_as_unknown():
+    assert cluster_status({"last_access_time": None}) == "Unknown"
+    assert cluster_status({"last_access_time": "N/A"}) == "Unknown"
+
+
+def test_known_last_access_reports_whether_the_cluster_is_in_use():
+    accessed = {"last_access_time": "2024-05-01T10:00:00"}
+    assert cluster_status(dict(accessed, inuse=True)) == "In Use"
+    assert cluster_status(dict(accessed, inuse=False)) == "Unused"
+
+
+def test_report_rows_keep_unknown_last_access_as_null():
+    projects = [{"name": "p", "clusters": [{"name": "c", "last_access_time": None}]}]
+
+    (row,) = iter_report_rows(projects)
+
+    assert row[3] is None
+    assert row[4] == "Unknown"
+
+
+def test_report_rows_keep_unknown_autoscaling_as_null():
+    projects = [
+        {
+            "name": "p",
+            "clusters": [
+                {"name": "c", "autoscaling_compute": None, "autoscaling_disk": False}
+            ],
+        }
+    ]
+
+    (row,) = iter_report_rows(projects)
+
+    assert row[5] is None
+    assert row[6] == 0
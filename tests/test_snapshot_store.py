@@ -0,0 +1,123 @@
+from datetime import datetime
+
+import pytest
+
+from mongone.core.snapshot_store import InventorySnapshot, SnapshotStore
+
+CUTOFF = datetime(2024, 5, 1)
+CLUSTER = {"name": "orders", "stateName": "IDLE", "instanceSize": "M10"}
+
+
+def usage(last_access_time, compute=True, disk=False):
+    return {
+        "name": CLUSTER["name"],
+        "last_access_time": last_access_time,
+        "unused": last_access_time is None or last_access_time < CUTOFF,
+        "autoscaling_compute": compute,
+        "autoscaling_disk": disk,
+    }
+
+
+def report(project_id="p1", inuse=True, cost=12.5):
+    return {
+        "report_data": [
+            {
+                "id": project_id,
+                "name": "shop-production",
+                "environment": "production",
+                "clusters": [{"name": CLUSTER["name"], "inuse": inuse, "cost": cost}],
+            }
+        ]
+    }
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = SnapshotStore(str(tmp_path / "store.sqlite"))
+    yield store
+    store.close()
+
+
+def save(store, cluster_usage, cluster=CLUSTER, cost=12.5):
+    snapshot = InventorySnapshot()
+    snapshot.record("p1", cluster, cluster_usage)
+    store.save_run("org", 30, report(cost=cost), snapshot)
+
+
+def test_unchanged_cluster_in_use_is_reused(store):
+    save(store, usage(datetime(2024, 5, 20, 8, 30)))
+
+    reused = store.load_snapshot("org").reusable_usage("p1", CLUSTER, CUTOFF)
+
+    assert reused == {
+        "name": "orders",
+        "last_access_time": datetime(2024, 5, 20, 8, 30),
+        "unused": False,
+        "autoscaling_compute": True,
+        "autoscaling_disk": False,
+    }
+
+
+def test_changed_cluster_document_is_refetched(store):
+    save(store, usage(datetime(2024, 5, 20)))
+    changed = dict(CLUSTER, instanceSize="M20")
+
+    assert store.load_snapshot("org").reusable_usage("p1", changed, CUTOFF) is None
+
+
+def test_access_before_cutoff_is_refetched(store):
+    save(store, usage(datetime(2024, 4, 30)))
+
+    assert store.load_snapshot("org").reusable_usage("p1", CLUSTER, CUTOFF) is None
+
+
+def test_unknown_access_is_refetched(store):
+    save(store, usage(None))
+
+    assert store.load_snapshot("org").reusable_usage("p1", CLUSTER, CUTOFF) is None
+
+
+@pytest.mark.parametrize("compute, disk", [(None, True), (True, None)])
+def test_unknown_autoscaling_is_refetched(store, compute, disk):
+    save(store, usage(datetime(2024, 5, 20), compute=compute, disk=disk))
+
+    assert store.load_snapshot("org").reusable_usage("p1", CLUSTER, CUTOFF) is None
+
+
+def test_unknown_cluster_and_other_org_are_not_reused(store):
+    save(store, usage(datetime(2024, 5, 20)))
+    other = dict(CLUSTER, name="payments")
+
+    assert store.load_snapshot("org").reusable_usage("p1", other, CUTOFF) is None
+    assert store.load_snapshot("other-org").known_clusters == {}
+
+
+def test_record_counts_reused_and_refreshed_clusters():
+    snapshot = InventorySnapshot()
+    snapshot.record("p1", CLUSTER, usage(datetime(2024, 5, 20)), reused=True)
+    snapshot.record("p1", dict(CLUSTER, name="b"), usage(None))
+
+    assert (snapshot.reused, snapshot.refreshed) == (1, 1)
+
+
+def test_removed_clusters_are_dropped_from_the_inventory(store):
+    save(store, usage(datetime(2024, 5, 20)))
+    store.save_run("org", 30, {"report_data": []}, InventorySnapshot())
+
+    assert store.load_snapshot("org").known_clusters == {}
+
+
+def test_cluster_history_by_project_id_or_name(store):
+    save(store, usage(datetime(2024, 5, 20)), cost=10.0)
+    save(store, usage(datetime(2024, 5, 27)), cost=11.0)
+
+    by_id = store.cluster_history("p1", "orders")
+    by_name = store.cluster_history("shop-production", "orders")
+
+    assert by_id == by_name
+    assert [row["cost"] for row in by_id] == [10.0, 11.0]
+    assert [row["last_access_time"] for row in by_id] == [
+        "2024-05-20T00:00:00",
+        "2024-05-27T00:00:00",
+    ]
+    assert store.cluster_history("p1", "missing") == []